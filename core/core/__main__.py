@@ -1,7 +1,11 @@
-import asyncio
 import sys
 from pathlib import Path
 
+from .startup import startup_timer
+
+# Started before anything heavy is imported, so the report covers it all
+startup_timer.start()
+
 echo_path = Path(__file__).parent.parent.parent / "echo"
 sys.path.insert(0, str(echo_path))
 
@@ -12,20 +16,25 @@ _DIR = Path(__file__).parent
 _CONFIG_PATH = _DIR / ".." / "config.toml"
 
 
-async def main() -> None:
+def main() -> None:
     print("Loading config...")
-    config = AppConfig.from_file(_CONFIG_PATH)
+    with startup_timer.stage("config"):
+        config = AppConfig.from_file(_CONFIG_PATH)
 
     print("Starting core...")
     core = Core(config)
 
-    task = asyncio.create_task(core.run(), name="core run")
-    await task
+    print(f"Core ready in {startup_timer.finish():.2f}s")
+    if config.debug:
+        print(startup_timer.report())
+
+    # Not from inside an event loop, workers are forked from this process
+    core.serve()
 
 
 def run():
     try:
-        asyncio.run(main())
+        main()
     except KeyboardInterrupt:
         pass
 
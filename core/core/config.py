@@ -9,11 +9,26 @@ import tomli
 class ServerConfig:
     host: str = "127.0.0.1"
     port: int = 31415
+    # Processes forked to serve requests, they share the intents copy-on-write
+    workers: int = 1
+    # Threads that run intent matching, so it doesn't block the event loop.
+    # Matching holds the GIL, more threads add latency but not throughput
+    echo_workers: int = 2
+    # Handlers of one /v0/ask/batch request that may run at the same time
+    batch_concurrency: int = 8
+    # Items of one /v0/ask/batch request, a batch holds an echo worker
+    # until all of it is matched
+    max_batch_size: int = 256
 
     @staticmethod
     def from_dict(data: dict[str, Any]) -> "ServerConfig":
         return ServerConfig(
-            host=data.get("host", "127.0.0.1"), port=data.get("port", 31415)
+            host=data.get("host", "127.0.0.1"),
+            port=data.get("port", 31415),
+            workers=data.get("workers", 1),
+            echo_workers=data.get("echo_workers", 2),
+            batch_concurrency=data.get("batch_concurrency", 8),
+            max_batch_size=data.get("max_batch_size", 256),
         )
 
 
@@ -39,6 +54,9 @@ class GeocodingConfig:
     base_url: str = "https://nominatim.openstreetmap.org/"
     user_agent: str = "jim"
     implementation: str = "nominatim"
+    index_path: str = "geonames.idx"
+    dump_path: str = ""
+    fallback: bool = True
 
     @staticmethod
     def from_dict(data: dict[str, Any]) -> "GeocodingConfig":
@@ -46,6 +64,22 @@ class GeocodingConfig:
             base_url=data.get("base_url", "https://nominatim.openstreetmap.org/"),
             user_agent=data.get("user_agent", "jim"),
             implementation=data.get("implementation", "nominatim"),
+            index_path=data.get("index_path", "geonames.idx"),
+            dump_path=data.get("dump_path", ""),
+            fallback=data.get("fallback", True),
+        )
+
+
+@dataclass
+class IntentsConfig:
+    hot_reload: bool = True
+    reload_interval: float = 1.0
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> "IntentsConfig":
+        return IntentsConfig(
+            hot_reload=data.get("hot_reload", True),
+            reload_interval=data.get("reload_interval", 1.0),
         )
 
 
@@ -96,6 +130,7 @@ class AppConfig:
     server: ServerConfig = field(default_factory=ServerConfig)
     weather: WeatherConfig = field(default_factory=WeatherConfig)
     geocoding: GeocodingConfig = field(default_factory=GeocodingConfig)
+    intents: IntentsConfig = field(default_factory=IntentsConfig)
     llm: LLMConfig = field(default_factory=LLMConfig)
     debug: bool = False
 
@@ -119,6 +154,7 @@ class AppConfig:
             server=ServerConfig.from_dict(data.get("server", {})),
             weather=WeatherConfig.from_dict(data.get("weather", {})),
             geocoding=GeocodingConfig.from_dict(data.get("geocoding", {})),
+            intents=IntentsConfig.from_dict(data.get("intents", {})),
             llm=LLMConfig.from_dict(data.get("llm", {})),
             debug=data.get("debug", False),
         )
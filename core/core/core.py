@@ -1,3 +1,10 @@
+import asyncio
+import gc
+import os
+import signal
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -9,6 +16,9 @@ from echo import create_echo
 from .config import AppConfig
 from .endpoints import router as api_router
 from .handlers import HandlerRegistry
+from .llm.providers import ProviderRegistry
+from .metrics import LoopLagMonitor
+from .startup import startup_timer
 
 
 class Core:
@@ -16,18 +26,35 @@ class Core:
         self.app = FastAPI(
             title="Jim Core", description="Intent processing core", version="0.1.0"
         )
+        self.config = config
         self.host = config.server.host
         self.port = config.server.port
+        self.workers = max(1, config.server.workers)
 
         core_path = Path(__file__).parent.parent
         project_path = core_path.parent
         intents_path = project_path / "intents"
 
-        self.echo = create_echo(intents_path)
+        with startup_timer.stage("echo"):
+            self.echo = create_echo(intents_path)
 
-        self.handler_registry = HandlerRegistry()
+        with startup_timer.stage("handlers"):
+            self.handler_registry = HandlerRegistry()
+
+        # Only the configured provider gets imported, and better now than
+        # on the first fallback request
+        if config.llm.enabled:
+            with startup_timer.stage("llm provider"):
+                try:
+                    ProviderRegistry.load(config.llm.provider)
+                except Exception as e:
+                    print(f"Error loading LLM provider {config.llm.provider}: {e}")
+
+        self.echo_executor = None
+        self.loop_lag = LoopLagMonitor()
 
         self.app.state.echo = self.echo
+        self.app.state.loop_lag = self.loop_lag
         self.app.state.config = config
         self.app.state.handler_registry = self.handler_registry
 
@@ -36,9 +63,167 @@ class Core:
     def setup_routes(self):
         self.app.include_router(api_router)
 
-    async def run(self):
-        config = UvicornConfig(
-            app=self.app, host=self.host, port=self.port, log_level="info"
+    def uvicorn_config(self) -> UvicornConfig:
+        # uvloop and httptools are used when they are installed
+        return UvicornConfig(
+            app=self.app,
+            host=self.host,
+            port=self.port,
+            log_level="info",
+            loop="auto",
+            http="auto",
+        )
+
+    async def run(self, sockets=None, watch=True):
+        # Threads don't survive a fork, so everything that runs one is
+        # started here, in the process that serves. Forked workers leave
+        # watching to the parent, which forks new ones after a reload
+        if watch and self.config.intents.hot_reload:
+            # Edits to the intents directory go live without a restart
+            self.echo.watch(self.config.intents.reload_interval)
+
+        # Matching is CPU-bound, on the event loop it would stall every
+        # other request's awaits until it's done
+        self.echo_executor = ThreadPoolExecutor(
+            max_workers=max(1, self.config.server.echo_workers),
+            thread_name_prefix="echo",
         )
-        server = Server(config)
-        await server.serve()
+        self.app.state.echo_executor = self.echo_executor
+
+        server = Server(self.uvicorn_config())
+
+        self.loop_lag.start()
+        try:
+            await server.serve(sockets=sockets)
+        finally:
+            self.loop_lag.stop()
+            self.echo_executor.shutdown(wait=False, cancel_futures=True)
+            self.echo.stop_watching()
+
+    def serve(self):
+        """Serve until stopped, from forked worker processes if configured."""
+        if self.workers > 1:
+            self._serve_workers()
+        else:
+            self._serve_worker()
+
+    def _serve_worker(self, sockets=None, watch=True):
+        self.uvicorn_config().setup_event_loop()
+        asyncio.run(self.run(sockets, watch))
+
+    def _prefork(self):
+        """Build the intents workers share before they are forked."""
+        self.echo.prepare()
+
+        # The collector writes to every object it visits, which would
+        # copy the shared pages into each worker one by one. Whatever an
+        # earlier fork froze is collected first, it may be garbage now
+        gc.unfreeze()
+        gc.collect()
+        gc.freeze()
+
+    def _serve_workers(self):
+        sock = self.uvicorn_config().bind_socket()
+
+        # Built once here, every worker gets them copy-on-write
+        with startup_timer.stage("prefork"):
+            self.handler_registry.load_all()
+            self._prefork()
+
+        # Workers would each reload their own copy of the intents, so the
+        # parent watches and replaces them with forks of its reloaded one
+        hot_reload = self.config.intents.hot_reload
+        reload_interval = self.config.intents.reload_interval
+
+        workers = set()
+        retiring = set()
+        stopping = False
+
+        def spawn():
+            pid = os.fork()
+            if pid:
+                workers.add(pid)
+                return
+
+            # Uvicorn installs its own handlers once it's serving
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+            code = 0
+            try:
+                self._serve_worker([sock], watch=False)
+            except KeyboardInterrupt:
+                pass
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+
+        def stop(signum, frame):
+            nonlocal stopping
+            stopping = True
+
+            for pid in workers:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+
+        for _ in range(self.workers):
+            spawn()
+
+        print(f"Serving on {self.host}:{self.port} with {self.workers} workers")
+
+        while workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG if hot_reload else 0)
+            except ChildProcessError:
+                break
+
+            if not pid:
+                time.sleep(reload_interval)
+                if stopping or not self._poll_reload():
+                    continue
+
+                # The new workers take connections as soon as they're up,
+                # the old ones finish the requests they have and exit
+                retiring.update(workers)
+                for _ in range(self.workers):
+                    spawn()
+                for pid in retiring:
+                    try:
+                        os.kill(pid, signal.SIGTERM)
+                    except ProcessLookupError:
+                        pass
+                continue
+
+            workers.discard(pid)
+            if stopping or pid in retiring:
+                retiring.discard(pid)
+                continue
+
+            code = os.waitstatus_to_exitcode(status)
+            print(f"Worker {pid} exited with {code}, starting a new one")
+
+            # Don't spin if workers die right after starting
+            time.sleep(1)
+            if not stopping:
+                spawn()
+
+        sock.close()
+
+    def _poll_reload(self) -> bool:
+        """Reload changed intents in the parent, ready for new workers."""
+        try:
+            if not self.echo.poll():
+                return False
+        except Exception as e:
+            print(f"Error watching intents: {e}")
+            return False
+
+        self._prefork()
+        return True
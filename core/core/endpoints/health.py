@@ -1,10 +1,15 @@
 from datetime import datetime
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 
 router = APIRouter(prefix="/health", tags=["health"])
 
 
 @router.get("")
-async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+async def health_check(request: Request):
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "last_reload": request.app.state.echo.last_reload,
+        "event_loop_lag": request.app.state.loop_lag.stats(),
+    }
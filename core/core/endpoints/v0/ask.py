@@ -1,29 +1,160 @@
-from typing import Any, Dict
+import asyncio
+import json
+from functools import partial
+from typing import Any, Dict, List, Tuple
 
-from fastapi import APIRouter, Body, Request
+from fastapi import APIRouter, Body, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
 router = APIRouter()
 
 
+async def _understand(request: Request, data: Dict[str, Any]) -> Dict[str, Any]:
+    text = data.get("text", "")
+
+    # Pinned, so a reload can't swap the intents between matching and responding
+    echo = request.app.state.echo.view()
+
+    # Matching runs on the echo workers to keep the event loop free
+    result = await asyncio.get_running_loop().run_in_executor(
+        request.app.state.echo_executor,
+        partial(
+            _match,
+            echo,
+            text,
+            request.app.state.handler_registry,
+            request.app.state.config,
+        ),
+    )
+
+    result["echo"] = echo
+    return result
+
+
+def _match(echo: Any, text: str, handler_registry: Any, config: Any) -> Dict[str, Any]:
+    result = echo.process(text, lazy_entities=True)
+
+    # Entities are extracted here too when a handler gets them, rather than
+    # on the event loop when it reads them. Handlers may read any of them
+    # and cached ones are keyed on all of them, so it's all or nothing:
+    # only the LLM fallback and intents without a handler skip extraction
+    if handler_registry.reads_entities(result, config):
+        result["entities"] = dict(result["entities"])
+
+    return result
+
+
 @router.post("")
 async def ask(request: Request, data: Dict[str, Any] = Body(...)):
-    text = data.get("text", "")
     lang = data.get("lang", "en")
     user_id = data.get("user_id", "default")
     device_id = data.get("device_id", "unknown")
 
-    echo = request.app.state.echo
     handler_registry = request.app.state.handler_registry
     config = request.app.state.config
 
-    result = echo.process(text)
-
-    result["echo"] = echo
+    result = await _understand(request, data)
 
     response_data = await handler_registry.process_intent(
         result=result, user_id=user_id, device_id=device_id, config=config
     )
 
+    return _answer(response_data)
+
+
+@router.post("/batch")
+async def ask_batch(request: Request, items: List[Any] = Body(...)):
+    """
+    Answer many utterances at once, e.g. to replay transcripts.
+
+    Takes a list of {"text", "user_id", "device_id"} items. Matching runs in
+    bulk, then the handlers run concurrently, at most server.batch_concurrency
+    at a time. Results come back in the order of the items, an item that
+    fails gets {"status": "error", "error": ...} without failing the rest.
+    Batches over server.max_batch_size items are refused with a 413.
+    """
+    handler_registry = request.app.state.handler_registry
+    config = request.app.state.config
+
+    if len(items) > config.server.max_batch_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batches are limited to {config.server.max_batch_size} items",
+        )
+
+    texts = []
+    errors = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get("text", ""), str):
+            errors[index] = "Item must be an object with a text string"
+            texts.append("")
+        else:
+            texts.append(item.get("text", ""))
+
+    # One view and one trip to the echo workers for the whole batch
+    echo = request.app.state.echo.view()
+    results, match_errors = await asyncio.get_running_loop().run_in_executor(
+        request.app.state.echo_executor, _match_batch, echo, texts
+    )
+    errors.update(match_errors)
+
+    semaphore = asyncio.Semaphore(max(1, config.server.batch_concurrency))
+
+    async def answer(index: int, result: Dict[str, Any]) -> Dict[str, Any]:
+        if index in errors:
+            return {"status": "error", "error": errors[index]}
+
+        item = items[index]
+        result["echo"] = echo
+
+        async with semaphore:
+            try:
+                response_data = await handler_registry.process_intent(
+                    result=result,
+                    user_id=item.get("user_id", "default"),
+                    device_id=item.get("device_id", "unknown"),
+                    config=config,
+                )
+            except Exception as e:
+                print(f"Error answering batch item {index}: {e}")
+                return {"status": "error", "error": str(e)}
+
+        return _answer(response_data)
+
+    answers = await asyncio.gather(
+        *(answer(index, result) for index, result in enumerate(results))
+    )
+
+    return {"status": "ok", "results": answers}
+
+
+def _match_batch(echo: Any, texts: List[str]) -> Tuple[List[Any], Dict[int, str]]:
+    """
+    Match a batch, or each text on its own if the batch fails.
+
+    Returns:
+        The results in the order of the texts, None for texts that failed,
+        and the errors of those by index
+    """
+    try:
+        return echo.process_batch(texts), {}
+    except Exception as e:
+        print(f"Error matching batch, retrying item by item: {e}")
+
+    results = []
+    errors = {}
+    for index, text in enumerate(texts):
+        try:
+            results.append(echo.process(text))
+        except Exception as e:
+            print(f"Error matching batch item {index}: {e}")
+            results.append(None)
+            errors[index] = str(e)
+
+    return results, errors
+
+
+def _answer(response_data: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "status": "ok",
         "intent": response_data.get("intent"),
@@ -31,3 +162,41 @@ async def ask(request: Request, data: Dict[str, Any] = Body(...)):
         "response": response_data.get("response"),
         "action": response_data.get("action", None),
     }
+
+
+@router.post("/stream")
+async def ask_stream(request: Request, data: Dict[str, Any] = Body(...)):
+    """
+    Like ask, but stream the response as newline delimited JSON.
+
+    Every sentence is sent as {"type": "sentence", "text": ...} as soon as it
+    is ready, so a satellite can start speaking before the response is done.
+    The last line is {"type": "done", ...} with the intent, confidence and
+    action.
+    """
+    user_id = data.get("user_id", "default")
+    device_id = data.get("device_id", "unknown")
+
+    handler_registry = request.app.state.handler_registry
+    config = request.app.state.config
+
+    result = await _understand(request, data)
+
+    async def lines():
+        async for part in handler_registry.stream_intent(
+            result=result, user_id=user_id, device_id=device_id, config=config
+        ):
+            if "response" in part:
+                event = {"type": "sentence", "text": part["response"]}
+            else:
+                event = {
+                    "type": "done",
+                    "status": "ok",
+                    "intent": part.get("intent"),
+                    "confidence": part.get("confidence"),
+                    "action": part.get("action", None),
+                }
+
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
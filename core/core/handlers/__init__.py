@@ -1,19 +1,71 @@
-import importlib
-import inspect
+import asyncio
+import copy
+import json
+import time
+from datetime import date
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from echo.utils.cache import LRUCache
+from echo.utils.text import split_sentences
+
+from .manifest import HandlerSpec, load_skill_specs
+
+# Date entity types whose value depends on the day they were asked on
+RELATIVE_DATE_TYPES = ("relative", "day_reference")
+
+
+def result_cache_key(intent_name: str, entities: Any) -> tuple:
+    """
+    Key a handler result on the intent and the values of its entities.
+
+    Spans and raw text don't change what a handler returns, so they are
+    left out. "tomorrow" names another day after midnight, so keys with a
+    relative date carry today's date.
+    """
+    values = {}
+    day = None
+    for entity_name in entities:
+        values[entity_name] = []
+        for entity in entities[entity_name] or ():
+            value = entity.get("value") if isinstance(entity, dict) else entity
+            if isinstance(value, dict) and value.get("type") in RELATIVE_DATE_TYPES:
+                day = date.today().isoformat()
+            values[entity_name].append(value)
+
+    return intent_name, json.dumps(values, sort_keys=True, default=str), day
 
 
 class HandlerRegistry:
-    def __init__(self):
+    def __init__(self, result_cache_size: int = 256):
         self.handlers = {}
+        self.specs = {}
+        self.results = LRUCache(result_cache_size)
         self._load_default_handlers()
 
     def register(self, intent_name: str, handler_func: Callable):
         self.handlers[intent_name] = handler_func
 
+    def register_spec(self, spec: HandlerSpec):
+        """Register a handler that is imported on the first request for its intent"""
+        self.specs[spec.intent] = spec
+        self.handlers.pop(spec.intent, None)
+
     def get_handler(self, intent_name: str) -> Optional[Callable]:
-        return self.handlers.get(intent_name)
+        handler = self.handlers.get(intent_name)
+        if handler is None and intent_name in self.specs:
+            spec = self.specs[intent_name]
+            try:
+                handler = self.handlers[intent_name] = spec.load()
+            except (ImportError, AttributeError) as e:
+                print(f"Error loading handler {spec.module}:{spec.function}: {e}")
+
+        return handler
+
+    def load_all(self):
+        """Import every registered handler now instead of on first use"""
+        for intent_name in list(self.specs):
+            self.get_handler(intent_name)
 
     def _load_default_handlers(self):
         skills_dir = Path(__file__).parent.parent / "skills"
@@ -21,29 +73,59 @@ class HandlerRegistry:
         if not skills_dir.exists():
             return
 
-        for skill_dir in skills_dir.iterdir():
-            if not skill_dir.is_dir() or skill_dir.name.startswith("__"):
-                continue
+        # Skills are imported on first use, only their manifests are read now
+        for spec in load_skill_specs(skills_dir, "core.skills"):
+            self.register_spec(spec)
+            print(f"Registered handler for intent: {spec.intent}")
 
-            try:
-                module_name = f"core.skills.{skill_dir.name}.handler"
-                handler_module = importlib.import_module(module_name)
+    async def _call_handler(
+        self, intent_name: str, handler: Callable, entities: Any, **context
+    ) -> Dict[str, Any]:
+        spec = self.specs.get(intent_name)
+        cache_ttl = spec.cache_ttl if spec else 0
+        timeout = spec.timeout if spec else None
 
-                for name, func in inspect.getmembers(
-                    handler_module, inspect.isfunction
-                ):
-                    if hasattr(func, "__doc__") and func.__doc__:
-                        if "intent:" in func.__doc__:
-                            intent_line = [
-                                line
-                                for line in func.__doc__.split("\n")
-                                if "intent:" in line
-                            ][0]
-                            intent_name = intent_line.split("intent:")[1].strip()
-                            self.register(intent_name, func)
-                            print(f"Registered handler for intent: {intent_name}")
-            except (ImportError, AttributeError) as e:
-                print(f"Error loading handlers from {skill_dir.name}: {e}")
+        cache_key = None
+        if cache_ttl:
+            cache_key = result_cache_key(intent_name, entities)
+            cached = self.results.get(cache_key)
+            if cached is not None and cached[0] > time.monotonic():
+                return copy.deepcopy(cached[1])
+
+        call = handler(entities=entities, **context)
+        try:
+            handler_result = await (
+                asyncio.wait_for(call, timeout) if timeout else call
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"Handler for {intent_name} took longer than {timeout}s"
+            ) from None
+
+        # Failures are worth retrying on the next request
+        if cache_key is not None and "error" not in handler_result.get("data", {}):
+            self.results.put(
+                cache_key,
+                (time.monotonic() + cache_ttl, copy.deepcopy(handler_result)),
+            )
+
+        return handler_result
+
+    def reads_entities(self, result: Dict[str, Any], config: Any) -> bool:
+        """Whether answering result runs a handler that gets its entities"""
+        if self._should_use_fallback(result, config):
+            return False
+
+        intent_name = result.get("intent")
+        return intent_name in self.handlers or intent_name in self.specs
+
+    def _should_use_fallback(self, result: Dict[str, Any], config: Any) -> bool:
+        if not config.llm.enabled:
+            return False
+
+        intent_name = result.get("intent")
+        confidence = result.get("confidence", 0.0)
+        return intent_name == "fallback" or confidence < config.llm.fallback_threshold
 
     async def process_intent(
         self, result: Dict[str, Any], user_id: str, device_id: str, config: Any
@@ -51,14 +133,11 @@ class HandlerRegistry:
         intent_name = result.get("intent")
         confidence = result.get("confidence", 0.0)
 
-        should_use_fallback = False
-        if config.llm.enabled:
-            if intent_name == "fallback" or confidence < config.llm.fallback_threshold:
-                should_use_fallback = True
-
-        if should_use_fallback:
-            from ..skills.fallback import llm_fallback
+        if self._should_use_fallback(result, config):
+            from ..skills.fallback import ERROR_RESPONSE, llm_fallback
 
+            # The LLM answers even when it fails, like in stream_intent
+            fallback_result = {}
             try:
                 fallback_result = await llm_fallback(
                     entities=result.get("entities", {}),
@@ -69,18 +148,71 @@ class HandlerRegistry:
                     intent=intent_name,
                     confidence=confidence,
                 )
+            except Exception as e:
+                print(f"Error executing LLM fallback handler: {e}")
+
+            fallback_data = fallback_result.get("data", {})
+            return {
+                "intent": "llm_fallback",
+                "confidence": 1.0,
+                "response": fallback_data.get("response") or ERROR_RESPONSE,
+                "action": fallback_result.get("action"),
+                "fallback_data": fallback_data,
+            }
+
+        return await self._respond(result, user_id, device_id, config)
+
+    async def stream_intent(
+        self, result: Dict[str, Any], user_id: str, device_id: str, config: Any
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Like process_intent, but yield the response a sentence at a time.
 
-                if "data" in fallback_result and "response" in fallback_result["data"]:
-                    return {
-                        "intent": "llm_fallback",
-                        "confidence": 1.0,
-                        "response": fallback_result["data"]["response"],
-                        "action": fallback_result.get("action"),
-                        "fallback_data": fallback_result.get("data", {}),
-                    }
+        Every sentence is yielded as {"response": sentence} as soon as it is
+        ready, followed by one dict with the intent, confidence and action.
+        """
+        intent_name = result.get("intent")
+        confidence = result.get("confidence", 0.0)
+
+        if self._should_use_fallback(result, config):
+            from ..skills.fallback import ERROR_RESPONSE, llm_fallback_stream
+
+            # The LLM answers even when it fails, going back to the handler
+            # would answer a query it was judged not to match. process_intent
+            # does the same
+            spoken = False
+            try:
+                async for sentence in llm_fallback_stream(
+                    entities=result.get("entities", {}),
+                    user_id=user_id,
+                    device_id=device_id,
+                    config=config,
+                    text=result.get("text", ""),
+                    intent=intent_name,
+                    confidence=confidence,
+                ):
+                    spoken = True
+                    yield {"response": sentence}
             except Exception as e:
                 print(f"Error executing LLM fallback handler: {e}")
 
+            if not spoken:
+                yield {"response": ERROR_RESPONSE}
+
+            yield {"intent": "llm_fallback", "confidence": 1.0, "action": None}
+            return
+
+        # Handlers return all their data at once, only the LLM is worth streaming
+        response_data = await self._respond(result, user_id, device_id, config)
+        for sentence in split_sentences(response_data.pop("response") or ""):
+            yield {"response": sentence}
+
+        yield response_data
+
+    async def _respond(
+        self, result: Dict[str, Any], user_id: str, device_id: str, config: Any
+    ) -> Dict[str, Any]:
+        intent_name = result.get("intent")
         handler = self.get_handler(intent_name)
 
         if not handler:
@@ -91,10 +223,17 @@ class HandlerRegistry:
             }
 
         try:
+            # The endpoints extract these off the loop, lazy ones from other
+            # callers are extracted as the handler reads them
             entities = result.get("entities", {})
 
-            handler_result = await handler(
-                entities=entities, user_id=user_id, device_id=device_id, config=config
+            handler_result = await self._call_handler(
+                intent_name,
+                handler,
+                entities,
+                user_id=user_id,
+                device_id=device_id,
+                config=config,
             )
 
             context = handler_result.get("data", {})
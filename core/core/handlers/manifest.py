@@ -0,0 +1,182 @@
+"""
+Skill manifests: which intents a skill handles, without importing it.
+
+A skill declares its handlers in a skill.toml next to its modules:
+
+    [intents.get_weather]
+    handler = "handler:get_weather"
+    timeout = 10.0
+    cache_ttl = 300
+
+The handler is a module (relative to the skill package) and function name.
+timeout bounds a handler call in seconds, and cache_ttl reuses a handler's
+result for the same entities for that many seconds. Both are optional.
+
+Skills without a skill.toml are discovered the old way, by importing
+their handler module and reading "intent:" lines out of the docstrings.
+The result is cached, keyed by the size and mtime of the skill's files,
+so the import only happens again when the skill changes.
+"""
+
+import importlib
+import inspect
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import tomli
+
+MANIFEST_NAME = "skill.toml"
+
+# Bump when the layout of the discovery cache changes
+_CACHE_FORMAT = 1
+
+
+@dataclass
+class HandlerSpec:
+    intent: str
+    module: str
+    function: str
+    timeout: Optional[float] = None
+    cache_ttl: float = 0.0
+
+    @staticmethod
+    def from_dict(intent: str, package: str, data: Dict[str, Any]) -> "HandlerSpec":
+        module, _, function = data["handler"].partition(":")
+        if not function:
+            raise ValueError(f"Handler of {intent} must be 'module:function'")
+
+        return HandlerSpec(
+            intent=intent,
+            module=f"{package}.{module}",
+            function=function,
+            timeout=data.get("timeout"),
+            cache_ttl=data.get("cache_ttl", 0.0),
+        )
+
+    def load(self) -> Callable:
+        """Import the handler's module and get the handler function"""
+        return getattr(importlib.import_module(self.module), self.function)
+
+
+def default_cache_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "jim" / "skills.json"
+
+
+def load_skill_specs(
+    skills_dir: Path, package: str, cache_path: Optional[Path] = None
+) -> List[HandlerSpec]:
+    """
+    Get the handlers of every skill in a directory.
+
+    Args:
+        skills_dir: Directory with one package per skill
+        package: Import name of skills_dir
+        cache_path: Discovery cache, defaults to the user's cache directory
+
+    Returns:
+        Handler specs of all skills, in skill name order
+    """
+    cache_path = Path(cache_path or default_cache_path())
+    cache = _read_cache(cache_path)
+    cache_changed = False
+
+    specs = []
+    for skill_dir in sorted(skills_dir.iterdir()):
+        if not skill_dir.is_dir() or skill_dir.name.startswith("__"):
+            continue
+
+        skill_package = f"{package}.{skill_dir.name}"
+        manifest_path = skill_dir / MANIFEST_NAME
+
+        try:
+            if manifest_path.exists():
+                with open(manifest_path, "rb") as f:
+                    manifest = tomli.load(f)
+
+                for intent_name, data in manifest.get("intents", {}).items():
+                    specs.append(
+                        HandlerSpec.from_dict(intent_name, skill_package, data)
+                    )
+                continue
+
+            signature = _skill_signature(skill_dir)
+            cache_key = str(skill_dir.resolve())
+            cached = cache.get(cache_key)
+            if cached is None or cached["signature"] != signature:
+                cached = {
+                    "signature": signature,
+                    "specs": [asdict(spec) for spec in _discover(skill_package)],
+                }
+                cache[cache_key] = cached
+                cache_changed = True
+
+            specs.extend(HandlerSpec(**spec) for spec in cached["specs"])
+        except Exception as e:
+            print(f"Error loading handlers from {skill_dir.name}: {e}")
+
+    if cache_changed:
+        _write_cache(cache_path, cache)
+
+    return specs
+
+
+def _discover(skill_package: str) -> List[HandlerSpec]:
+    module_name = f"{skill_package}.handler"
+    handler_module = importlib.import_module(module_name)
+
+    specs = []
+    for name, func in inspect.getmembers(handler_module, inspect.isfunction):
+        if func.__doc__ and "intent:" in func.__doc__:
+            intent_line = [
+                line for line in func.__doc__.split("\n") if "intent:" in line
+            ][0]
+            intent_name = intent_line.split("intent:")[1].strip()
+            specs.append(HandlerSpec(intent_name, module_name, name))
+
+    return specs
+
+
+def _skill_signature(skill_dir: Path) -> List[List[Any]]:
+    signature = []
+    for file_path in sorted(skill_dir.rglob("*.py")):
+        stat = file_path.stat()
+        relative = file_path.relative_to(skill_dir).as_posix()
+        signature.append([relative, stat.st_mtime_ns, stat.st_size])
+
+    return signature
+
+
+def _read_cache(cache_path: Path) -> Dict[str, Any]:
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Error reading skill cache {cache_path}: {e}")
+        return {}
+
+    if data.get("format") != _CACHE_FORMAT:
+        return {}
+
+    return data.get("skills", {})
+
+
+def _write_cache(cache_path: Path, skills: Dict[str, Any]):
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Several workers may discover at once, each writes its own file
+        with tempfile.NamedTemporaryFile(
+            "w", dir=cache_path.parent, suffix=".tmp", delete=False, encoding="utf-8"
+        ) as f:
+            json.dump({"format": _CACHE_FORMAT, "skills": skills}, f)
+
+        os.replace(f.name, cache_path)
+    except OSError as e:
+        print(f"Error writing skill cache {cache_path}: {e}")
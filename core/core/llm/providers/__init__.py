@@ -1,9 +1,28 @@
+import importlib
+
 from .base import LLMProvider, ProviderRegistry
-from .bitnet import BitNetProvider
-from .gemini import GeminiProvider
-from .mock import MockProvider
-from .ollama import OllamaProvider
-from .openai import OpenAIProvider
+
+# Providers pull in their client libraries (openai, google-genai, ...), so
+# each one is only imported once it is asked for
+_PROVIDERS = {
+    "mock": ("mock", "MockProvider"),
+    "openai": ("openai", "OpenAIProvider"),
+    "gemini": ("gemini", "GeminiProvider"),
+    "ollama": ("ollama", "OllamaProvider"),
+    "bitnet": ("bitnet", "BitNetProvider"),
+}
+
+for _name, (_module, _) in _PROVIDERS.items():
+    ProviderRegistry.register_module(_name, f"{__name__}.{_module}")
+
+
+def __getattr__(name):
+    for module, class_name in _PROVIDERS.values():
+        if class_name == name:
+            return getattr(importlib.import_module(f".{module}", __name__), name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "LLMProvider",
@@ -1,5 +1,6 @@
+import importlib
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 
 class LLMProvider(ABC):
@@ -15,6 +16,22 @@ class LLMProvider(ABC):
     ) -> Dict[str, Any]:
         """Generate a response from the LLM"""
         pass
+
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """Generate a response from the LLM as pieces of text, as they arrive
+
+        Providers that can't stream yield the whole response at once.
+        """
+        response = await self.generate_response(
+            messages=messages, max_tokens=max_tokens, temperature=temperature, **kwargs
+        )
+        yield response.get("content", "")
         
     async def complete(
         self,
@@ -91,6 +108,7 @@ class LLMProvider(ABC):
 
 class ProviderRegistry:
     _providers = {}
+    _modules = {}
 
     @classmethod
     def register(cls, name):
@@ -102,15 +120,31 @@ class ProviderRegistry:
 
         return decorator
 
+    @classmethod
+    def register_module(cls, name, module_name):
+        """Register a provider whose module is only imported when it is used"""
+        cls._modules[name] = module_name
+
+    @classmethod
+    def load(cls, name):
+        """Get a provider class by name, importing its module if needed"""
+        provider_class = cls._providers.get(name)
+        if provider_class is None and name in cls._modules:
+            # Importing the module registers the provider
+            importlib.import_module(cls._modules[name])
+            provider_class = cls._providers.get(name)
+
+        if provider_class is None:
+            raise ValueError(f"Unknown LLM provider: {name}")
+
+        return provider_class
+
     @classmethod
     def get_provider(cls, name, **kwargs):
         """Get a provider by name"""
-        provider_class = cls._providers.get(name)
-        if provider_class:
-            return provider_class(**kwargs)
-        raise ValueError(f"Unknown LLM provider: {name}")
+        return cls.load(name)(**kwargs)
     
     @classmethod
     def list_providers(cls):
         """Get a list of all registered provider names"""
-        return list(cls._providers.keys())
+        return list(dict.fromkeys([*cls._providers, *cls._modules]))
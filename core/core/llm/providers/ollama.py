@@ -1,4 +1,5 @@
-from typing import Any, Dict, List
+import json
+from typing import Any, AsyncIterator, Dict, List
 
 import aiohttp
 
@@ -22,30 +23,7 @@ class OllamaProvider(LLMProvider):
         **kwargs,
     ) -> Dict[str, Any]:
         try:
-            system_content = ""
-            for msg in messages:
-                if msg["role"] == "system":
-                    system_content = msg["content"]
-                    break
-
-            formatted_messages = []
-            for msg in messages:
-                if msg["role"] != "system":
-                    formatted_messages.append(
-                        {"role": msg["role"], "content": msg["content"]}
-                    )
-
-            payload = {
-                "model": self.model,
-                "messages": formatted_messages,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": max_tokens,
-                },
-            }
-
-            if system_content:
-                payload["system"] = system_content
+            payload = self._payload(messages, max_tokens, temperature)
 
             async with aiohttp.ClientSession() as session:
                 async with session.post(
@@ -77,3 +55,67 @@ class OllamaProvider(LLMProvider):
                 "provider": "ollama",
                 "error": str(e),
             }
+
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        payload = self._payload(messages, max_tokens, temperature)
+        payload["stream"] = True
+
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                f"{self.base_url}/api/chat",
+                json=payload,
+                headers={"Content-Type": "application/json"},
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise ValueError(
+                        f"Ollama API error: {response.status} - {error_text}"
+                    )
+
+                # One JSON object per line, the last one has done set
+                async for line in response.content:
+                    if not line.strip():
+                        continue
+
+                    data = json.loads(line)
+                    content = data.get("message", {}).get("content", "")
+                    if content:
+                        yield content
+                    if data.get("done"):
+                        break
+
+    def _payload(
+        self, messages: List[Dict[str, str]], max_tokens: int, temperature: float
+    ) -> Dict[str, Any]:
+        system_content = ""
+        for msg in messages:
+            if msg["role"] == "system":
+                system_content = msg["content"]
+                break
+
+        formatted_messages = []
+        for msg in messages:
+            if msg["role"] != "system":
+                formatted_messages.append(
+                    {"role": msg["role"], "content": msg["content"]}
+                )
+
+        payload = {
+            "model": self.model,
+            "messages": formatted_messages,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens,
+            },
+        }
+
+        if system_content:
+            payload["system"] = system_content
+
+        return payload
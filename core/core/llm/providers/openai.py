@@ -1,4 +1,4 @@
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List
 
 from openai import AsyncOpenAI
 
@@ -50,3 +50,25 @@ class OpenAIProvider(LLMProvider):
                 "provider": "openai",
                 "error": str(e),
             }
+
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        if not self.api_key:
+            raise ValueError("OpenAI API key not provided")
+
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+        )
+
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
@@ -0,0 +1,65 @@
+"""
+Runtime metrics for Core.
+
+LoopLagMonitor measures how late the event loop wakes up a task that
+sleeps on a fixed interval. Anything that blocks the loop, like CPU-bound
+work in an async route, shows up as lag for every request in flight.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class LoopLagMonitor:
+    """Samples the event loop's scheduling lag in the background."""
+
+    def __init__(self, interval: float = 0.25, window: int = 240):
+        self.interval = interval
+        self.samples = deque(maxlen=window)
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start sampling, must be called from the loop to monitor"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(
+                self._run(), name="loop lag monitor"
+            )
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+
+            lag = max(0.0, loop.time() - expected)
+            self.samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the lag over the recent samples, in milliseconds.
+
+        Returns:
+            Dict with the number of samples and the last, mean, p99 and
+            all-time max lag
+        """
+        if not self.samples:
+            return {"samples": 0}
+
+        ordered = sorted(self.samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+        return {
+            "samples": len(ordered),
+            "last_ms": round(self.samples[-1] * 1000, 2),
+            "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+            "p99_ms": round(p99 * 1000, 2),
+            "max_ms": round(self.max_lag * 1000, 2),
+        }
@@ -1,3 +1,3 @@
-from .handler import llm_fallback
+from .handler import ERROR_RESPONSE, llm_fallback, llm_fallback_stream
 
-__all__ = ["llm_fallback"]
+__all__ = ["ERROR_RESPONSE", "llm_fallback", "llm_fallback_stream"]
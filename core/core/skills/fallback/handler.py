@@ -1,9 +1,19 @@
 import re
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, List
+
+from echo.utils.text import SENTENCE_BREAK
 
 from ...llm.providers.base import ProviderRegistry
 from .prompts import format_fallback_prompt, get_system_prompt
 
+DISABLED_RESPONSE = (
+    "I'm not sure I understand. Could you please rephrase your question?"
+)
+ERROR_RESPONSE = "I'm sorry, but I'm having trouble processing your request right now."
+
+# Longer responses are cut at the last sentence that fits
+MAX_VOICE_LENGTH = 300
+
 
 async def llm_fallback(entities: Dict[str, Any], **context) -> Dict[str, Any]:
     """
@@ -18,33 +28,17 @@ async def llm_fallback(entities: Dict[str, Any], **context) -> Dict[str, Any]:
     if not llm_config.enabled:
         return {
             "data": {
-                "response": "I'm not sure I understand. Could you please rephrase your question?",
+                "response": DISABLED_RESPONSE,
                 "fallback_used": True,
             }
         }
 
-    original_text = context.get("text", "")
     detected_intent = context.get("intent", "unknown")
     confidence = context.get("confidence", 0.0)
 
     try:
-        provider_name = llm_config.provider
-        provider_config = llm_config.models.get(provider_name, {})
-
-        llm_provider = ProviderRegistry.get_provider(provider_name, **provider_config)
-
-        system_prompt = get_system_prompt(
-            detected_intent=detected_intent,
-            confidence=confidence,
-        )
-
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {
-                "role": "user",
-                "content": format_fallback_prompt(user_query=original_text),
-            },
-        ]
+        llm_provider = _get_provider(llm_config)
+        messages = _fallback_messages(context)
 
         llm_response = await llm_provider.generate_response(
             messages=messages, max_tokens=512, temperature=0.7
@@ -69,16 +63,145 @@ async def llm_fallback(entities: Dict[str, Any], **context) -> Dict[str, Any]:
         print(f"Error in LLM fallback: {e}")
         return {
             "data": {
-                "response": "I'm sorry, but I'm having trouble processing your request right now.",
+                "response": ERROR_RESPONSE,
                 "fallback_used": True,
                 "error": str(e),
             }
         }
 
 
+async def llm_fallback_stream(
+    entities: Dict[str, Any], **context
+) -> AsyncIterator[str]:
+    """
+    Like llm_fallback, but yield the response a sentence at a time, each one
+    as soon as the LLM has finished it.
+    """
+
+    llm_config = context.get("config").llm
+
+    if not llm_config.enabled:
+        yield DISABLED_RESPONSE
+        return
+
+    spoken = False
+    try:
+        llm_provider = _get_provider(llm_config)
+        deltas = llm_provider.stream_response(
+            messages=_fallback_messages(context), max_tokens=512, temperature=0.7
+        )
+
+        async for sentence in stream_response_for_voice(deltas):
+            spoken = True
+            yield sentence
+
+    except Exception as e:
+        print(f"Error in LLM fallback: {e}")
+
+    # An empty reply is as good as a failed one to the user
+    if not spoken:
+        yield ERROR_RESPONSE
+
+
+def _get_provider(llm_config: Any):
+    provider_name = llm_config.provider
+    provider_config = llm_config.models.get(provider_name, {})
+
+    return ProviderRegistry.get_provider(provider_name, **provider_config)
+
+
+def _fallback_messages(context: Dict[str, Any]) -> List[Dict[str, str]]:
+    system_prompt = get_system_prompt(
+        detected_intent=context.get("intent", "unknown"),
+        confidence=context.get("confidence", 0.0),
+    )
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {
+            "role": "user",
+            "content": format_fallback_prompt(user_query=context.get("text", "")),
+        },
+    ]
+
+
+async def stream_response_for_voice(deltas: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Turn streamed LLM output into cleaned up sentences for voice output.
+
+    Sentences are cleaned up one at a time like clean_response_for_voice
+    does, and the stream stops at the same length limit as it trims to.
+    A first sentence that is already too long is cut to fit instead.
+    """
+
+    buffer = ""
+    length = 0
+
+    try:
+        async for delta in deltas:
+            buffer += delta
+
+            sentences = []
+            start = 0
+            for match in SENTENCE_BREAK.finditer(buffer):
+                # Code blocks are cleaned up whole, so don't split inside one
+                if buffer.count("```", 0, match.start()) % 2 == 0:
+                    sentences.append(buffer[start : match.start()])
+                    start = match.end()
+            buffer = buffer[start:]
+
+            for sentence in sentences:
+                sentence = _clean_markdown(sentence).strip()
+                if not sentence:
+                    continue
+                if length + len(sentence) > MAX_VOICE_LENGTH:
+                    if not length:
+                        yield _truncate_for_voice(sentence)
+                    return
+
+                length += len(sentence) + 1
+                yield sentence
+
+        sentence = _clean_markdown(buffer).strip()
+        if sentence and length + len(sentence) <= MAX_VOICE_LENGTH:
+            yield sentence
+        elif sentence and not length:
+            yield _truncate_for_voice(sentence)
+    finally:
+        await deltas.aclose()
+
+
 def clean_response_for_voice(text: str) -> str:
     """Clean up an LLM response to make it more suitable for voice output"""
 
+    text = _clean_markdown(text)
+
+    # Trim the response if it's too long (over 300 chars)
+    if len(text) > MAX_VOICE_LENGTH:
+        sentences = SENTENCE_BREAK.split(text)
+        result = ""
+        for sentence in sentences:
+            if len(result) + len(sentence) > MAX_VOICE_LENGTH:
+                break
+            result += sentence + " "
+        text = result.strip() or _truncate_for_voice(text)
+
+    return text
+
+
+def _truncate_for_voice(text: str) -> str:
+    """Cut text at the last word that fits in MAX_VOICE_LENGTH"""
+    if len(text) <= MAX_VOICE_LENGTH:
+        return text
+
+    words = text[: MAX_VOICE_LENGTH + 1].split()
+    if len(words) > 1:
+        text = " ".join(words[:-1])
+
+    return text[:MAX_VOICE_LENGTH].rstrip(" ,;:-")
+
+
+def _clean_markdown(text: str) -> str:
     # Remove markdown formatting
     text = re.sub(r"\*\*(.*?)\*\*", r"\1", text)  # Bold
     text = re.sub(r"\*(.*?)\*", r"\1", text)  # Italic
@@ -103,14 +226,4 @@ def clean_response_for_voice(text: str) -> str:
     # Fix spacing issues
     text = re.sub(r"\s{2,}", " ", text)
 
-    # Trim the response if it's too long (over 300 chars)
-    if len(text) > 300:
-        sentences = re.split(r"(?<=[.!?])\s+", text)
-        result = ""
-        for sentence in sentences:
-            if len(result) + len(sentence) > 300:
-                break
-            result += sentence + " "
-        text = result.strip()
-
     return text
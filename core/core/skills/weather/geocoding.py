@@ -1,12 +1,39 @@
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Type
 
 import aiohttp
 
+from .geonames import GeoNamesIndex, build_index
 
+
+class GeocodingServiceRegistry:
+    _services: Dict[str, Type[Any]] = {}
+
+    @classmethod
+    def register(cls, name: str):
+        """Register a geocoding service implementation"""
+
+        def decorator(service_class):
+            cls._services[name] = service_class
+            return service_class
+
+        return decorator
+
+    @classmethod
+    def get_service(cls, name: str, **kwargs) -> Optional[Any]:
+        """Get a geocoding service by name"""
+        service_class = cls._services.get(name)
+        if service_class:
+            return service_class(**kwargs)
+        return None
+
+
+@GeocodingServiceRegistry.register("nominatim")
 class GeocodingService:
     """Geocoding service using OpenStreetMap (Nominatim)"""
 
-    def __init__(self, base_url: str, user_agent: str):
+    def __init__(self, base_url: str, user_agent: str, **kwargs):
         self.base_url = base_url
         self.user_agent = user_agent
 
@@ -66,3 +93,64 @@ class GeocodingService:
         except Exception as e:
             print(f"Error getting location from IP: {e}")
             return None
+
+
+@lru_cache(maxsize=None)
+def _open_index(index_path: str, dump_path: str) -> Optional[GeoNamesIndex]:
+    path = Path(index_path)
+
+    try:
+        if dump_path and (
+            not path.exists() or path.stat().st_mtime < Path(dump_path).stat().st_mtime
+        ):
+            print(f"Building geocoding index {path} from {dump_path}")
+            build_index(Path(dump_path), path)
+
+        return GeoNamesIndex(path)
+    except Exception as e:
+        print(f"Error opening geocoding index: {e}")
+        return None
+
+
+@GeocodingServiceRegistry.register("offline")
+class OfflineGeocodingService:
+    """
+    Geocoding service using a local GeoNames index.
+
+    Names are resolved from a memory-mapped index, built from a GeoNames
+    dump when it is missing or older than the dump. Only names the index
+    doesn't know go to Nominatim, unless the fallback is turned off.
+    """
+
+    def __init__(
+        self,
+        index_path: str,
+        dump_path: str = "",
+        fallback: bool = True,
+        base_url: str = "",
+        user_agent: str = "",
+        **kwargs,
+    ):
+        self.index = _open_index(index_path, dump_path)
+        self.fallback = (
+            GeocodingService(base_url=base_url, user_agent=user_agent)
+            if fallback
+            else None
+        )
+
+    async def geocode(self, location: str) -> Optional[Dict[str, Any]]:
+        if self.index:
+            location_data = self.index.lookup(location)
+            if location_data:
+                return location_data
+
+        if self.fallback:
+            return await self.fallback.geocode(location)
+
+        return None
+
+    async def get_location_from_ip(self) -> Optional[Dict[str, Any]]:
+        if self.fallback:
+            return await self.fallback.get_location_from_ip()
+
+        return None
@@ -0,0 +1,270 @@
+"""
+Compact on-disk index of GeoNames places for offline geocoding.
+
+The index is a single file that is memory-mapped and searched in place:
+
+    header | places | keys | strings
+
+Places are fixed-size records (coordinates, population, country code and
+the display name in the string pool). Keys are fixed-size records pointing
+at a normalized name in the string pool and at a place; they are sorted by
+name bytes, then by descending population, so a binary search finds all
+places of a name with the most populous first.
+"""
+
+import argparse
+import difflib
+import mmap
+import os
+import struct
+import tempfile
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+MAGIC = b"GEOIDX01"
+
+_HEADER = struct.Struct("<8sIII")
+_PLACE = struct.Struct("<ffIIH2s")
+_KEY = struct.Struct("<IHI")
+
+# GeoNames dump columns
+_NAME, _ASCII_NAME, _ALTERNATE_NAMES = 1, 2, 3
+_LATITUDE, _LONGITUDE, _FEATURE_CLASS, _COUNTRY, _POPULATION = 4, 5, 6, 8, 14
+
+# Populated places and administrative areas (countries, states, ...)
+_FEATURE_CLASSES = {"P", "A"}
+
+_PREFIX_SCAN = 64
+_FUZZY_WINDOW = 32
+_FUZZY_CUTOFF = 0.85
+
+
+def normalize_name(name: str) -> str:
+    """Casefold a place name, strip accents and collapse whitespace."""
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.split())
+
+
+class GeoNamesIndex:
+    """Read-only view of an index file built by build_index."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+        with open(self.path, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.place_count, self.key_count, strings_offset = _HEADER.unpack_from(
+            self._data, 0
+        )
+        if magic != MAGIC:
+            raise ValueError(f"Not a geocoding index: {self.path}")
+
+        self._places_offset = _HEADER.size
+        self._keys_offset = self._places_offset + self.place_count * _PLACE.size
+        self._strings_offset = strings_offset
+
+    def lookup(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a place name.
+
+        Tries an exact match first, then names starting with the query,
+        then names close to it. Among several candidates the most populous
+        place wins. A ", country" suffix is ignored.
+
+        Args:
+            name: Place name as spoken or typed
+
+        Returns:
+            Place with name, lat, lon, country and city, or None
+        """
+        query = normalize_name(name.split(",")[0])
+        if not query:
+            return None
+
+        encoded = query.encode("utf-8")
+        position = self._lower_bound(encoded)
+
+        # Keys of the same name are sorted by population, best first
+        if position < self.key_count and self._key(position)[0] == encoded:
+            return self._place(self._key(position)[1])
+
+        if len(encoded) >= 3:
+            best = None
+            for key, place_index in self._keys_from(position, _PREFIX_SCAN):
+                if not key.startswith(encoded):
+                    break
+
+                population = self._population(place_index)
+                if best is None or population > best[0]:
+                    best = (population, place_index)
+
+            if best:
+                return self._place(best[1])
+
+        return self._fuzzy_lookup(query, position)
+
+    def _fuzzy_lookup(self, query: str, position: int) -> Optional[Dict[str, Any]]:
+        # Sorted neighbours share the query's prefix, typos further in are
+        # caught by comparing against them
+        matcher = difflib.SequenceMatcher(b=query)
+        best = None
+
+        start = max(0, position - _FUZZY_WINDOW)
+        for key, place_index in self._keys_from(start, 2 * _FUZZY_WINDOW):
+            matcher.set_seq1(key.decode("utf-8"))
+            if matcher.real_quick_ratio() < _FUZZY_CUTOFF:
+                continue
+
+            ratio = matcher.ratio()
+            if ratio >= _FUZZY_CUTOFF:
+                candidate = (ratio, self._population(place_index), place_index)
+                if best is None or candidate > best:
+                    best = candidate
+
+        return self._place(best[2]) if best else None
+
+    def _lower_bound(self, encoded: bytes) -> int:
+        low, high = 0, self.key_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle)[0] < encoded:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def _key(self, index: int) -> Tuple[bytes, int]:
+        offset, length, place_index = _KEY.unpack_from(
+            self._data, self._keys_offset + index * _KEY.size
+        )
+        start = self._strings_offset + offset
+        return self._data[start : start + length], place_index
+
+    def _keys_from(self, start: int, count: int) -> Iterator[Tuple[bytes, int]]:
+        for index in range(start, min(start + count, self.key_count)):
+            yield self._key(index)
+
+    def _population(self, place_index: int) -> int:
+        return _PLACE.unpack_from(
+            self._data, self._places_offset + place_index * _PLACE.size
+        )[2]
+
+    def _place(self, place_index: int) -> Dict[str, Any]:
+        lat, lon, _, name_offset, name_length, country = _PLACE.unpack_from(
+            self._data, self._places_offset + place_index * _PLACE.size
+        )
+        start = self._strings_offset + name_offset
+        name = self._data[start : start + name_length].decode("utf-8")
+
+        return {
+            "name": name,
+            "lat": round(lat, 5),
+            "lon": round(lon, 5),
+            "country": country.decode("ascii").strip() or None,
+            "city": name,
+        }
+
+    def close(self):
+        self._data.close()
+
+
+def build_index(dump_path: Path, index_path: Path, min_population: int = 0) -> int:
+    """
+    Build an index file from a GeoNames dump (allCountries.txt, cities15000.txt, ...).
+
+    Args:
+        dump_path: Tab-separated GeoNames dump
+        index_path: Where to write the index
+        min_population: Skip places with fewer inhabitants
+
+    Returns:
+        Number of places in the index
+    """
+    places = []
+    keys = []
+    strings = bytearray()
+    offsets = {}
+
+    def intern(value: bytes) -> int:
+        offset = offsets.get(value)
+        if offset is None:
+            offset = offsets[value] = len(strings)
+            strings.extend(value)
+        return offset
+
+    with open(dump_path, "r", encoding="utf-8") as file:
+        for line in file:
+            columns = line.rstrip("\n").split("\t")
+            if len(columns) <= _POPULATION:
+                continue
+            if columns[_FEATURE_CLASS] not in _FEATURE_CLASSES:
+                continue
+
+            population = int(columns[_POPULATION] or 0)
+            if population < min_population:
+                continue
+
+            place_index = len(places)
+            name = columns[_NAME].encode("utf-8")[:0xFFFF]
+            country = columns[_COUNTRY].encode("ascii", "ignore")[:2].ljust(2)
+            places.append(
+                _PLACE.pack(
+                    float(columns[_LATITUDE]),
+                    float(columns[_LONGITUDE]),
+                    min(population, 0xFFFFFFFF),
+                    intern(name),
+                    len(name),
+                    country,
+                )
+            )
+
+            names = {columns[_NAME], columns[_ASCII_NAME]}
+            names.update(columns[_ALTERNATE_NAMES].split(","))
+            for alias in names:
+                key = normalize_name(alias).encode("utf-8")[:0xFFFF]
+                if key:
+                    keys.append((key, -population, place_index))
+
+    keys.sort()
+
+    header_size = _HEADER.size + len(places) * _PLACE.size + len(keys) * _KEY.size
+    index_path = Path(index_path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Written next to the target and renamed, so readers never map half a file
+    with tempfile.NamedTemporaryFile(
+        dir=index_path.parent, suffix=".tmp", delete=False
+    ) as file:
+        file.write(_HEADER.pack(MAGIC, len(places), len(keys), header_size))
+        file.writelines(places)
+        file.writelines(
+            _KEY.pack(intern(key), len(key), place_index)
+            for key, _, place_index in keys
+        )
+        file.write(strings)
+
+    os.replace(file.name, index_path)
+    return len(places)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build an offline geocoding index from a GeoNames dump"
+    )
+    parser.add_argument("dump", type=Path, help="GeoNames dump, e.g. cities15000.txt")
+    parser.add_argument("index", type=Path, help="Index file to write")
+    parser.add_argument(
+        "--min-population", type=int, default=0, help="Skip smaller places"
+    )
+    args = parser.parse_args()
+
+    count = build_index(args.dump, args.index, args.min_population)
+    print(f"Indexed {count} places into {args.index}")
+
+
+if __name__ == "__main__":
+    main()
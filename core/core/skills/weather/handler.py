@@ -1,7 +1,7 @@
 from typing import Any, Dict, Optional
 
 from ...config import get_config
-from .geocoding import GeocodingService
+from .geocoding import GeocodingServiceRegistry
 from .services import WeatherServiceRegistry
 
 
@@ -9,10 +9,21 @@ async def get_weather_data(location_name: Optional[str], config: Any) -> Dict[st
     """Get weather data for a location"""
 
     geocoding_config = config.geocoding
-    geocoding_service = GeocodingService(
-        base_url=geocoding_config.base_url, user_agent=geocoding_config.user_agent
+    geocoding_service = GeocodingServiceRegistry.get_service(
+        geocoding_config.implementation,
+        base_url=geocoding_config.base_url,
+        user_agent=geocoding_config.user_agent,
+        index_path=geocoding_config.index_path,
+        dump_path=geocoding_config.dump_path,
+        fallback=geocoding_config.fallback,
     )
 
+    if not geocoding_service:
+        return {
+            "success": False,
+            "error": f"Geocoding service '{geocoding_config.implementation}' not found",
+        }
+
     location_data = None
     if location_name:
         location_data = await geocoding_service.geocode(location_name)
@@ -0,0 +1,134 @@
+"""
+Startup timing report for Core.
+
+ImportTimer hooks the import system and records how long every module
+takes to execute, both on its own and including the modules it imports.
+StartupTimer adds named stages (config, echo, handlers, ...) on top, so a
+cold start can be broken down without rerunning under `python -X importtime`.
+"""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+
+class ImportTimer:
+    """Meta path finder that times the modules imported while it is installed."""
+
+    def __init__(self):
+        # Module name to (cumulative seconds, self seconds)
+        self.times: Dict[str, Tuple[float, float]] = {}
+        self._local = threading.local()
+
+    def start(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def stop(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path=None, target=None):
+        spec = None
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, "find_spec", None)
+            if finder is self or find_spec is None:
+                continue
+
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+
+        loader = spec.loader if spec is not None else None
+
+        # Built-in and frozen modules are loaded by classes shared by all of
+        # them, and cost next to nothing anyway
+        if loader is None or isinstance(loader, type):
+            return spec
+        if not hasattr(loader, "exec_module"):
+            return spec
+
+        loader.exec_module = self._timed(fullname, loader.exec_module)
+        return spec
+
+    def _timed(self, fullname, exec_module):
+        def timed_exec_module(module):
+            stack = self._stack()
+            stack.append(0.0)
+            started = time.perf_counter()
+
+            try:
+                exec_module(module)
+            finally:
+                elapsed = time.perf_counter() - started
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+
+                self.times[fullname] = (elapsed, elapsed - nested)
+
+        return timed_exec_module
+
+    def _stack(self) -> List[float]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def slowest(self, limit: int = 15) -> List[Tuple[str, float, float]]:
+        """
+        Get the modules that took longest to import on their own.
+
+        Returns:
+            List of (module, self seconds, cumulative seconds)
+        """
+        ranked = sorted(self.times.items(), key=lambda item: item[1][1], reverse=True)
+        return [(name, own, total) for name, (total, own) in ranked[:limit]]
+
+
+class StartupTimer:
+    """Times the stages of Core's startup and the imports they trigger."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = None
+        self.stages: List[Tuple[str, float]] = []
+        self.imports = ImportTimer()
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.imports.start()
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - started))
+
+    def finish(self) -> float:
+        """Stop timing imports and get the total startup time in seconds."""
+        self.imports.stop()
+        self.total = time.perf_counter() - self.started
+        return self.total
+
+    def report(self, limit: int = 15) -> str:
+        total = self.total or time.perf_counter() - self.started
+        lines = [f"Startup took {total:.2f}s"]
+
+        for name, seconds in self.stages:
+            lines.append(f"  {name:<24} {seconds * 1000:8.1f}ms")
+
+        lines.append(
+            f"Slowest imports of {len(self.imports.times)} (self, cumulative):"
+        )
+        for name, own, cumulative in self.imports.slowest(limit):
+            lines.append(f"  {own * 1000:8.1f}ms {cumulative * 1000:8.1f}ms  {name}")
+
+        return "\n".join(lines)
+
+
+startup_timer = StartupTimer()
@@ -0,0 +1,132 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.config import AppConfig
+from core.skills import fallback
+from core.endpoints import router
+from core.endpoints.v0.ask import _match
+from core.handlers import HandlerRegistry
+from echo import Echo
+
+INTENTS_PATH = Path(__file__).resolve().parents[2] / "intents"
+
+
+@pytest.fixture
+def config():
+    config = AppConfig()
+    config.llm.enabled = False
+    return config
+
+
+@pytest.fixture
+def echo():
+    return Echo(INTENTS_PATH, snapshot=False)
+
+
+@pytest.fixture
+def client(config, echo):
+    app = FastAPI()
+    app.include_router(router)
+    app.state.config = config
+    app.state.echo = echo
+    app.state.handler_registry = HandlerRegistry()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        app.state.echo_executor = executor
+        yield TestClient(app)
+
+
+def test_batch_answers_in_order(client):
+    response = client.post(
+        "/v0/ask/batch",
+        json=[{"text": "what time is it"}, {"text": "what's the date today"}],
+    )
+
+    results = response.json()["results"]
+    assert [result["intent"] for result in results] == ["get_time", "get_date"]
+
+
+def test_batch_isolates_failing_items(client, echo):
+    process = echo.process
+
+    def failing_process(text, **kwargs):
+        if text == "boom":
+            raise RuntimeError("matching failed")
+        return process(text, **kwargs)
+
+    echo.process = failing_process
+
+    response = client.post(
+        "/v0/ask/batch",
+        json=[{"text": "what time is it"}, {"text": "boom"}, 42],
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["intent"] == "get_time"
+    assert results[1] == {"status": "error", "error": "matching failed"}
+    assert results[2]["status"] == "error"
+
+
+def test_batch_size_is_limited(client, config):
+    config.server.max_batch_size = 2
+
+    response = client.post("/v0/ask/batch", json=[{"text": "hi"}] * 3)
+
+    assert response.status_code == 413
+
+
+def test_entities_are_extracted_on_the_echo_worker(echo, config):
+    handler_registry = HandlerRegistry()
+    text = "what is the weather in seattle tomorrow"
+
+    result = _match(echo, text, handler_registry, config)
+    assert result["intent"] == "get_weather"
+    assert type(result["entities"]) is dict
+    assert result["entities"]["location"][0]["value"]["name"] == "seattle"
+
+    # Without a handler nothing reads them, so they stay lazy
+    handler_registry.specs.pop("get_weather")
+    result = _match(echo, text, handler_registry, config)
+    assert type(result["entities"]) is not dict
+
+
+def stream(client, text):
+    response = client.post("/v0/ask/stream", json={"text": text})
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_stream_sends_sentences_then_done(client):
+    events = stream(client, "what time is it")
+
+    assert events[-1]["type"] == "done"
+    assert events[-1]["intent"] == "get_time"
+    assert events[:-1]
+    assert all(event["type"] == "sentence" for event in events[:-1])
+
+
+def test_failed_fallback_answers_the_same_streamed_or_not(client, config, monkeypatch):
+    config.llm.enabled = True
+    text = "colorless green ideas sleep furiously"
+
+    async def failing_fallback(entities, **context):
+        raise RuntimeError("provider down")
+
+    async def failing_fallback_stream(entities, **context):
+        raise RuntimeError("provider down")
+        yield
+
+    monkeypatch.setattr(fallback, "llm_fallback", failing_fallback)
+    monkeypatch.setattr(fallback, "llm_fallback_stream", failing_fallback_stream)
+
+    answer = client.post("/v0/ask", json={"text": text}).json()
+    events = stream(client, text)
+
+    assert answer["intent"] == events[-1]["intent"] == "llm_fallback"
+    assert answer["response"] == events[0]["text"] == fallback.ERROR_RESPONSE
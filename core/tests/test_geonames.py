@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from core.skills.weather.geocoding import OfflineGeocodingService
+from core.skills.weather.geonames import GeoNamesIndex, build_index
+
+# id, name, ascii name, alternate names, lat, lon, feature class, code,
+# country, cc2, admin1-4, population, ...
+PLACES = [
+    ("Paris", "Paris", "Lutetia,Paname", 48.85341, 2.3488, "P", "FR", 2138551),
+    ("Paris", "Paris", "", 33.66094, -95.55551, "P", "US", 24782),
+    ("Zürich", "Zurich", "Zurigo", 47.36667, 8.55, "P", "CH", 341730),
+    ("Springfield", "Springfield", "", 39.80172, -89.64371, "P", "US", 114394),
+    ("Springdale", "Springdale", "", 36.18674, -94.12881, "P", "US", 81125),
+    ("Mont Blanc", "Mont Blanc", "", 45.8326, 6.86517, "T", "FR", 0),
+    ("Smallville", "Smallville", "", 1.0, 1.0, "P", "US", 12),
+]
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    dump = tmp_path / "dump.txt"
+    lines = []
+    for number, place in enumerate(PLACES):
+        name, ascii_name, alternate, lat, lon, feature, country, people = place
+        columns = [str(number), name, ascii_name, alternate, str(lat), str(lon)]
+        columns += [feature, "PPL", country, "", "", "", "", "", str(people)]
+        columns += ["", "", "Europe/Paris", "2024-01-01"]
+        lines.append("\t".join(columns))
+    dump.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    path = tmp_path / "geonames.idx"
+    assert build_index(dump, path, min_population=100) == 5
+    return path
+
+
+@pytest.fixture
+def index(index_path):
+    index = GeoNamesIndex(index_path)
+    yield index
+    index.close()
+
+
+def test_most_populous_place_of_a_name_wins(index):
+    place = index.lookup("paris")
+
+    assert (place["name"], place["country"]) == ("Paris", "FR")
+    assert place["lat"] == pytest.approx(48.85341)
+
+
+@pytest.mark.parametrize(
+    "query, name",
+    [
+        ("Zurich", "Zürich"),
+        ("ZÜRICH", "Zürich"),
+        ("Zurigo", "Zürich"),
+        ("Lutetia", "Paris"),
+        ("Paris, France", "Paris"),
+        ("Springf", "Springfield"),
+        ("Sprngfield", "Springfield"),
+    ],
+)
+def test_names_are_resolved(index, query, name):
+    assert index.lookup(query)["name"] == name
+
+
+@pytest.mark.parametrize("query", ["Mont Blanc", "Smallville", "Atlantis", ""])
+def test_unknown_and_filtered_places(index, query):
+    assert index.lookup(query) is None
+
+
+def test_other_files_are_refused(tmp_path):
+    path = tmp_path / "other.idx"
+    path.write_bytes(b"\0" * 64)
+
+    with pytest.raises(ValueError):
+        GeoNamesIndex(path)
+
+
+def test_offline_service_without_fallback(index_path):
+    service = OfflineGeocodingService(index_path=str(index_path), fallback=False)
+
+    assert asyncio.run(service.geocode("Zurich"))["country"] == "CH"
+    assert asyncio.run(service.geocode("Atlantis")) is None
@@ -0,0 +1,150 @@
+import asyncio
+import textwrap
+import time
+from datetime import date
+
+import pytest
+
+from core.handlers import HandlerRegistry, manifest, result_cache_key
+from core.handlers.manifest import HandlerSpec, load_skill_specs
+
+
+def write_skill(skills_dir, name, files):
+    skill_dir = skills_dir / name
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "__init__.py").write_text("")
+    for file_name, content in files.items():
+        (skill_dir / file_name).write_text(textwrap.dedent(content))
+
+
+def entity(name, value, start):
+    return {"entity": name, "value": value, "raw_value": "", "start": start}
+
+
+def test_manifests_are_read_without_importing(tmp_path):
+    write_skill(
+        tmp_path,
+        "weather",
+        {
+            "skill.toml": """
+                [intents.get_weather]
+                handler = "handler:get_weather"
+                timeout = 10.0
+                cache_ttl = 300
+            """,
+            "handler.py": "raise ImportError('imported too early')",
+        },
+    )
+
+    specs = load_skill_specs(tmp_path, "skills", tmp_path / "skills.json")
+
+    assert specs == [
+        HandlerSpec("get_weather", "skills.weather.handler", "get_weather", 10.0, 300)
+    ]
+
+
+def test_broken_manifests_skip_only_their_skill(tmp_path):
+    write_skill(tmp_path, "broken", {"skill.toml": '[intents.a]\nhandler = "x"\n'})
+    write_skill(tmp_path, "time", {"skill.toml": '[intents.b]\nhandler = "h:f"\n'})
+
+    specs = load_skill_specs(tmp_path, "skills", tmp_path / "skills.json")
+
+    assert [spec.intent for spec in specs] == ["b"]
+
+
+def test_skills_without_manifest_are_discovered_once(tmp_path, monkeypatch):
+    skills_dir = tmp_path / "legacy_skills"
+    write_skill(
+        skills_dir,
+        "greet",
+        {"handler.py": '''
+                async def hello(entities, **context):
+                    """intent: say_hello"""
+                    return {}
+            '''},
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    cache_path = tmp_path / "skills.json"
+
+    first = load_skill_specs(skills_dir, "legacy_skills", cache_path)
+
+    def no_import(skill_package):
+        raise AssertionError(f"{skill_package} imported again")
+
+    monkeypatch.setattr(manifest, "_discover", no_import)
+    second = load_skill_specs(skills_dir, "legacy_skills", cache_path)
+
+    assert first == second
+    assert first == [HandlerSpec("say_hello", "legacy_skills.greet.handler", "hello")]
+
+
+def test_result_cache_key_ignores_spans():
+    first = {"location": [entity("location", {"name": "paris"}, 10)]}
+    second = {"location": [entity("location", {"name": "paris"}, 23)]}
+
+    assert result_cache_key("get_weather", first) == result_cache_key(
+        "get_weather", second
+    )
+
+
+def test_result_cache_key_dates_relative_days():
+    tomorrow = {"type": "relative", "relative": "tomorrow", "date": "2026-10-19"}
+    fixed = {"type": "absolute", "date": "2026-10-19"}
+
+    _, _, day = result_cache_key("get_weather", {"date": [entity("date", tomorrow, 0)]})
+    assert day == date.today().isoformat()
+
+    _, _, day = result_cache_key("get_weather", {"date": [entity("date", fixed, 0)]})
+    assert day is None
+
+
+@pytest.fixture
+def registry():
+    registry = HandlerRegistry()
+    registry.register_spec(HandlerSpec("slow", "nowhere", "slow", 0.05, 300))
+    return registry
+
+
+def counting_handler(data):
+    calls = []
+
+    async def handler(entities, **context):
+        calls.append(entities)
+        return {"data": dict(data)}
+
+    return handler, calls
+
+
+def test_handler_results_are_cached_for_their_ttl(registry, monkeypatch):
+    handler, calls = counting_handler({"temperature": 21})
+    entities = {"location": [entity("location", {"name": "paris"}, 0)]}
+
+    first = asyncio.run(registry._call_handler("slow", handler, entities))
+    first["data"]["temperature"] = 0
+    second = asyncio.run(registry._call_handler("slow", handler, entities))
+
+    assert len(calls) == 1
+    assert second == {"data": {"temperature": 21}}
+
+    later = time.monotonic() + 301
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+    asyncio.run(registry._call_handler("slow", handler, entities))
+
+    assert len(calls) == 2
+
+
+def test_handler_errors_are_not_cached(registry):
+    handler, calls = counting_handler({"error": "service unavailable"})
+
+    asyncio.run(registry._call_handler("slow", handler, {}))
+    asyncio.run(registry._call_handler("slow", handler, {}))
+
+    assert len(calls) == 2
+
+
+def test_slow_handlers_time_out(registry):
+    async def handler(entities, **context):
+        await asyncio.sleep(1)
+
+    with pytest.raises(TimeoutError, match="slow"):
+        asyncio.run(registry._call_handler("slow", handler, {}))
@@ -4,67 +4,461 @@ Echo: An intent processing library.
 
 __version__ = "0.0.1"
 
+import copy
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
 from .config import EchoConfig
 from .entity.extractor import EntityExtractor
 from .entity.registry import EntityRegistry
 from .intent.matcher import IntentMatcher
 from .intent.registry import IntentRegistry
+from .reload import WATCHED_DIRS, Components, directory_signature
 from .response.renderer import ResponseRenderer
 from .response.selector import ResponseSelector
+from .snapshot import load_snapshot, snapshot_path, write_snapshot
+from .utils.cache import LRUCache
+from .utils.text import extract_entity_placeholder, normalize_text
+
+
+def _component(name):
+    # Components are swapped as a whole on reload, read them through here
+    return property(lambda self: getattr(self._components, name))
 
 
 class Echo:
-    def __init__(self, config_path=None):
-        self.config = EchoConfig(config_path)
+    config = _component("config")
+    entity_registry = _component("entity_registry")
+    intent_registry = _component("intent_registry")
+    entity_extractor = _component("entity_extractor")
+    intent_matcher = _component("intent_matcher")
+    response_selector = _component("response_selector")
+    response_renderer = _component("response_renderer")
+
+    def __init__(
+        self,
+        config_path=None,
+        matcher_engine="sequential",
+        fuzzy_engine="sequence",
+        fuzzy_threshold=0.6,
+        cache_size=1024,
+        max_literal_expansions=256,
+        max_input_length=512,
+        pattern_budget_ms=50,
+        snapshot=True,
+    ):
+        self.options = {
+            "matcher_engine": matcher_engine,
+            "fuzzy_engine": fuzzy_engine,
+            "fuzzy_threshold": fuzzy_threshold,
+            "cache_size": cache_size,
+            "max_literal_expansions": max_literal_expansions,
+            "max_input_length": max_input_length,
+            "pattern_budget_ms": pattern_budget_ms,
+            "snapshot": snapshot,
+        }
+
+        config_path = Path(config_path) if config_path else Path.cwd()
+
+        # Taken before anything is read, so changes made while starting up
+        # are picked up by the first reload
+        self._signature = directory_signature(config_path)
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._pending_signature = None
+        self._rejected_signature = None
+        self.last_reload = None
 
-        # Initialize registries
-        self.entity_registry = EntityRegistry(self.config)
-        self.intent_registry = IntentRegistry(self.config)
+        # Startup on an unchanged directory loads its compiled snapshot
+        path = None
+        state = None
+        if snapshot:
+            path = snapshot_path(config_path, self.options)
+            state = load_snapshot(path)
 
-        # Initialize processing components
-        self.entity_extractor = EntityExtractor(self.entity_registry)
-        self.intent_matcher = IntentMatcher(self.intent_registry)
-        self.response_selector = ResponseSelector(self.config)
-        self.response_renderer = ResponseRenderer(self.config)
+        config = EchoConfig(config_path, data=state and state["config"])
+        self._components = self._build_components(config, state=state)
 
-    def process(self, text):
+        if snapshot and state is None:
+            write_snapshot(self._components, path)
+
+        # Results cache keyed by normalized text
+        self.cache = LRUCache(cache_size) if cache_size else None
+
+    def _build_components(
+        self, config, previous=None, changed=WATCHED_DIRS, state=None
+    ):
+        """
+        Build the registries and processing components of a config.
+
+        Args:
+            config (EchoConfig): Config to build from
+            previous (Components, optional): Current components, the ones
+                whose directory didn't change are taken over
+            changed (iterable): Directories that changed since previous
+            state (dict, optional): Snapshot to restore the intents from
+
+        Returns:
+            Components: New components
+        """
+        components = copy.copy(previous) if previous else Components()
+        components.generation = previous.generation + 1 if previous else 0
+        components.config = config
+
+        if "entities" in changed:
+            components.entity_registry = EntityRegistry(config)
+            components.entity_extractor = EntityExtractor(components.entity_registry)
+
+        if "sentences" in changed:
+            components.intent_registry = IntentRegistry(
+                config, snapshot=state and state["intents"]
+            )
+            components.intent_matcher = IntentMatcher(
+                components.intent_registry,
+                engine=self.options["matcher_engine"],
+                fuzzy_engine=self.options["fuzzy_engine"],
+                fuzzy_threshold=self.options["fuzzy_threshold"],
+                max_literal_expansions=self.options["max_literal_expansions"],
+                max_input_length=self.options["max_input_length"],
+                pattern_budget_ms=self.options["pattern_budget_ms"],
+            )
+
+            if state is not None:
+                components.intent_matcher.load_state(state["matcher"])
+
+        if "mappings" in changed:
+            components.response_selector = ResponseSelector(config)
+
+        if "responses" in changed:
+            components.response_renderer = ResponseRenderer(config)
+
+        return components
+
+    def process(self, text, lazy_entities=False):
         """
         Process text input to identify intents and extract entities.
 
         Args:
             text (str): Input text to process
+            lazy_entities (bool): Return entities as a mapping that only
+                extracts an entity when it is first read
 
         Returns:
             dict: Processing results with intent, confidence, and entities
         """
+        # A reload mid-request must not mix two versions
+        components = self._components
+
+        if self.cache is None:
+            return self._process(components, text, lazy_entities)[0]
+
+        self._validate_cache()
+
+        # Results of other versions stay unreachable until evicted
+        cache_key = (
+            normalize_text(text),
+            components.generation,
+            components.intent_registry.version,
+            components.entity_registry.version,
+        )
+        cached = self.cache.get(cache_key)
+
+        if cached is None:
+            result, matched_pattern, captures = self._process(
+                components, text, lazy_entities
+            )
+
+            # Lazy entities are left out, hits extract them again on demand
+            cached_result = dict(result, entities=None) if lazy_entities else result
+            self.cache.put(
+                cache_key, (copy.deepcopy(cached_result), matched_pattern, captures)
+            )
+            return result
+
+        cached_result, matched_pattern, captures = cached
+        result = copy.deepcopy(cached_result)
+
+        # Matching only sees the normalized text, but entities are extracted
+        # from the raw one, so they are reused only when the raw text agrees
+        if result["entities"] is None or result["text"] != text:
+            result["entities"] = self._extract_entities(
+                components, text, matched_pattern, captures, lazy_entities
+            )
+
+        result["text"] = text
+        return result
+
+    def _process(self, components, text, lazy_entities=False):
         # Match the intent and get the best matching pattern
-        intent_results = self.intent_matcher.match(text)
+        intent_results = components.intent_matcher.match(text)
 
         intent_name = intent_results["intent"]
         confidence = intent_results["confidence"]
-        entities = {}
+        matched_pattern = None
+        captures = None
 
         if intent_name != "fallback" and confidence > 0.5 and "match" in intent_results:
             if "pattern" in intent_results["match"]:
                 matched_pattern = intent_results["match"]["pattern"]
-                entities = self.entity_extractor.extract_from_pattern(
-                    text, matched_pattern
-                )
+                captures = intent_results["match"].get("captures")
 
         result = {
             "text": text,
             "intent": intent_name,
             "confidence": confidence,
-            "entities": entities,
+            "entities": self._extract_entities(
+                components, text, matched_pattern, captures, lazy_entities
+            ),
         }
 
-        return result
+        return result, matched_pattern, captures
+
+    def _extract_entities(
+        self, components, text, matched_pattern, captures, lazy_entities
+    ):
+        if not matched_pattern or not extract_entity_placeholder(matched_pattern):
+            return {}
+
+        if lazy_entities:
+            return components.entity_extractor.lazy_from_pattern(
+                text, matched_pattern, captures
+            )
+
+        return components.entity_extractor.extract_from_pattern(
+            text, matched_pattern, captures
+        )
+
+    def _validate_cache(self):
+        # Relative dates ("tomorrow") resolve against today, so results
+        # expire at midnight. Registry changes are part of the cache key.
+        # The day is kept on the cache, which views share with their Echo
+        self.cache.renew(datetime.now().date())
+
+    def clear_cache(self):
+        if self.cache is not None:
+            self.cache.clear()
+
+    def reload(self):
+        """
+        Rebuild whatever changed in the config directory and swap it in.
+
+        The new version is built next to the current one and replaces it in
+        one step, so requests in flight finish on the version they started
+        with. If anything fails to load, the current version is kept.
+
+        Returns:
+            dict: Changed directories, whether the new version is live,
+                seconds taken and errors
+        """
+        with self._reload_lock:
+            started = time.perf_counter()
+            current = self._components
+            config_path = current.config.config_path
+
+            signature = directory_signature(config_path)
+            changed = [
+                name
+                for name in WATCHED_DIRS
+                if signature[name] != self._signature.get(name)
+            ]
+            report = {"changed": changed, "reloaded": False, "errors": []}
+
+            if changed:
+                path = None
+                if self.options["snapshot"] and changed != ["mappings"]:
+                    path = snapshot_path(config_path, self.options)
+
+                try:
+                    config = current.config.reloaded(changed)
+                    components = self._build_components(config, current, changed)
+                    report["errors"] = components.errors()
+
+                    # Built here rather than by the first request after the swap
+                    if not report["errors"]:
+                        components.intent_matcher.build_indexes()
+                except Exception as e:
+                    report["errors"].append(str(e))
+
+                if not report["errors"]:
+                    self._components = components
+                    self._signature = signature
+                    self.clear_cache()
+                    report["reloaded"] = True
+
+                    if path is not None:
+                        write_snapshot(components, path)
+
+            report["seconds"] = round(time.perf_counter() - started, 4)
+
+            if report["reloaded"]:
+                print(
+                    f"Reloaded {', '.join(changed)} of {config_path} "
+                    f"in {report['seconds']:.2f}s"
+                )
+            for error in report["errors"]:
+                print(
+                    f"Error reloading {config_path}, keeping the current version: {error}"
+                )
+
+            self.last_reload = report
+            return report
+
+    def watch(self, interval=1.0):
+        """
+        Reload in the background whenever the config directory changes.
+
+        Args:
+            interval (float): Seconds between checks of the directory
+        """
+        if self._watcher is not None:
+            return
+
+        stop = threading.Event()
+        thread = threading.Thread(
+            target=self._watch, args=(interval, stop), name="echo-reload", daemon=True
+        )
+        self._watcher = (thread, stop)
+        thread.start()
+
+    def stop_watching(self):
+        if self._watcher is None:
+            return
+
+        thread, stop = self._watcher
+        stop.set()
+        thread.join()
+        self._watcher = None
+
+    def _watch(self, interval, stop):
+        while not stop.wait(interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Error watching {self.config.config_path}: {e}")
+
+    def poll(self):
+        """
+        Reload if the config directory changed and has been quiet since.
+
+        This is one check of watch(), for callers that can't run its thread
+        and poll on their own schedule instead. A change is reloaded on the
+        poll after the one that noticed it, so editors that save in several
+        steps are done by then.
+
+        Returns:
+            bool: Whether a new version went live
+        """
+        signature = directory_signature(self.config.config_path)
+        if signature == self._signature or signature == self._rejected_signature:
+            self._pending_signature = None
+            return False
+
+        if signature != self._pending_signature:
+            self._pending_signature = signature
+            return False
+
+        self._pending_signature = None
+        if self.reload()["reloaded"]:
+            return True
+
+        # Not retried until the files change again
+        self._rejected_signature = signature
+        return False
+
+    def view(self):
+        """
+        Get an Echo pinned to the current version.
+
+        Reloads don't affect the view, so a request can process its text and
+        render its response against the same intents. The cache is shared.
+
+        Returns:
+            Echo: Shallow copy holding on to the current components
+        """
+        return copy.copy(self)
+
+    def prepare(self):
+        """Build the indexes and regexes now, instead of on the first requests."""
+        self._components.intent_matcher.prepare()
+
+    def get_cache_stats(self):
+        if self.cache is None:
+            return None
+
+        return self.cache.stats()
+
+    def get_slow_patterns(self):
+        return self.intent_matcher.get_slow_patterns()
+
+    def process_batch(self, texts, workers=None, chunk_size=256):
+        """
+        Process many text inputs at once.
+
+        Duplicate texts are only processed once. When workers is greater than
+        one and the batch is large enough, the work is spread over a process
+        pool where every worker builds its own Echo from the same config.
+
+        Args:
+            texts (iterable): Input texts to process
+            workers (int, optional): Number of worker processes
+            chunk_size (int): Texts handed to a worker at a time
+
+        Returns:
+            list: Processing results in input order, same as process() per text
+        """
+        texts = list(texts)
+        unique_texts = list(dict.fromkeys(texts))
+
+        if workers and workers > 1 and len(unique_texts) > chunk_size:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_batch_worker,
+                initargs=(self.config.config_path, self.options),
+            ) as pool:
+                processed = list(
+                    pool.map(_process_in_worker, unique_texts, chunksize=chunk_size)
+                )
+        else:
+            processed = [self.process(text) for text in unique_texts]
+
+        results_by_text = dict(zip(unique_texts, processed))
+
+        results = []
+        seen = set()
+        for text in texts:
+            result = results_by_text[text]
+
+            # Callers may mutate results, so repeated texts get their own copy
+            if text in seen:
+                result = copy.deepcopy(result)
+
+            seen.add(text)
+            results.append(result)
+
+        return results
 
     def get_response(self, intent_name, context=None):
         context = context or {}
-        response_key = self.response_selector.select(intent_name, context)
-        return self.response_renderer.render(response_key, context)
+        components = self._components
+        response_key = components.response_selector.select(intent_name, context)
+        return components.response_renderer.render(response_key, context)
+
+
+def create_echo(config_path=None, **kwargs):
+    return Echo(config_path, **kwargs)
+
+
+_batch_worker_echo = None
+
+
+def _init_batch_worker(config_path, options):
+    global _batch_worker_echo
+
+    _batch_worker_echo = Echo(config_path, **options)
 
 
-def create_echo(config_path=None):
-    return Echo(config_path)
+def _process_in_worker(text):
+    return _batch_worker_echo.process(text)
@@ -1,41 +1,80 @@
+import argparse
+import sys
+
 from . import create_echo
+from .intent.fuzzy import FUZZY_ENGINES
+from .snapshot import compile_snapshot
+
+
+def compile_command(argv):
+    parser = argparse.ArgumentParser(
+        prog="echo compile",
+        description="Compile an intents directory into a startup snapshot",
+    )
+    parser.add_argument("path", help="Intents directory")
+    parser.add_argument("--fuzzy-engine", choices=FUZZY_ENGINES, default="sequence")
+    parser.add_argument(
+        "--literal-expansions",
+        type=int,
+        default=256,
+        help="Literal table expansion limit, 0 disables the table",
+    )
+    args = parser.parse_args(argv)
+
+    path, seconds = compile_snapshot(
+        args.path,
+        fuzzy_engine=args.fuzzy_engine,
+        max_literal_expansions=args.literal_expansions,
+    )
+    if path is None:
+        sys.exit(1)
+
+    print(f"Compiled {args.path} in {seconds:.2f}s into {path}")
+
+
+def demo():
+    echo = create_echo("../intents/")
 
-echo = create_echo("../intents/")
+    result = echo.process("what's the weather like in Seattle tomorrow?")
 
-result = echo.process("what's the weather like in Seattle tomorrow?")
+    print(f"Intent: {result['intent']} (Confidence: {result['confidence']:.2f})")
+    print("Entities:")
+    for entity_type, entities in result["entities"].items():
+        for entity in entities:
+            print(f"  - {entity_type}: {entity['raw_value']}")
 
-print(f"Intent: {result['intent']} (Confidence: {result['confidence']:.2f})")
-print("Entities:")
-for entity_type, entities in result["entities"].items():
-    for entity in entities:
-        print(f"  - {entity_type}: {entity['raw_value']}")
+    print(result)
 
+    if result["intent"] == "get_weather":
+        location = None
+        date = None
 
-print(result)
+        if "location" in result["entities"] and result["entities"]["location"]:
+            location = result["entities"]["location"][0]["value"]
 
-if result["intent"] == "get_weather":
-    location = None
-    date = None
+        if "date" in result["entities"] and result["entities"]["date"]:
+            date = result["entities"]["date"][0]["value"]
 
-    if "location" in result["entities"] and result["entities"]["location"]:
-        location = result["entities"]["location"][0]["value"]
+        weather_context = {
+            "location": location or "your location",
+            "date": date or "today",
+            "weather_condition": "sunny",
+            "temperature": "72°F",
+            "precipitation": "10% chance of rain",
+            "wind": "light breeze",
+        }
 
-    if "date" in result["entities"] and result["entities"]["date"]:
-        date = result["entities"]["date"][0]["value"]
+        print("\nContext:")
+        for key, value in weather_context.items():
+            print(f"  - {key}: {value}")
 
-    weather_context = {
-        "location": location or "your location",
-        "date": date or "today",
-        "weather_condition": "sunny",
-        "temperature": "72°F",
-        "precipitation": "10% chance of rain",
-        "wind": "light breeze",
-    }
+        response = echo.get_response(result["intent"], weather_context)
 
-    print("\nContext:")
-    for key, value in weather_context.items():
-        print(f"  - {key}: {value}")
+        print(f"\nResponse: {response}")
 
-    response = echo.get_response(result["intent"], weather_context)
 
-    print(f"\nResponse: {response}")
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["compile"]:
+        compile_command(sys.argv[2:])
+    else:
+        demo()
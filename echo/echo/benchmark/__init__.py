@@ -0,0 +1,209 @@
+"""
+Benchmarks for Echo on synthetic intent catalogs.
+
+Builds catalogs of increasing size, then times each processing stage
+(end-to-end process, exact matching, fuzzy matching and entity extraction)
+over a labeled utterance corpus. Each stage is then run once more under
+tracemalloc for its memory use, tracing would skew the timings.
+"""
+
+import gc
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from .. import Echo
+from ..utils.text import normalize_text
+from .catalog import generate_catalog, generate_utterances
+
+DEFAULT_SIZES = (100, 1000, 10000)
+
+
+def run_benchmark(
+    sizes=DEFAULT_SIZES,
+    utterance_count=500,
+    seed=0,
+    matcher_engine="sequential",
+    fuzzy_engine="sequence",
+    max_literal_expansions=256,
+):
+    """
+    Benchmark Echo on synthetic catalogs.
+
+    Args:
+        sizes (iterable): Catalog sizes (number of intents) to benchmark
+        utterance_count (int): Utterances per catalog
+        seed (int): Random seed for catalogs and utterances
+        matcher_engine (str): Matcher engine passed to Echo
+        fuzzy_engine (str): Fuzzy engine passed to Echo
+        max_literal_expansions (int): Literal table limit passed to Echo
+
+    Returns:
+        dict: Settings and one report per catalog size
+    """
+    options = {
+        "matcher_engine": matcher_engine,
+        "fuzzy_engine": fuzzy_engine,
+        "max_literal_expansions": max_literal_expansions,
+    }
+
+    reports = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix="echo-benchmark-") as path:
+            intents = generate_catalog(path, size, seed=seed)
+            utterances = generate_utterances(intents, utterance_count, seed=seed)
+            reports.append(benchmark_catalog(path, intents, utterances, options))
+
+    return {
+        "settings": {
+            "sizes": list(sizes),
+            "utterances": utterance_count,
+            "seed": seed,
+            **options,
+        },
+        "results": reports,
+    }
+
+
+def benchmark_catalog(path, intents, utterances, options):
+    """
+    Benchmark a single catalog.
+
+    Args:
+        path (str): Intents directory of the catalog
+        intents (dict): Intent name to list of patterns
+        utterances (list): Labeled utterances
+        options (dict): Keyword arguments for Echo
+
+    Returns:
+        dict: Build cost, accuracy and per-stage latency and memory
+    """
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    echo = Echo(path, cache_size=0, snapshot=False, **options)
+    build_seconds = time.perf_counter() - started
+
+    # Indexes are built lazily on first use, count them towards the build
+    started = time.perf_counter()
+    echo.process(utterances[0]["text"])
+    warmup_seconds = time.perf_counter() - started
+    _, build_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    matcher = echo.intent_matcher
+    extractor = echo.entity_extractor
+    texts = [utterance["text"] for utterance in utterances]
+    normalized = [normalize_text(text) for text in texts]
+
+    results = []
+    process_times = _time_each(lambda text: results.append(echo.process(text)), texts)
+
+    exact_matches = []
+    exact_times = _time_each(
+        lambda text: exact_matches.append(matcher.match_exact(text)), normalized
+    )
+
+    fuzzy_times = _time_each(matcher.match_fuzzy, normalized)
+
+    extraction_inputs = [
+        (text, exact_match[1], exact_match[3])
+        for text, exact_match in zip(texts, exact_matches)
+        if exact_match is not None
+    ]
+    extraction_times = _time_each(
+        lambda item: extractor.extract_from_pattern(*item), extraction_inputs
+    )
+
+    process_memory = _measure_memory(echo.process, texts)
+    exact_memory = _measure_memory(matcher.match_exact, normalized)
+    fuzzy_memory = _measure_memory(matcher.match_fuzzy, normalized)
+    extraction_memory = _measure_memory(
+        lambda item: extractor.extract_from_pattern(*item), extraction_inputs
+    )
+
+    return {
+        "intents": len(intents),
+        "patterns": sum(len(patterns) for patterns in intents.values()),
+        "build_seconds": round(build_seconds, 4),
+        "warmup_seconds": round(warmup_seconds, 4),
+        "build_peak_bytes": build_peak,
+        "accuracy": _accuracy(utterances, results),
+        "stages": {
+            "process": {**_summarize(process_times), **process_memory},
+            "exact": {**_summarize(exact_times), **exact_memory},
+            "fuzzy": {**_summarize(fuzzy_times), **fuzzy_memory},
+            "extraction": {**_summarize(extraction_times), **extraction_memory},
+        },
+    }
+
+
+def _time_each(function, items):
+    timings = []
+    for item in items:
+        started = time.perf_counter()
+        function(item)
+        timings.append(time.perf_counter() - started)
+
+    return timings
+
+
+def _measure_memory(function, items):
+    """
+    Run a stage over its items under tracemalloc.
+
+    Returns:
+        dict: Highest peak of a single call above what was allocated when
+            it started, and what the whole stage left allocated, in bytes
+    """
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    call_peak = 0
+    for item in items:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        function(item)
+        call_peak = max(call_peak, tracemalloc.get_traced_memory()[1] - before)
+
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    return {"peak_call_bytes": call_peak, "retained_bytes": retained}
+
+
+def _summarize(timings):
+    if not timings:
+        return {"count": 0}
+
+    ordered = sorted(timings)
+    total = sum(ordered)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "p50_ms": round(_percentile(ordered, 50) * 1000, 4),
+        "p99_ms": round(_percentile(ordered, 99) * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+        "throughput_per_second": round(len(ordered) / total, 1) if total else None,
+    }
+
+
+def _percentile(ordered, percent):
+    index = round(percent / 100 * (len(ordered) - 1))
+    return ordered[index]
+
+
+def _accuracy(utterances, results):
+    report = {}
+    for utterance, result in zip(utterances, results):
+        counts = report.setdefault(utterance["kind"], {"total": 0, "correct": 0})
+        counts["total"] += 1
+        counts["correct"] += result["intent"] == utterance["intent"]
+
+    for counts in report.values():
+        counts["accuracy"] = round(counts["correct"] / counts["total"], 4)
+
+    return report
@@ -0,0 +1,55 @@
+import argparse
+import json
+import sys
+
+from ..intent.fuzzy import FUZZY_ENGINES
+from ..intent.matcher import MATCHER_ENGINES
+from . import DEFAULT_SIZES, run_benchmark
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="echo.benchmark",
+        description="Benchmark Echo on synthetic intent catalogs",
+    )
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma-separated catalog sizes (number of intents)",
+    )
+    parser.add_argument(
+        "--utterances", type=int, default=500, help="Utterances per catalog"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--matcher-engine", choices=MATCHER_ENGINES, default="sequential"
+    )
+    parser.add_argument("--fuzzy-engine", choices=FUZZY_ENGINES, default="sequence")
+    parser.add_argument(
+        "--literal-expansions",
+        type=int,
+        default=256,
+        help="Literal table expansion limit, 0 disables the table",
+    )
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        sizes=[int(size) for size in args.sizes.split(",")],
+        utterance_count=args.utterances,
+        seed=args.seed,
+        matcher_engine=args.matcher_engine,
+        fuzzy_engine=args.fuzzy_engine,
+        max_literal_expansions=args.literal_expansions,
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Synthetic intent catalogs and labeled utterance corpora."""
+
+import random
+from pathlib import Path
+
+import yaml
+
+from ..utils.regex import PLACEHOLDER_MARK, expand_pattern
+
+ADJECTIVES = [
+    "red", "blue", "green", "quiet", "loud", "early", "late", "daily", "weekly",
+    "local", "remote", "shared", "private", "morning", "evening", "main", "spare",
+    "front", "back", "upper", "lower", "smart", "old", "new", "short", "long",
+    "fast", "slow", "warm", "cold", "bright", "dark", "next", "last", "first",
+    "second", "kitchen", "garden", "office", "travel", "family", "school", "work",
+    "music", "video", "photo", "sleep", "energy", "water", "power",
+]  # fmt: skip
+
+NOUNS = [
+    "lights", "timer", "alarm", "playlist", "calendar", "reminder", "note",
+    "thermostat", "door", "window", "camera", "speaker", "fan", "heater", "oven",
+    "garage", "battery", "printer", "router", "vacuum", "shopping list", "agenda",
+    "podcast", "radio", "news", "score", "traffic", "commute", "flight", "train",
+    "bus", "package", "order", "budget", "balance", "meeting", "recipe", "report",
+    "forecast", "schedule", "inbox", "message", "contact", "account", "backup",
+    "device", "sensor", "meter", "plant", "pet feeder",
+]  # fmt: skip
+
+PATTERN_TEMPLATES = [
+    "(what's|what is|tell me) the {topic}( in {{location}})?( {{date}})?",
+    "(show|give) me( the)? {topic}( for {{location}})?",
+    "(check|open) (my|the) {topic}( please)?",
+    "{topic} status( {{date}})?",
+]
+
+LOCATIONS = ["Paris", "Seattle", "New York", "Tokyo", "Bratislava", "Cape Town"]
+DATES = ["today", "tomorrow", "yesterday", "next friday", "this monday"]
+
+ENTITIES = {
+    "location": {
+        "type": "location",
+        "patterns": [
+            "in (?P<location>[A-Z][a-zA-Z\\s]+)",
+            "for (?P<location>[A-Z][a-zA-Z\\s]+)",
+        ],
+    },
+    "date": {
+        "type": "date",
+        "patterns": [
+            "(?P<date>today|tomorrow|yesterday)",
+            "(?P<date>next|this|last)\\s+(?:monday|tuesday|wednesday|thursday"
+            "|friday|saturday|sunday)",
+        ],
+    },
+}
+
+
+def intent_topics(count):
+    """Unique "<adjective> <noun>" topics, one per intent."""
+    topics = [f"{adjective} {noun}" for noun in NOUNS for adjective in ADJECTIVES]
+    if count > len(topics):
+        topics += [
+            f"{a} {b} {noun}" for a in ADJECTIVES for b in ADJECTIVES for noun in NOUNS
+        ]
+
+    if count > len(topics):
+        raise ValueError(f"Can't generate more than {len(topics)} intents")
+
+    return topics[:count]
+
+
+def generate_catalog(path, intent_count, seed=0):
+    """
+    Write a synthetic intents directory.
+
+    Every intent gets two or three patterns built from the templates around a
+    topic unique to the intent, with optional location and date placeholders.
+
+    Args:
+        path (Path): Directory to write entities/, sentences/ and responses/ to
+        intent_count (int): Number of intents
+        seed (int): Random seed
+
+    Returns:
+        dict: Intent name to list of patterns
+    """
+    rng = random.Random(seed)
+    path = Path(path)
+
+    intents = {}
+    for index, topic in enumerate(intent_topics(intent_count)):
+        templates = rng.sample(PATTERN_TEMPLATES, rng.randint(2, 3))
+        intents[f"intent_{index:05d}"] = [t.format(topic=topic) for t in templates]
+
+    for directory in ("entities", "sentences", "responses"):
+        (path / directory).mkdir(parents=True, exist_ok=True)
+
+    _dump(path / "entities" / "synthetic.yaml", {"entities": ENTITIES})
+    _dump(
+        path / "sentences" / "synthetic.yaml",
+        {"intents": {name: {"patterns": p} for name, p in intents.items()}},
+    )
+    _dump(
+        path / "responses" / "synthetic.yaml",
+        {
+            "responses": {
+                "intents": {name: {"default": "Done."} for name in intents},
+            }
+        },
+    )
+
+    return intents
+
+
+def generate_utterances(intents, count, seed=0, noisy_ratio=0.2, unknown_ratio=0.1):
+    """
+    Generate labeled utterances for a catalog.
+
+    Most utterances are sentences of a random pattern with placeholders filled
+    in. Some are noisy copies (a dropped character) meant for the fuzzy stage,
+    and some are out-of-domain and expected to fall back.
+
+    Args:
+        intents (dict): Intent name to list of patterns
+        count (int): Number of utterances
+        seed (int): Random seed
+        noisy_ratio (float): Share of noisy utterances
+        unknown_ratio (float): Share of out-of-domain utterances
+
+    Returns:
+        list: Dicts with text, expected intent and kind (exact, noisy, unknown)
+    """
+    rng = random.Random(seed)
+    names = list(intents)
+    utterances = []
+
+    for _ in range(count):
+        roll = rng.random()
+
+        if roll < unknown_ratio:
+            words = rng.sample(["banana", "quantum", "violin", "glacier", "sonnet"], 3)
+            utterances.append(
+                {"text": " ".join(words), "intent": "fallback", "kind": "unknown"}
+            )
+            continue
+
+        name = rng.choice(names)
+        sentences = expand_pattern(rng.choice(intents[name]), 10000)
+        text = rng.choice(sentences)
+
+        while PLACEHOLDER_MARK in text:
+            prefix = text[: text.index(PLACEHOLDER_MARK)]
+            is_location = prefix.endswith(("in ", "for "))
+            value = rng.choice(LOCATIONS if is_location else DATES)
+            text = text.replace(PLACEHOLDER_MARK, value, 1)
+
+        kind = "exact"
+        if roll < unknown_ratio + noisy_ratio and len(text) > 4:
+            position = rng.randrange(len(text))
+            text = text[:position] + text[position + 1 :]
+            kind = "noisy"
+
+        utterances.append({"text": text, "intent": name, "kind": kind})
+
+    return utterances
+
+
+def _dump(path, data):
+    with open(path, "w", encoding="utf-8") as file:
+        yaml.safe_dump(data, file, sort_keys=False)
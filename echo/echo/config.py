@@ -1,10 +1,11 @@
+import copy
 from pathlib import Path
 
 import yaml
 
 
 class EchoConfig:
-    def __init__(self, config_path=None):
+    def __init__(self, config_path=None, data=None):
         self.config_path = Path(config_path) if config_path else Path.cwd()
 
         # Component paths
@@ -16,10 +17,44 @@ class EchoConfig:
         # Ensure paths exist
         self._validate_paths()
 
-        # Load configurations
-        self.entities = self._load_entities()
-        self.intents = self._load_intents()
-        self.responses = self._load_responses()
+        # Load configurations, unless already parsed into a snapshot
+        if data is not None:
+            self.entities = data["entities"]
+            self.intents = data["intents"]
+            self.responses = data["responses"]
+        else:
+            self.entities = self._load_entities()
+            self.intents = self._load_intents()
+            self.responses = self._load_responses()
+
+    def reloaded(self, directories):
+        """
+        Get a copy of the config with some directories read again.
+
+        Args:
+            directories (iterable): Names of the directories that changed
+
+        Returns:
+            EchoConfig: New config, this one is left untouched
+        """
+        config = copy.copy(self)
+        config._validate_paths()
+
+        if "entities" in directories:
+            config.entities = config._load_entities()
+        if "sentences" in directories:
+            config.intents = config._load_intents()
+        if "responses" in directories:
+            config.responses = config._load_responses()
+
+        return config
+
+    def to_dict(self):
+        return {
+            "entities": self.entities,
+            "intents": self.intents,
+            "responses": self.responses,
+        }
 
     def _validate_paths(self):
         required_paths = [self.entities_path, self.sentences_path, self.responses_path]
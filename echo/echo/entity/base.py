@@ -1,10 +1,34 @@
+import bisect
+import copy
 import re
+import time
 from abc import ABC
+from datetime import date, datetime, timedelta
+from datetime import time as dt_time
 
-from ..utils.regex import pattern_complexity
+from ..utils.cache import LRUCache
+from ..utils.regex import (
+    extract_named_group,
+    first_char_class,
+    pattern_complexity,
+)
+
+_MISSING = object()
+
+# Values start at the beginning of a word, "at" in "what" isn't a location
+_WORD_START = r"(?!(?<=\w)\w)"
 
 
 class Entity(ABC):
+    # Memoize process_value per raw value. Only for entities whose values
+    # are flat dicts (or immutable), as callers get shallow copies of them.
+    memoize_values = False
+
+    # Values that depend on today's date ("tomorrow") are forgotten at midnight
+    date_relative = False
+
+    value_memo_size = 512
+
     def __init__(self, name, config):
         self.name = name
         self.type = config.get("type", name)
@@ -14,6 +38,7 @@ class Entity(ABC):
 
         self.pattern_specificity = []
         self.compiled_patterns = []
+        self.value_patterns = []
 
         for pattern in self.patterns:
             specificity = pattern_complexity(pattern)
@@ -22,36 +47,196 @@ class Entity(ABC):
             # Compile pattern
             self.compiled_patterns.append(re.compile(pattern, re.IGNORECASE))
 
-    def extract(self, text):
-        results = []
+            # Compile the bare value regex, used to validate captured text
+            value_pattern = extract_named_group(pattern, self.name)
+            if value_pattern is not None:
+                self.value_patterns.append(
+                    (re.compile(value_pattern, re.IGNORECASE), specificity)
+                )
 
-        sorted_items = sorted(
-            zip(self.compiled_patterns, self.pattern_specificity),
-            key=lambda x: x[1],
+        # Most specific patterns first, then in the order they are listed
+        self.sorted_patterns = sorted(
+            (
+                (pattern, _anchor(pattern, compiled_pattern), specificity)
+                for pattern, compiled_pattern, specificity in zip(
+                    self.patterns, self.compiled_patterns, self.pattern_specificity
+                )
+                if f"(?P<{self.name}>" in pattern
+            ),
+            key=lambda x: x[2],
             reverse=True,
         )
 
-        for pattern, specificity in sorted_items:
-            for match in pattern.finditer(text):
-                if self.name in match.groupdict():
-                    value = match.group(self.name)
-                    start, end = match.span(self.name)
+        self._scanner, self._scanner_branches = self._build_scanner()
+
+        self._value_memo = (
+            LRUCache(self.value_memo_size) if self.memoize_values else None
+        )
+        self._value_memo_expires = 0.0
+
+    def _build_scanner(self):
+        """
+        Merge the patterns into one scanner that runs over the text once.
+
+        Every pattern becomes a branch of an alternation inside a lookahead,
+        so the scanner tries all of them at each position without consuming
+        text, and reports the first one in pattern order that matches there.
+        Branches can't start in the middle of a word. Patterns
+        with numbered backreferences can't be merged, as merging renumbers
+        their groups; they, and anything else that fails to compile, make
+        extract() fall back to running each pattern on its own.
+        """
+        if not self.sorted_patterns:
+            return None, {}
+
+        branches = []
+        branch_map = {}
+        first_chars = []
+
+        for index, (pattern, _, specificity) in enumerate(self.sorted_patterns):
+            if re.search(r"\\[1-9]", pattern):
+                return None, {}
 
-                    processed_value = self.process_value(value)
+            # Named groups are repeated across patterns, so tag them per branch
+            prefix = f"_b{index}_"
+            processed = re.sub(r"\(\?P<(\w+)>", rf"(?P<{prefix}\1>", pattern)
+            processed = re.sub(r"\(\?P=(\w+)\)", rf"(?P={prefix}\1)", processed)
 
-                    results.append(
-                        {
-                            "entity": self.name,
-                            "value": processed_value,
-                            "raw_value": value,
-                            "start": start,
-                            "end": end,
-                            "specificity": specificity,
-                        }
-                    )
+            branches.append(f"(?P<_b{index}>{processed})")
+            branch_map[f"_b{index}"] = (prefix + self.name, specificity, index)
+            first_chars.append(first_char_class(pattern))
+
+        # A lookahead doesn't let the regex engine skip ahead to positions a
+        # pattern can start at, so that check is done up front instead
+        prefilter = ""
+        if None not in first_chars:
+            atoms = dict.fromkeys(chars[1:-1] for chars in first_chars)
+            prefilter = f"(?=[{''.join(atoms)}])"
+
+        try:
+            scanner = re.compile(
+                f"{prefilter}{_WORD_START}(?=(?:{'|'.join(branches)}))",
+                re.IGNORECASE,
+            )
+        except re.error:
+            return None, {}
+
+        return scanner, branch_map
+
+    def extract(self, text, pos=0, endpos=None):
+        """
+        Find the entity's values in text.
+
+        Values whose spans overlap are resolved to the most specific pattern,
+        then the one listed first, then the longest value.
+
+        Args:
+            text (str): Text to search
+            pos (int): Start of the region to search
+            endpos (int, optional): End of the region to search
+
+        Returns:
+            list: Extraction results in pattern order, then in text order
+        """
+        endpos = len(text) if endpos is None else endpos
+
+        results = []
+        for specificity, _, start, end in _resolve_overlaps(
+            self._find_candidates(text, pos, endpos)
+        ):
+            results.append(self._build_result(text[start:end], start, end, specificity))
 
         return results
 
+    def _find_candidates(self, text, pos, endpos):
+        """
+        Collect (specificity, order, start, end) of every value found in
+        text, order being the index of the pattern in sorted_patterns.
+        """
+        candidates = []
+
+        if self._scanner is not None:
+            for match in self._scanner.finditer(text, pos, endpos):
+                # The branch group encloses everything else, so it closes last
+                group_name, specificity, order = self._scanner_branches[match.lastgroup]
+                start, end = match.span(group_name)
+                if start != -1:
+                    candidates.append((specificity, order, start, end))
+        else:
+            for order, (_, compiled_pattern, specificity) in enumerate(
+                self.sorted_patterns
+            ):
+                for match in compiled_pattern.finditer(text, pos, endpos):
+                    start, end = match.span(self.name)
+                    if start != -1:
+                        candidates.append((specificity, order, start, end))
+
+        return candidates
+
+    def extract_from_span(self, text, start, end):
+        """
+        Extract the entity from a span the intent pattern already captured.
+
+        Entity patterns only run on the captured substring. When they need
+        context outside of it (like "in " before a location), the captured
+        text itself is the value as long as it fits the entity's value regex.
+        """
+        return self.extract_within_span(text, start, end) or self.value_from_span(
+            text, start, end
+        )
+
+    def extract_within_span(self, text, start, end):
+        """Run the entity's patterns on a captured span, and nothing else."""
+        start, end = strip_span(text, start, end)
+        if start == end:
+            return []
+
+        return self.extract(text, start, end)
+
+    def value_from_span(self, text, start, end):
+        """Take a captured span as the value if it fits the value regex."""
+        start, end = strip_span(text, start, end)
+        if start == end:
+            return []
+
+        stripped = text[start:end]
+        if not self.patterns:
+            return [self._build_result(stripped, start, end, 0)]
+
+        for value_pattern, specificity in self.value_patterns:
+            if value_pattern.fullmatch(stripped):
+                return [self._build_result(stripped, start, end, specificity)]
+
+        return []
+
+    def _build_result(self, value, start, end, specificity):
+        return {
+            "entity": self.name,
+            "value": self.resolve_value(value),
+            "raw_value": value,
+            "start": start,
+            "end": end,
+            "specificity": specificity,
+        }
+
+    def resolve_value(self, raw_value):
+        """Process a raw value, answering repeated values from the memo."""
+        if self._value_memo is None:
+            return self.process_value(raw_value)
+
+        # Cheaper than keying every entry by date.today()
+        if self.date_relative and time.time() >= self._value_memo_expires:
+            self._value_memo.clear()
+            midnight = datetime.combine(date.today() + timedelta(days=1), dt_time())
+            self._value_memo_expires = midnight.timestamp()
+
+        value = self._value_memo.get(raw_value, _MISSING)
+        if value is _MISSING:
+            value = self.process_value(raw_value)
+            self._value_memo.put(raw_value, value)
+
+        return copy.copy(value)
+
     def process_value(self, raw_value):
         """Process the raw extracted value into a structured format."""
 
@@ -65,3 +250,39 @@ class Entity(ABC):
                 return 0.5
 
         return 0.3
+
+
+def _anchor(pattern, compiled_pattern):
+    """Compile pattern so that it can't match from the middle of a word."""
+    try:
+        return re.compile(f"{_WORD_START}(?:{pattern})", re.IGNORECASE)
+    except re.error:
+        return compiled_pattern
+
+
+def strip_span(text, start, end):
+    """Narrow a span down to the text inside it without surrounding whitespace."""
+    value = text[start:end]
+    stripped = value.strip()
+    start += len(value) - len(value.lstrip())
+    return start, start + len(stripped)
+
+
+def _resolve_overlaps(candidates):
+    # Greedily keep the most specific, first listed, then longest, then
+    # leftmost spans
+    ranked = sorted(candidates, key=lambda c: (-c[0], c[1], c[2] - c[3], c[2]))
+
+    starts = []
+    kept = []
+    for candidate in ranked:
+        _, _, start, end = candidate
+        index = bisect.bisect_right(starts, start)
+        overlaps_before = index and kept[index - 1][3] > start
+        overlaps_after = index < len(kept) and kept[index][2] < end
+
+        if not (overlaps_before or overlaps_after):
+            starts.insert(index, start)
+            kept.insert(index, candidate)
+
+    return sorted(kept, key=lambda c: (-c[0], c[1], c[2]))
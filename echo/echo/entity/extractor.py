@@ -1,19 +1,56 @@
-from typing import Any, Dict, List
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Tuple
 
-from ..utils.text import extract_entity_placeholder
+from ..utils.text import extract_entity_placeholder, map_normalized_spans
+from .base import strip_span
 
 
 class EntityExtractor:
     def __init__(self, entity_registry):
         self.entity_registry = entity_registry
 
-    def extract_from_pattern(self, text: str, pattern: str) -> Dict[str, List[Any]]:
+    def extract_from_pattern(
+        self,
+        text: str,
+        pattern: str,
+        captures: Optional[Dict[str, Tuple[int, int]]] = None,
+    ) -> Dict[str, List[Any]]:
+        results = {}
+        for _ in self._extraction_steps(text, pattern, captures, results):
+            pass
+
+        return results
+
+    def lazy_from_pattern(
+        self,
+        text: str,
+        pattern: str,
+        captures: Optional[Dict[str, Tuple[int, int]]] = None,
+    ) -> "LazyEntities":
+        """Same as extract_from_pattern, but extract on first access."""
+        results = {}
+        steps = self._extraction_steps(text, pattern, captures, results)
+
+        return LazyEntities(extract_entity_placeholder(pattern), results, steps)
+
+    def _extraction_steps(self, text, pattern, captures, results):
+        """
+        Fill results entity by entity.
+
+        Yields the names whose results are final after each step, so
+        extraction can stop as soon as the entity asked for is settled.
+        """
         entity_names = extract_entity_placeholder(pattern)
 
         if not entity_names:
-            return {}
+            return
 
-        results = {}
+        # Spans captured by the intent match refer to the normalized text
+        spans = map_normalized_spans(text, captures) if captures is not None else None
+
+        if spans is not None:
+            yield from self._extract_from_spans(text, entity_names, spans, results)
+            return
 
         for entity_name in entity_names:
             entity_handler = self.entity_registry.get_entity(entity_name)
@@ -22,4 +59,178 @@ class EntityExtractor:
                 if extracted:
                     results[entity_name] = extracted
 
-        return results
+            yield (entity_name,)
+
+    def _extract_from_spans(self, text, entity_names, spans, results):
+        previous = None
+
+        ordered = sorted(
+            (span, name) for name, span in spans.items() if name in entity_names
+        )
+
+        # Placeholders in optional groups that didn't take part in the match,
+        # and ones whose span turned out empty, are looked for in the whole
+        # text at the end
+        missing = [name for name in entity_names if name not in spans]
+        unresolved = []
+
+        for (start, end), entity_name in ordered:
+            entity_handler = self.entity_registry.get_entity(entity_name)
+            extracted = (
+                entity_handler.extract_within_span(text, start, end)
+                if entity_handler
+                else []
+            )
+
+            if entity_handler and not extracted:
+                # Groups match lazily, so an earlier optional group can take
+                # a later entity's text: "forecast( for {location})?( {date})?"
+                # captures "tomorrow" as the location. A placeholder that was
+                # left out and recognizes all of it gets it, before the value
+                # regex would accept it for this entity.
+                owner = self._claim_span(text, start, end, missing, results)
+                if owner is not None:
+                    missing.remove(owner)
+                    if previous:
+                        yield self._settled(previous[0], results, unresolved)
+                    previous = None
+
+                    yield (owner, entity_name)
+                    continue
+
+                extracted = entity_handler.value_from_span(text, start, end)
+
+            # Placeholders match lazily, so a multi-word value can spill into
+            # the next placeholder ("new york" -> location "new", date "york").
+            # Text the next entity doesn't claim is given back to the previous one.
+            claimed_start = min((e["start"] for e in extracted), default=end)
+            if previous and text[start:claimed_start].strip():
+                previous_name, previous_handler, previous_start, previous_end = previous
+                previous_end = max(
+                    (e["end"] for e in results.get(previous_name, ())),
+                    default=previous_end,
+                )
+
+                if not text[previous_end:start].strip():
+                    merged = previous_handler.extract_from_span(
+                        text, previous_start, claimed_start
+                    )
+                    if merged:
+                        results[previous_name] = merged
+
+            if extracted:
+                results[entity_name] = extracted
+
+            # An entity that found nothing yet may still be completed by the
+            # next span, e.g. a gazetteer name cut in half. Only the previous
+            # entity can change, so anything before it is settled.
+            if entity_handler:
+                if previous:
+                    yield self._settled(previous[0], results, unresolved)
+                previous = (entity_name, entity_handler, start, end)
+            else:
+                yield (entity_name,)
+
+        if previous:
+            yield self._settled(previous[0], results, unresolved)
+
+        # The rest are looked for in the whole text, like without captures
+        for entity_name in missing + unresolved:
+            entity_handler = self.entity_registry.get_entity(entity_name)
+            if entity_handler:
+                extracted = entity_handler.extract(text)
+                if extracted:
+                    results[entity_name] = extracted
+
+            yield (entity_name,)
+
+    @staticmethod
+    def _settled(entity_name, results, unresolved):
+        """Settle an entity after its span, unless it found nothing in it."""
+        if entity_name in results:
+            return (entity_name,)
+
+        unresolved.append(entity_name)
+        return ()
+
+    def _claim_span(self, text, start, end, candidates, results):
+        """
+        Give a captured span to the first candidate entity that recognizes
+        all of it.
+
+        Returns:
+            str: Name of the entity that took the span, or None
+        """
+        start, end = strip_span(text, start, end)
+
+        for entity_name in candidates:
+            entity_handler = self.entity_registry.get_entity(entity_name)
+            if entity_handler is None:
+                continue
+
+            claimed = entity_handler.extract_within_span(text, start, end)
+            if claimed and (
+                min(result["start"] for result in claimed) == start
+                and max(result["end"] for result in claimed) == end
+            ):
+                results[entity_name] = claimed
+                return entity_name
+
+        return None
+
+
+class LazyEntities(Mapping):
+    """
+    Extracted entities of a match, resolved on first access.
+
+    Reading an entity runs extraction only as far as needed to settle it,
+    and keeps the results for later reads. Iterating and len() extract
+    everything.
+    """
+
+    def __init__(self, entity_names, results, steps):
+        self._entity_names = set(entity_names)
+        self._results = results
+        self._steps = steps
+        self._settled = set()
+        self._done = False
+
+    def _settle(self, entity_name=None):
+        while not self._done and (
+            entity_name is None or entity_name not in self._settled
+        ):
+            step = next(self._steps, None)
+            if step is None:
+                self._done = True
+            else:
+                self._settled.update(step)
+
+    def resolve(self):
+        """Extract everything and return a plain dict of the results."""
+        self._settle()
+        return dict(self._results)
+
+    def __getitem__(self, entity_name):
+        if entity_name not in self._entity_names:
+            raise KeyError(entity_name)
+
+        self._settle(entity_name)
+        return self._results[entity_name]
+
+    def __contains__(self, entity_name):
+        if entity_name not in self._entity_names:
+            return False
+
+        self._settle(entity_name)
+        return entity_name in self._results
+
+    def __iter__(self):
+        self._settle()
+        return iter(self._results)
+
+    def __len__(self):
+        self._settle()
+        return len(self._results)
+
+    def __repr__(self):
+        return f"LazyEntities({self.resolve()!r})"
@@ -6,6 +6,8 @@ class EntityRegistry:
     def __init__(self, config):
         self.config = config
         self.entities = {}
+        self.errors = {}
+        self.version = 0
 
         self._register_entities()
 
@@ -14,18 +16,26 @@ class EntityRegistry:
             try:
                 entity_type = entity_config.get("type", entity_name)
 
+                # Entities may reference data files next to their YAML
+                entity_config = {
+                    "base_path": self.config.entities_path,
+                    **entity_config,
+                }
+
                 if entity_type in STANDARD_ENTITIES:
                     entity_class = STANDARD_ENTITIES[entity_type]
                     entity_handler = entity_class(entity_name, entity_config)
                 else:
                     entity_handler = Entity(entity_name, entity_config)
 
-                self.entities[entity_name] = entity_handler
+                self.register_entity(entity_name, entity_handler)
             except Exception as e:
+                self.errors[entity_name] = str(e)
                 print(f"Error registering entity {entity_name}: {e}")
 
     def register_entity(self, entity_name, entity_handler):
         self.entities[entity_name] = entity_handler
+        self.version += 1
 
     def get_entity(self, entity_name):
         return self.entities.get(entity_name)
@@ -1,4 +1,5 @@
 from .datetime import DateEntity, DurationEntity, TimeEntity
+from .gazetteer import GazetteerEntity
 from .location import LocationEntity
 from .numeric import NumberEntity
 from .weather import (
@@ -18,4 +19,5 @@ STANDARD_ENTITIES = {
     "temperature": TemperatureEntity,
     "precipitation": PrecipitationEntity,
     "wind": WindEntity,
+    "gazetteer": GazetteerEntity,
 }
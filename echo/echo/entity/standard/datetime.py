@@ -7,6 +7,15 @@ from ..base import Entity
 
 
 class DateEntity(Entity):
+    memoize_values = True
+    date_relative = True
+
+    DAY_PATTERN = re.compile(
+        r"(next|last|this)\s+(monday|tuesday|wednesday|thursday|friday|saturday|sunday)",
+        re.IGNORECASE,
+    )
+    DATE_PATTERN = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{2,4})")
+
     def process_value(self, raw_value):
         lower_value = raw_value.lower()
         today = datetime.now().date()
@@ -28,8 +37,7 @@ class DateEntity(Entity):
                 "relative": "yesterday",
             }
 
-        day_pattern = r"(next|last|this)\s+(monday|tuesday|wednesday|thursday|friday|saturday|sunday)"
-        day_match = re.match(day_pattern, lower_value, re.IGNORECASE)
+        day_match = self.DAY_PATTERN.match(lower_value)
         if day_match:
             return {
                 "date": lower_value,
@@ -38,8 +46,7 @@ class DateEntity(Entity):
                 "day": day_match.group(2),
             }
 
-        date_pattern = r"(\d{1,2})/(\d{1,2})/(\d{2,4})"
-        date_match = re.match(date_pattern, lower_value)
+        date_match = self.DATE_PATTERN.match(lower_value)
         if date_match:
             month = int(date_match.group(1))
             day = int(date_match.group(2))
@@ -65,11 +72,22 @@ class DateEntity(Entity):
 
 
 class TimeEntity(Entity):
+    memoize_values = True
+
+    TIME_PATTERN = re.compile(r"(\d{1,2}):(\d{2})\s*(AM|PM|am|pm)?")
+    NAMED_TIMES = {
+        "morning": {"time": "09:00", "period": "morning"},
+        "noon": {"time": "12:00", "period": "noon"},
+        "afternoon": {"time": "15:00", "period": "afternoon"},
+        "evening": {"time": "19:00", "period": "evening"},
+        "night": {"time": "22:00", "period": "night"},
+        "midnight": {"time": "00:00", "period": "midnight"},
+    }
+
     def process_value(self, raw_value):
         lower_value = raw_value.lower()
 
-        time_pattern = r"(\d{1,2}):(\d{2})\s*(AM|PM|am|pm)?"
-        time_match = re.match(time_pattern, lower_value)
+        time_match = self.TIME_PATTERN.match(lower_value)
         if time_match:
             hour = int(time_match.group(1))
             minute = int(time_match.group(2))
@@ -89,31 +107,28 @@ class TimeEntity(Entity):
                 "minute": minute,
             }
 
-        named_times = {
-            "morning": {"time": "09:00", "period": "morning"},
-            "noon": {"time": "12:00", "period": "noon"},
-            "afternoon": {"time": "15:00", "period": "afternoon"},
-            "evening": {"time": "19:00", "period": "evening"},
-            "night": {"time": "22:00", "period": "night"},
-            "midnight": {"time": "00:00", "period": "midnight"},
-        }
-
-        if lower_value in named_times:
+        if lower_value in self.NAMED_TIMES:
             return {
-                "time": named_times[lower_value]["time"],
+                "time": self.NAMED_TIMES[lower_value]["time"],
                 "type": "period",
-                "period": named_times[lower_value]["period"],
+                "period": self.NAMED_TIMES[lower_value]["period"],
             }
 
         return {"time": raw_value, "type": "unknown"}
 
 
 class DurationEntity(Entity):
+    memoize_values = True
+
+    DURATION_PATTERN = re.compile(r"(\d+)\s+(second|minute|hour|day|week|month|year)s?")
+    INDEFINITE_PATTERN = re.compile(
+        r"(a|an|one)\s+(second|minute|hour|day|week|month|year)"
+    )
+
     def process_value(self, raw_value):
         lower_value = raw_value.lower()
 
-        duration_pattern = r"(\d+)\s+(second|minute|hour|day|week|month|year)s?"
-        duration_match = re.match(duration_pattern, lower_value)
+        duration_match = self.DURATION_PATTERN.match(lower_value)
         if duration_match:
             amount = int(duration_match.group(1))
             unit = duration_match.group(2)
@@ -125,8 +140,7 @@ class DurationEntity(Entity):
                 "unit": unit,
             }
 
-        indefinite_pattern = r"(a|an|one)\s+(second|minute|hour|day|week|month|year)"
-        indefinite_match = re.match(indefinite_pattern, lower_value)
+        indefinite_match = self.INDEFINITE_PATTERN.match(lower_value)
         if indefinite_match:
             unit = indefinite_match.group(2)
 
@@ -0,0 +1,220 @@
+import hashlib
+import pickle
+import re
+from pathlib import Path
+
+from ...utils.cache import default_cache_dir, write_pickle
+from ..base import Entity
+
+_TOKEN = re.compile(r"\w+")
+
+# Bump when the pickled automaton layout changes
+_CACHE_FORMAT = 1
+
+
+class GazetteerAutomaton:
+    """
+    Aho-Corasick automaton over word tokens.
+
+    Names are matched on whole words, so "York" never hits inside "Yorkshire"
+    and punctuation between words is ignored. All names (and names inside
+    names) are found in a single pass over the tokens of the text.
+    """
+
+    def __init__(self, entries):
+        """
+        Args:
+            entries (iterable): (canonical value, list of synonyms) pairs
+        """
+        self.values = []
+
+        # Transitions live in one dict keyed by (node, token), it's far
+        # smaller than a dict per node for hundreds of thousands of names
+        self.goto = {}
+        self.output = [-1]
+        self.depth = [0]
+        self.fail = [0]
+        self.output_link = [0]
+
+        children = [[]]
+
+        for value, synonyms in entries:
+            value_index = len(self.values)
+            self.values.append(value)
+
+            for name in (value, *synonyms):
+                node = 0
+                for token in _tokenize(name):
+                    child = self.goto.get((node, token))
+                    if child is None:
+                        child = len(self.output)
+                        self.goto[(node, token)] = child
+                        self.output.append(-1)
+                        self.depth.append(self.depth[node] + 1)
+                        children.append([])
+                        children[node].append((token, child))
+                    node = child
+
+                # The first entry wins a name shared by several values
+                if node and self.output[node] == -1:
+                    self.output[node] = value_index
+
+        self._link(children)
+
+    def _link(self, children):
+        node_count = len(self.output)
+        self.fail = [0] * node_count
+        self.output_link = [0] * node_count
+
+        queue = [child for _, child in children[0]]
+        for node in queue:
+            for token, child in children[node]:
+                fallback = self.fail[node]
+                while fallback and (fallback, token) not in self.goto:
+                    fallback = self.fail[fallback]
+
+                # Children of the root fail back to the root, not themselves
+                target = self.goto.get((fallback, token), 0)
+                if target == child:
+                    target = 0
+
+                self.fail[child] = target
+                self.output_link[child] = (
+                    target if self.output[target] != -1 else self.output_link[target]
+                )
+                queue.append(child)
+
+    def find(self, text, pos=0, endpos=None):
+        """
+        Find every name in text.
+
+        Returns:
+            list: (value index, start, end) of every hit, nested hits included
+        """
+        endpos = len(text) if endpos is None else endpos
+        tokens = list(_TOKEN.finditer(text, pos, endpos))
+
+        hits = []
+        node = 0
+        for index, match in enumerate(tokens):
+            token = match.group().lower()
+
+            while node and (node, token) not in self.goto:
+                node = self.fail[node]
+            node = self.goto.get((node, token), 0)
+
+            hit = node if self.output[node] != -1 else self.output_link[node]
+            while hit:
+                first = tokens[index - self.depth[hit] + 1]
+                hits.append((self.output[hit], first.start(), match.end()))
+                hit = self.output_link[hit]
+
+        return hits
+
+    def lookup(self, name):
+        """Get the canonical value of a name or synonym, or None."""
+        node = 0
+        for token in _tokenize(name):
+            node = self.goto.get((node, token))
+            if node is None:
+                return None
+
+        return self.values[self.output[node]] if self.output[node] != -1 else None
+
+
+class GazetteerEntity(Entity):
+    """
+    Entity backed by a list of known values instead of (or next to) regexes.
+
+    Values come from the "values" key, either plain names or mappings with a
+    "value" and its "synonyms", and from an optional "source" file with one
+    value per line followed by its synonyms, separated by tabs. The built
+    automaton is pickled to the cache directory, keyed by a hash of the
+    values, so later startups skip the build.
+    """
+
+    memoize_values = True
+
+    def __init__(self, name, config):
+        super().__init__(name, config)
+
+        self.base_path = Path(config.get("base_path", "."))
+        self.source = config.get("source")
+        self.cache_dir = Path(config.get("cache_dir") or default_cache_dir())
+
+        self.automaton = self._load_automaton(config.get("values", []))
+
+        # Known names beat anything the entity's regexes come up with
+        self.gazetteer_specificity = max(self.pattern_specificity, default=0) + 1
+
+    def _find_candidates(self, text, pos, endpos):
+        candidates = super()._find_candidates(text, pos, endpos)
+
+        for _, start, end in self.automaton.find(text, pos, endpos):
+            candidates.append((self.gazetteer_specificity, -1, start, end))
+
+        return candidates
+
+    def value_from_span(self, text, start, end):
+        if self.patterns:
+            return super().value_from_span(text, start, end)
+
+        # Without regexes to fall back on, only known names are accepted
+        return []
+
+    def process_value(self, raw_value):
+        canonical = self.automaton.lookup(raw_value)
+
+        return {"name": canonical or raw_value, "type": self.name}
+
+    def _load_automaton(self, values):
+        source_data = b""
+        source_path = None
+        if self.source:
+            source_path = self.base_path / self.source
+            source_data = source_path.read_bytes()
+
+        digest = hashlib.sha256()
+        digest.update(f"{_CACHE_FORMAT}\0".encode())
+        digest.update(repr(values).encode())
+        digest.update(b"\0" + source_data)
+        cache_path = self.cache_dir / "gazetteer" / f"{digest.hexdigest()}.pickle"
+
+        try:
+            with open(cache_path, "rb") as file:
+                return pickle.load(file)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading gazetteer cache {cache_path}: {e}")
+
+        entries = list(_inline_entries(values))
+        if source_path is not None:
+            entries.extend(_source_entries(source_data.decode("utf-8")))
+
+        automaton = GazetteerAutomaton(entries)
+        try:
+            write_pickle(cache_path, automaton)
+        except OSError as e:
+            print(f"Error writing gazetteer cache {cache_path}: {e}")
+
+        return automaton
+
+
+def _tokenize(text):
+    return [token.lower() for token in _TOKEN.findall(text)]
+
+
+def _inline_entries(values):
+    for item in values:
+        if isinstance(item, dict):
+            yield str(item["value"]), [str(s) for s in item.get("synonyms", [])]
+        else:
+            yield str(item), []
+
+
+def _source_entries(data):
+    for line in data.splitlines():
+        names = [name.strip() for name in line.split("\t") if name.strip()]
+        if names and not names[0].startswith("#"):
+            yield names[0], names[1:]
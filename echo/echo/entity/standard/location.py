@@ -2,6 +2,8 @@ from ..base import Entity
 
 
 class LocationEntity(Entity):
+    memoize_values = True
+
     def process_value(self, raw_value):
         # TODO: Implement more sophisticated location processing
 
@@ -2,6 +2,8 @@ from ..base import Entity
 
 
 class NumberEntity(Entity):
+    memoize_values = True
+
     WORD_TO_NUMBER = {
         "one": 1,
         "two": 2,
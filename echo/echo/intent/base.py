@@ -1,6 +1,8 @@
-import re
-
-from ..utils.regex import convert_entity_placeholders
+from ..utils.regex import (
+    analyze_pattern,
+    clean_pattern_for_fuzzy,
+    compile_intent_pattern,
+)
 
 
 class Intent:
@@ -9,10 +11,32 @@ class Intent:
         self.patterns = config.get("patterns", [])
         self.required_entities = config.get("requires", [])
 
-        self.compiled_patterns = []
+        self._compiled_patterns = []
+        self.fuzzy_patterns = []
+        self.pattern_issues = {}
         for pattern in self.patterns:
-            pattern = convert_entity_placeholders(pattern)
-            self.compiled_patterns.append(re.compile(pattern, re.IGNORECASE))
+            self._compiled_patterns.append(compile_intent_pattern(pattern))
+            self.fuzzy_patterns.append(clean_pattern_for_fuzzy(pattern))
+
+            issues = analyze_pattern(pattern)
+            if issues:
+                self.pattern_issues[pattern] = issues
+
+    @property
+    def compiled_patterns(self):
+        # Compiled regexes aren't worth pickling (unpickling compiles them
+        # again), so intents loaded from a snapshot compile on first use
+        if self._compiled_patterns is None:
+            self._compiled_patterns = [
+                compile_intent_pattern(pattern) for pattern in self.patterns
+            ]
+
+        return self._compiled_patterns
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_compiled_patterns"] = None
+        return state
 
     def matches(self, text, entities=None):
         entities = entities or {}
@@ -0,0 +1,366 @@
+import heapq
+import math
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+
+# Confidence a fuzzy match needs by default, on the SequenceMatcher ratio scale
+DEFAULT_FUZZY_THRESHOLD = 0.6
+
+
+def char_ngram_counts(text, n=3):
+    """
+    Count the character n-grams of a text.
+
+    The text is padded with spaces so that word boundaries produce grams too.
+
+    Args:
+        text (str): Text to split
+        n (int): Gram length
+
+    Returns:
+        Counter: Occurrences of each n-gram
+    """
+    padded = f" {text} "
+    if len(padded) < n:
+        return Counter([padded])
+
+    return Counter(padded[i : i + n] for i in range(len(padded) - n + 1))
+
+
+def char_ngrams(text, n=3):
+    """
+    Split text into its set of character n-grams.
+
+    Args:
+        text (str): Text to split
+        n (int): Gram length
+
+    Returns:
+        set: Unique n-grams of the text
+    """
+    return set(char_ngram_counts(text, n))
+
+
+class SequenceFuzzyScorer:
+    """
+    Fuzzy scorer based on difflib.SequenceMatcher.
+
+    Cleaned patterns are computed once per registry version and kept in a
+    character trigram inverted index. When top_k is set, only the top_k
+    patterns sharing the most trigrams with the text get an exact
+    SequenceMatcher score; with top_k=None every pattern is scored.
+    """
+
+    def __init__(self, intent_registry, top_k=25, ngram_size=3):
+        self.intent_registry = intent_registry
+        self.top_k = top_k
+        self.ngram_size = ngram_size
+
+        self._entries = []
+        self._gram_counts = []
+        self._postings = {}
+        self._version = None
+
+    def score(self, normalized_text):
+        """
+        Find the best fuzzy match for the text.
+
+        Args:
+            normalized_text (str): Normalized input text
+
+        Returns:
+            tuple: (intent_name, pattern, ratio), or None if nothing scored
+        """
+        self.refresh()
+
+        matcher = SequenceMatcher(None)
+        matcher.set_seq2(normalized_text)
+
+        best = None
+        best_ratio = 0.0
+
+        for index in self._shortlist(normalized_text):
+            intent_name, pattern, clean_pattern = self._entries[index]
+
+            matcher.set_seq1(clean_pattern)
+            ratio = matcher.ratio()
+
+            if ratio > best_ratio:
+                best = (intent_name, pattern, ratio)
+                best_ratio = ratio
+
+        return best
+
+    def _shortlist(self, normalized_text):
+        if self.top_k is None or len(self._entries) <= self.top_k:
+            return range(len(self._entries))
+
+        query_grams = char_ngrams(normalized_text, self.ngram_size)
+
+        shared = defaultdict(int)
+        for gram in query_grams:
+            for index in self._postings.get(gram, ()):
+                shared[index] += 1
+
+        # Dice coefficient over trigram sets approximates the SequenceMatcher ratio
+        query_size = len(query_grams)
+        candidates = heapq.nlargest(
+            self.top_k,
+            shared,
+            key=lambda i: 2 * shared[i] / (query_size + self._gram_counts[i]),
+        )
+
+        # Score in catalog order so ties resolve like an exhaustive scan
+        return sorted(candidates)
+
+    def dump_state(self):
+        """Get the built index for a snapshot."""
+        self.refresh()
+
+        return {
+            "ngram_size": self.ngram_size,
+            "entries": self._entries,
+            "gram_counts": self._gram_counts,
+            "postings": self._postings,
+        }
+
+    def load_state(self, state):
+        """Take over an index from dump_state, built for the current registry."""
+        if state.get("ngram_size") != self.ngram_size or "postings" not in state:
+            return
+
+        self._entries = state["entries"]
+        self._gram_counts = state["gram_counts"]
+        self._postings = state["postings"]
+        self._version = self.intent_registry.version
+
+    def refresh(self):
+        if self._version != self.intent_registry.version:
+            self._build()
+
+    def _build(self):
+        entries = []
+        gram_counts = []
+        postings = defaultdict(list)
+
+        for intent_name, intent in self.intent_registry.compiled_intents.items():
+            for pattern, clean_pattern in zip(intent.patterns, intent.fuzzy_patterns):
+                index = len(entries)
+                grams = char_ngrams(clean_pattern, self.ngram_size)
+
+                entries.append((intent_name, pattern, clean_pattern))
+                gram_counts.append(len(grams))
+                for gram in grams:
+                    postings[gram].append(index)
+
+        self._entries = entries
+        self._gram_counts = gram_counts
+        self._postings = dict(postings)
+        self._version = self.intent_registry.version
+
+
+class TfidfFuzzyScorer:
+    """
+    Vectorized fuzzy scorer based on character trigram TF-IDF vectors.
+
+    All cleaned patterns are stored as L2-normalized TF-IDF rows of a sparse
+    matrix in compressed column layout. Scoring a text is one sparse-dense
+    product (gather + bincount). Cosine similarities run much lower than
+    SequenceMatcher ratios for the same texts, so the confidence is the cosine
+    similarity mapped onto the ratio scale, and the same thresholds work for
+    both engines. Requires numpy.
+    """
+
+    # Cosine similarity that is as good a match as a ratio of
+    # DEFAULT_FUZZY_THRESHOLD. At 0.28 misspelled queries of the bundled
+    # intents mostly resolve like with the sequence engine, and about as
+    # many out-of-domain ones are taken in.
+    match_cosine = 0.28
+
+    def __init__(self, intent_registry, ngram_size=3):
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError(
+                "The tfidf fuzzy engine requires numpy (pip install numpy)"
+            ) from e
+
+        self._np = np
+        self.intent_registry = intent_registry
+        self.ngram_size = ngram_size
+
+        self._entries = []
+        self._vocabulary = {}
+        self._idf = None
+        self._unknown_idf = 1.0
+        self._col_ptr = None
+        self._row_indices = None
+        self._values = None
+        self._version = None
+
+    def score(self, normalized_text):
+        """
+        Find the best fuzzy match for the text.
+
+        Args:
+            normalized_text (str): Normalized input text
+
+        Returns:
+            tuple: (intent_name, pattern, confidence), or None if nothing scored
+        """
+        np = self._np
+
+        self.refresh()
+
+        if not self._entries or not normalized_text:
+            return None
+
+        columns = []
+        weights = []
+        norm = 0.0
+
+        for gram, count in char_ngram_counts(normalized_text, self.ngram_size).items():
+            column = self._vocabulary.get(gram)
+            if column is None:
+                # Unseen grams can't match anything but still dilute the score
+                norm += (count * self._unknown_idf) ** 2
+                continue
+
+            weight = count * self._idf[column]
+            norm += weight**2
+            columns.append(column)
+            weights.append(weight)
+
+        if not columns:
+            return None
+
+        starts = self._col_ptr[columns]
+        ends = self._col_ptr[np.asarray(columns) + 1]
+        lengths = ends - starts
+
+        # Expand the [start, end) slices of every query column into one index array
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        positions = offsets + np.arange(int(lengths.sum()))
+        scale = np.repeat(np.asarray(weights) / math.sqrt(norm), lengths)
+
+        scores = np.bincount(
+            self._row_indices[positions],
+            weights=self._values[positions] * scale,
+            minlength=len(self._entries),
+        )
+
+        # argmax keeps the first maximum, so ties resolve in catalog order
+        best_index = int(np.argmax(scores))
+        confidence = float(scores[best_index])
+        if confidence <= 0.0:
+            return None
+
+        intent_name, pattern = self._entries[best_index]
+        return intent_name, pattern, self.calibrate(min(confidence, 1.0))
+
+    def calibrate(self, cosine):
+        """
+        Map a cosine similarity onto the SequenceMatcher ratio scale.
+
+        The mapping is linear on each side of match_cosine, which lands on
+        DEFAULT_FUZZY_THRESHOLD, so the order of the scores doesn't change.
+
+        Args:
+            cosine (float): Cosine similarity between 0 and 1
+
+        Returns:
+            float: Confidence between 0 and 1
+        """
+        if cosine <= self.match_cosine:
+            return cosine / self.match_cosine * DEFAULT_FUZZY_THRESHOLD
+
+        above = (cosine - self.match_cosine) / (1 - self.match_cosine)
+        return DEFAULT_FUZZY_THRESHOLD + above * (1 - DEFAULT_FUZZY_THRESHOLD)
+
+    def dump_state(self):
+        """Get the built matrix for a snapshot."""
+        self.refresh()
+
+        return {
+            "ngram_size": self.ngram_size,
+            "entries": self._entries,
+            "vocabulary": self._vocabulary,
+            "idf": self._idf,
+            "unknown_idf": self._unknown_idf,
+            "col_ptr": self._col_ptr,
+            "row_indices": self._row_indices,
+            "values": self._values,
+        }
+
+    def load_state(self, state):
+        """Take over a matrix from dump_state, built for the current registry."""
+        if state.get("ngram_size") != self.ngram_size or "vocabulary" not in state:
+            return
+
+        self._entries = state["entries"]
+        self._vocabulary = state["vocabulary"]
+        self._idf = state["idf"]
+        self._unknown_idf = state["unknown_idf"]
+        self._col_ptr = state["col_ptr"]
+        self._row_indices = state["row_indices"]
+        self._values = state["values"]
+        self._version = self.intent_registry.version
+
+    def refresh(self):
+        if self._version != self.intent_registry.version:
+            self._build()
+
+    def _build(self):
+        np = self._np
+
+        entries = []
+        rows = []
+        document_frequency = Counter()
+
+        for intent_name, intent in self.intent_registry.compiled_intents.items():
+            for pattern, clean_pattern in zip(intent.patterns, intent.fuzzy_patterns):
+                counts = char_ngram_counts(clean_pattern, self.ngram_size)
+
+                entries.append((intent_name, pattern))
+                rows.append(counts)
+                document_frequency.update(counts.keys())
+
+        vocabulary = {gram: i for i, gram in enumerate(sorted(document_frequency))}
+
+        # Smoothed idf, as if one extra document contained every gram
+        total = len(entries)
+        idf = np.ones(len(vocabulary), dtype=np.float64)
+        for gram, column in vocabulary.items():
+            idf[column] = math.log((1 + total) / (1 + document_frequency[gram])) + 1
+
+        columns = [[] for _ in vocabulary]
+        for row_index, counts in enumerate(rows):
+            weights = {vocabulary[g]: c * idf[vocabulary[g]] for g, c in counts.items()}
+            norm = math.sqrt(sum(w**2 for w in weights.values())) or 1.0
+
+            for column, weight in weights.items():
+                columns[column].append((row_index, weight / norm))
+
+        col_ptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        row_indices = []
+        values = []
+        for column, cells in enumerate(columns):
+            col_ptr[column + 1] = col_ptr[column] + len(cells)
+            for row_index, value in cells:
+                row_indices.append(row_index)
+                values.append(value)
+
+        self._entries = entries
+        self._vocabulary = vocabulary
+        self._idf = idf
+        self._unknown_idf = math.log(1 + total) + 1
+        self._col_ptr = col_ptr
+        self._row_indices = np.asarray(row_indices, dtype=np.int64)
+        self._values = np.asarray(values, dtype=np.float64)
+        self._version = self.intent_registry.version
+
+
+FUZZY_ENGINES = {
+    "sequence": SequenceFuzzyScorer,
+    "tfidf": TfidfFuzzyScorer,
+}
@@ -0,0 +1,189 @@
+from ..utils.regex import PLACEHOLDER_MARK, expand_pattern, match_captures
+
+
+class LiteralIndex:
+    """
+    Exact-lookup table of the literal sentences intent patterns expand to.
+
+    Patterns made only of literals, groups, alternation and ? are expanded
+    into their sentences (up to max_expansions each). Sentences that contain
+    no entity placeholder go into a dict keyed by the sentence, so the
+    common case is answered by one hash lookup. Every sentence is resolved
+    at build time to the first pattern in catalog order whose regex
+    matches it, so lookups agree with the regex engines.
+
+    Patterns whose every sentence made it into the table can never match a
+    text the table misses. Only the remaining patterns need regex matching.
+    """
+
+    def __init__(self, intent_registry, max_expansions=256):
+        self.intent_registry = intent_registry
+        self.max_expansions = max_expansions
+
+        self._table = {}
+        self._regex_patterns = []
+        self._regex_refs = []
+        self._version = None
+
+    def lookup(self, normalized_text):
+        """
+        Look up a normalized text.
+
+        Returns:
+            tuple: (intent_name, pattern, captures), or None on a miss
+        """
+        self.refresh()
+        return self._table.get(normalized_text)
+
+    def get_regex_patterns(self):
+        """
+        Get the patterns the table doesn't fully cover.
+
+        Returns:
+            list: (intent_name, pattern, compiled_pattern) in catalog order
+        """
+        self.refresh()
+
+        if self._regex_patterns is None:
+            compiled_intents = self.intent_registry.compiled_intents
+            self._regex_patterns = [
+                (
+                    intent_name,
+                    compiled_intents[intent_name].patterns[position],
+                    compiled_intents[intent_name].compiled_patterns[position],
+                )
+                for intent_name, position in self._regex_refs
+            ]
+
+        return self._regex_patterns
+
+    def refresh(self):
+        if self._version != self.intent_registry.version:
+            self._build()
+
+    def dump_state(self):
+        """
+        Get the built table for a snapshot.
+
+        Returns:
+            dict: Table and the patterns left for regex matching, by position
+        """
+        compiled_intents = self.intent_registry.compiled_intents
+        regex_refs = [
+            (intent_name, compiled_intents[intent_name].patterns.index(pattern))
+            for intent_name, pattern, _ in self.get_regex_patterns()
+        ]
+
+        return {
+            "max_expansions": self.max_expansions,
+            "table": self._table,
+            "regex_refs": regex_refs,
+        }
+
+    def load_state(self, state):
+        """
+        Take over a table from dump_state, built for the current registry.
+
+        The regexes of the remaining patterns are only looked up when the
+        table first misses.
+        """
+        if state["max_expansions"] != self.max_expansions:
+            return
+
+        self._table = state["table"]
+        self._regex_refs = state["regex_refs"]
+        self._regex_patterns = None
+        self._version = self.intent_registry.version
+
+    def _build(self):
+        entries = {}
+        regex_patterns = []
+        prefixes = []
+
+        for intent_name, intent in self.intent_registry.compiled_intents.items():
+            for pattern, compiled_pattern in zip(
+                intent.patterns, intent.compiled_patterns
+            ):
+                sentences = expand_pattern(pattern, self.max_expansions)
+                covered = sentences is not None
+
+                for sentence in sentences or ():
+                    key = sentence.lower()
+                    match = (
+                        compiled_pattern.match(key)
+                        if PLACEHOLDER_MARK not in sentence
+                        else None
+                    )
+
+                    if match is None:
+                        covered = False
+                        continue
+
+                    if key not in entries:
+                        entries[key] = (
+                            len(regex_patterns),
+                            (intent_name, pattern, match_captures(match)),
+                        )
+
+                if not covered:
+                    regex_patterns.append((intent_name, pattern, compiled_pattern))
+                    prefixes.append(self._literal_prefixes(sentences))
+
+        self._table = self._resolve(entries, regex_patterns, prefixes)
+        self._regex_patterns = regex_patterns
+        self._version = self.intent_registry.version
+
+    def _resolve(self, entries, regex_patterns, prefixes):
+        """
+        Let earlier patterns that aren't fully expanded claim sentences.
+
+        A sentence belongs to the first pattern in catalog order whose regex
+        matches it. Only uncovered patterns whose literal prefix starts the
+        sentence are tried.
+        """
+        buckets = {}
+        unbucketed = []
+        for position, pattern_prefixes in enumerate(prefixes):
+            if pattern_prefixes is None:
+                unbucketed.append(position)
+                continue
+
+            for prefix in pattern_prefixes:
+                buckets.setdefault(prefix, []).append(position)
+
+        table = {}
+        for key, (earlier_count, entry) in entries.items():
+            if earlier_count:
+                candidates = set(unbucketed)
+                for end in range(1, len(key) + 1):
+                    candidates.update(buckets.get(key[:end], ()))
+
+                for position in sorted(candidates):
+                    if position >= earlier_count:
+                        break
+
+                    intent_name, pattern, compiled_pattern = regex_patterns[position]
+                    match = compiled_pattern.match(key)
+                    if match:
+                        entry = (intent_name, pattern, match_captures(match))
+                        break
+
+            table[key] = entry
+
+        return table
+
+    @staticmethod
+    def _literal_prefixes(sentences):
+        # A match has to start with the text before the first placeholder
+        if sentences is None:
+            return None
+
+        prefixes = set()
+        for sentence in sentences:
+            prefix = sentence.split(PLACEHOLDER_MARK, 1)[0].lower()
+            if not prefix:
+                return None
+
+            prefixes.add(prefix)
+
+        return prefixes
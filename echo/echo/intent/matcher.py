@@ -1,79 +1,350 @@
 import re
-from difflib import SequenceMatcher
+from time import perf_counter
 
-from ..utils.regex import clean_pattern_for_fuzzy
-from ..utils.text import normalize_text
+from ..utils.regex import (
+    compile_intent_pattern,
+    fill_entity_placeholders,
+    literal_prefixes,
+    match_captures,
+)
+from ..utils.text import extract_entity_placeholder, normalize_text
+from .fuzzy import DEFAULT_FUZZY_THRESHOLD, FUZZY_ENGINES, SequenceFuzzyScorer
+from .literal import LiteralIndex
+
+MATCHER_ENGINES = ("sequential", "combined")
+
+# How much of the text picks the alternation the combined engine runs
+COMBINED_PREFIX_LENGTH = 24
 
 
 class IntentMatcher:
-    def __init__(self, intent_registry):
+    def __init__(
+        self,
+        intent_registry,
+        engine="sequential",
+        fuzzy_engine="sequence",
+        fuzzy_threshold=DEFAULT_FUZZY_THRESHOLD,
+        fuzzy_top_k=25,
+        max_literal_expansions=256,
+        max_input_length=512,
+        pattern_budget_ms=50,
+    ):
+        if engine not in MATCHER_ENGINES:
+            raise ValueError(f"Unknown matcher engine: {engine}")
+        if fuzzy_engine not in FUZZY_ENGINES:
+            raise ValueError(f"Unknown fuzzy engine: {fuzzy_engine}")
+
         self.intent_registry = intent_registry
-        self.threshold = 0.6
+        self.engine = engine
+        self.threshold = fuzzy_threshold
+        self.fuzzy_engine = fuzzy_engine
+
+        if fuzzy_engine == "sequence":
+            self.fuzzy_scorer = SequenceFuzzyScorer(intent_registry, top_k=fuzzy_top_k)
+        else:
+            self.fuzzy_scorer = FUZZY_ENGINES[fuzzy_engine](intent_registry)
+
+        # Exact-lookup table in front of the regex engines, disabled with 0
+        self.literal_index = (
+            LiteralIndex(intent_registry, max_expansions=max_literal_expansions)
+            if max_literal_expansions
+            else None
+        )
+
+        # Python regexes can't be interrupted, so long inputs are refused
+        # outright and patterns that blow the time budget are reported
+        self.max_input_length = max_input_length
+        self.pattern_budget = pattern_budget_ms / 1000 if pattern_budget_ms else None
+        self.slow_patterns = {}
+
+        self._combined_branches = {}
+        self._combined_groups = []
+        self._combined_prefixes = {}
+        self._combined_buckets = {}
+        self._combined_version = None
 
     def match(self, text, entities=None):
         entities = entities or {}
         normalized_text = normalize_text(text)
 
-        best_intent = None
-        best_confidence = 0.0
-        best_match = None
+        if self.max_input_length and len(normalized_text) > self.max_input_length:
+            return {"intent": "fallback", "confidence": 0.0, "match": None}
 
-        for intent_name, intent_config in self.intent_registry.intents.items():
-            patterns = intent_config.get("patterns", [])
+        exact_match = self.match_exact(normalized_text, entities)
+        if exact_match:
+            intent_name, pattern, match, captures = exact_match
+            return {
+                "intent": intent_name,
+                "confidence": 0.95,
+                "match": {"pattern": pattern, "match_obj": match, "captures": captures},
+            }
 
-            for pattern in patterns:
-                processed_pattern = self._process_pattern(pattern, entities)
+        # The threshold only judges fuzzy scores, exact hits always stand
+        fuzzy_match = self.match_fuzzy(normalized_text)
+        if fuzzy_match is None or fuzzy_match[2] < self.threshold:
+            return {"intent": "fallback", "confidence": 0.0, "match": None}
 
-                match = re.match(
-                    f"^{processed_pattern}$", normalized_text, re.IGNORECASE
-                )
-                if match:
-                    confidence = 0.95
+        intent_name, pattern, ratio = fuzzy_match
+        return {
+            "intent": intent_name,
+            "confidence": ratio,
+            "match": {"pattern": pattern, "ratio": ratio},
+        }
 
-                    if confidence > best_confidence:
-                        best_intent = intent_name
-                        best_confidence = confidence
-                        best_match = {"pattern": pattern, "match_obj": match}
+    def match_exact(self, normalized_text, entities=None):
+        """
+        Run the exact stage: literal lookup, then the configured regex engine.
 
-        if best_confidence < self.threshold:
-            for intent_name, intent_config in self.intent_registry.intents.items():
-                patterns = intent_config.get("patterns", [])
+        Args:
+            normalized_text (str): Normalized input text
+            entities (dict, optional): Already extracted entities
 
-                for pattern in patterns:
-                    clean_pattern = clean_pattern_for_fuzzy(pattern)
+        Returns:
+            tuple: (intent_name, pattern, match, captures), or None
+        """
+        exact_match = None
+        if self.literal_index is not None and not entities:
+            exact_match = self._match_literal(normalized_text)
 
-                    ratio = SequenceMatcher(
-                        None, clean_pattern, normalized_text
-                    ).ratio()
+        if exact_match is None:
+            if self.engine == "combined" and not entities:
+                exact_match = self._match_combined(normalized_text)
+            else:
+                exact_match = self._match_sequential(normalized_text, entities)
 
-                    if ratio > best_confidence:
-                        best_intent = intent_name
-                        best_confidence = ratio
-                        best_match = {"pattern": pattern, "ratio": ratio}
+        return exact_match
 
-        if best_confidence < self.threshold:
-            return {"intent": "fallback", "confidence": 0.0, "match": None}
+    def match_fuzzy(self, normalized_text):
+        """
+        Run the fuzzy stage.
+
+        Args:
+            normalized_text (str): Normalized input text
+
+        Returns:
+            tuple: (intent_name, pattern, confidence), or None
+        """
+        return self.fuzzy_scorer.score(normalized_text)
+
+    def _match_literal(self, normalized_text):
+        literal_match = self.literal_index.lookup(normalized_text)
+        if literal_match is None:
+            return None
+
+        intent_name, pattern, captures = literal_match
+        return intent_name, pattern, None, captures
+
+    def _regex_patterns(self, entities=None):
+        """Patterns left for regex matching, in catalog order."""
+        if self.literal_index is not None and not entities:
+            return self.literal_index.get_regex_patterns()
+
+        return [
+            (intent_name, pattern, compiled_pattern)
+            for intent_name, intent in self.intent_registry.compiled_intents.items()
+            for pattern, compiled_pattern in zip(
+                intent.patterns, intent.compiled_patterns
+            )
+        ]
+
+    def _match_sequential(self, normalized_text, entities):
+        budget = self.pattern_budget
+        regex_patterns = self._regex_patterns(entities)
+        started = perf_counter() if budget is not None else None
+
+        # Every regex hit scores the same, so the first one in catalog order wins
+        for intent_name, pattern, compiled_pattern in regex_patterns:
+            if entities:
+                compiled_pattern = compile_intent_pattern(pattern, entities)
+
+            match = compiled_pattern.match(normalized_text)
+
+            if budget is not None:
+                # One clock read per pattern, each one closes the previous span
+                finished = perf_counter()
+                if finished - started > budget:
+                    self._record_slow_pattern(intent_name, pattern, finished - started)
+                started = finished
+
+            if match:
+                # Spans are only meaningful when no entity values were spliced in
+                captures = None if entities else match_captures(match)
+                return intent_name, pattern, match, captures
+
+        return None
+
+    def _match_combined(self, normalized_text):
+        if self._combined_version != self.intent_registry.version:
+            self._build_combined()
+
+        # Prefixes are ASCII, other text is left to the sequential engine
+        if not normalized_text[:COMBINED_PREFIX_LENGTH].isascii():
+            return self._match_sequential(normalized_text, None)
+
+        combined_pattern = self._combined_bucket(normalized_text)
+        if combined_pattern is None:
+            return None
+
+        started = perf_counter()
+        match = combined_pattern.match(normalized_text)
+        elapsed = perf_counter() - started
+
+        branch = self._combined_branches[match.lastgroup] if match else None
+
+        if self.pattern_budget is not None and elapsed > self.pattern_budget:
+            # A single regex, so the time can only be pinned on the winner
+            intent_name, pattern, _ = branch or (None, "(combined)", None)
+            self._record_slow_pattern(intent_name, pattern, elapsed)
+
+        if not match:
+            return None
+
+        # The branch group encloses everything else, so it closes last
+        intent_name, pattern, entity_groups = branch
+        captures = match_captures(match, entity_groups)
+        return intent_name, pattern, match, captures
+
+    def build_indexes(self):
+        """Build the literal table and fuzzy index now instead of on first use."""
+        if self.literal_index is not None:
+            self.literal_index.refresh()
+
+        self.fuzzy_scorer.refresh()
+
+    def prepare(self):
+        """
+        Build everything matching otherwise builds on first use.
+
+        On top of the indexes, that's the compiled patterns and the combined
+        regexes for the prefixes the patterns start with. A server that forks
+        workers calls this before forking, so they share one copy instead of
+        each building their own.
+        """
+        self.build_indexes()
+
+        for intent in self.intent_registry.compiled_intents.values():
+            intent.compiled_patterns
+        self._regex_patterns()
+
+        if self.engine == "combined":
+            if self._combined_version != self.intent_registry.version:
+                self._build_combined()
+
+            for prefixes in self._combined_prefixes.values():
+                for prefix in prefixes:
+                    self._combined_bucket(prefix)
+
+    def dump_state(self):
+        """
+        Get the built literal table and fuzzy index for a snapshot.
+
+        Returns:
+            dict: State for load_state, builds whatever wasn't built yet
+        """
+        self.build_indexes()
 
         return {
-            "intent": best_intent,
-            "confidence": best_confidence,
-            "match": best_match,
+            "literal": (
+                self.literal_index.dump_state()
+                if self.literal_index is not None
+                else None
+            ),
+            "fuzzy": self.fuzzy_scorer.dump_state(),
         }
 
-    def _process_pattern(self, pattern, entities):
-        processed = pattern
+    def load_state(self, state):
+        """Take over indexes from dump_state, built for the current registry."""
+        if self.literal_index is not None and state["literal"] is not None:
+            self.literal_index.load_state(state["literal"])
 
-        entity_placeholders = re.findall(r"\{(\w+)\}", pattern)
+        self.fuzzy_scorer.load_state(state["fuzzy"])
 
-        for entity_name in entity_placeholders:
-            if entity_name in entities:
-                values = [e["raw_value"] for e in entities[entity_name]]
-                if values:
-                    for value in values:
-                        processed = processed.replace(
-                            f"{{{entity_name}}}", re.escape(value)
-                        )
-            else:
-                processed = processed.replace(f"{{{entity_name}}}", r"[\w\s]+")
+    def get_slow_patterns(self):
+        """
+        Get the patterns that took longer than the time budget to match.
+
+        Returns:
+            dict: Pattern to intent name, count and longest match time
+        """
+        return {pattern: dict(stats) for pattern, stats in self.slow_patterns.items()}
+
+    def _record_slow_pattern(self, intent_name, pattern, elapsed):
+        stats = self.slow_patterns.get(pattern)
+        if stats is None:
+            print(
+                f"Warning: pattern {pattern!r} of intent {intent_name} took "
+                f"{elapsed * 1000:.1f}ms to match"
+            )
+            stats = self.slow_patterns[pattern] = {
+                "intent": intent_name,
+                "count": 0,
+                "max_ms": 0.0,
+            }
+
+        stats["count"] += 1
+        stats["max_ms"] = max(stats["max_ms"], round(elapsed * 1000, 3))
+
+    def _build_combined(self):
+        """
+        Merge the intent patterns into anchored alternations, one per literal
+        prefix of the text.
+
+        Python's regex engine tries the branches of an alternation one after
+        the other, so a single alternation of the whole catalog is slower than
+        matching the patterns one by one, as each of those gives up on text
+        that starts wrong right away. Branches are bucketed by the literal
+        prefixes their matches start with instead, and a text only runs the
+        alternation of the patterns whose prefix it starts with. Patterns
+        that can start with anything are in every bucket. Buckets are
+        compiled when a text that needs them first comes in.
+
+        Each branch is a named group tagged with its position in the catalog.
+        Buckets keep catalog order and alternation is tried left to right, so
+        the first pattern in catalog order that matches the whole text wins,
+        just like the sequential engine. Patterns fully covered by the literal
+        index are left out.
+        """
+        branch_map = {}
+        groups = []
+        prefixes = {}
+
+        for index, (intent_name, pattern, _) in enumerate(self._regex_patterns()):
+            group_name = f"_p{index}"
+            processed = fill_entity_placeholders(pattern, group_prefix=f"{group_name}_")
+            entity_groups = {
+                entity_name: f"{group_name}_{entity_name}"
+                for entity_name in extract_entity_placeholder(pattern)
+            }
+
+            groups.append(f"(?P<{group_name}>{processed})")
+            branch_map[group_name] = (intent_name, pattern, entity_groups)
+
+            for prefix in literal_prefixes(processed, COMBINED_PREFIX_LENGTH):
+                prefixes.setdefault(len(prefix), {}).setdefault(prefix, []).append(
+                    index
+                )
+
+        self._combined_branches = branch_map
+        self._combined_groups = groups
+        self._combined_prefixes = prefixes
+        self._combined_buckets = {}
+        self._combined_version = self.intent_registry.version
+
+    def _combined_bucket(self, normalized_text):
+        """Get the alternation of the branches that can match the text."""
+        indexes = set()
+        for length, prefixes in self._combined_prefixes.items():
+            if len(normalized_text) >= length:
+                indexes.update(prefixes.get(normalized_text[:length], ()))
+
+        # Texts with the same candidates share a bucket
+        members = tuple(sorted(indexes))
+        if members not in self._combined_buckets:
+            branches = [self._combined_groups[index] for index in members]
+            self._combined_buckets[members] = (
+                re.compile(f"^(?:{'|'.join(branches)})$", re.IGNORECASE)
+                if branches
+                else None
+            )
 
-        return processed
+        return self._combined_buckets[members]
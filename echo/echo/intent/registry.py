@@ -1,23 +1,63 @@
+from .base import Intent
+
+
 class IntentRegistry:
-    def __init__(self, config):
+    def __init__(self, config, snapshot=None):
         self.config = config
         self.intents = {}
+        self.compiled_intents = {}
+        self.errors = {}
+        self.version = 0
 
-        # Load intents from configuration
-        self._register_intents()
+        # Load intents from configuration, or from a compiled snapshot of it
+        if snapshot is not None:
+            self._restore(snapshot)
+        else:
+            self._register_intents()
 
     def _register_intents(self):
         for intent_name, intent_config in self.config.intents.items():
             try:
-                self.intents[intent_name] = intent_config
+                self.register_intent(intent_name, intent_config)
             except Exception as e:
+                self.errors[intent_name] = str(e)
                 print(f"Error registering intent {intent_name}: {e}")
 
+    def _restore(self, snapshot):
+        for intent_name, compiled_intent in snapshot["compiled_intents"].items():
+            self._add_intent(
+                intent_name, self.config.intents[intent_name], compiled_intent
+            )
+
+        # Broken intents stay broken until their YAML changes, keep saying so
+        self.errors = dict(snapshot["errors"])
+        for intent_name, error in self.errors.items():
+            print(f"Error registering intent {intent_name}: {error}")
+
+    def dump_state(self):
+        """Get the compiled intents for a snapshot."""
+        return {"compiled_intents": self.compiled_intents, "errors": self.errors}
+
     def register_intent(self, intent_name, intent_config):
+        # Compile first so a broken pattern leaves the registry untouched
+        compiled_intent = Intent(intent_name, intent_config)
+        self._add_intent(intent_name, intent_config, compiled_intent)
+
+    def _add_intent(self, intent_name, intent_config, compiled_intent):
+        for pattern, issues in compiled_intent.pattern_issues.items():
+            for issue in issues:
+                print(f"Warning: intent {intent_name} pattern {pattern!r}: {issue}")
+
         self.intents[intent_name] = intent_config
+        self.compiled_intents[intent_name] = compiled_intent
+        self.errors.pop(intent_name, None)
+        self.version += 1
 
     def get_intent(self, intent_name):
         return self.intents.get(intent_name)
 
+    def get_compiled_intent(self, intent_name):
+        return self.compiled_intents.get(intent_name)
+
     def get_all_intents(self):
         return self.intents
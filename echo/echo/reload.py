@@ -0,0 +1,66 @@
+"""
+Hot reloading of an intents directory.
+
+Echo keeps everything it builds from its config directory in one
+Components object. A reload builds a new one next to it, taking over the
+parts whose directory didn't change, and replaces the reference in one
+step. Anything holding the old object keeps a consistent view.
+"""
+
+from pathlib import Path
+
+WATCHED_DIRS = ("entities", "sentences", "responses", "mappings")
+
+
+class Components:
+    """Registries and processing components built from one config version."""
+
+    def __init__(self):
+        self.generation = 0
+        self.config = None
+        self.entity_registry = None
+        self.intent_registry = None
+        self.entity_extractor = None
+        self.intent_matcher = None
+        self.response_selector = None
+        self.response_renderer = None
+
+    def errors(self):
+        """Get what failed to register, as readable messages."""
+        messages = []
+        for kind, registry in (
+            ("entity", self.entity_registry),
+            ("intent", self.intent_registry),
+            ("response", self.response_renderer),
+        ):
+            for name, error in registry.errors.items():
+                messages.append(f"{kind} {name}: {error}")
+
+        return messages
+
+
+def directory_signature(config_path):
+    """
+    Get a cheap fingerprint of a config directory.
+
+    Args:
+        config_path (Path): Intents directory
+
+    Returns:
+        dict: Watched directory name to the (path, mtime, size) of its files
+    """
+    config_path = Path(config_path)
+
+    signature = {}
+    for directory in WATCHED_DIRS:
+        files = []
+        for file_path in sorted((config_path / directory).rglob("*")):
+            # Bytecode of the mappings changes whenever they are imported
+            if file_path.is_file() and file_path.suffix != ".pyc":
+                stat = file_path.stat()
+                relative = file_path.relative_to(config_path).as_posix()
+                files.append((relative, stat.st_mtime_ns, stat.st_size))
+
+        signature[directory] = tuple(files)
+
+    return signature
@@ -1,65 +1,210 @@
+"""
+Rendering of response templates.
+
+Templates are str.format strings. They are compiled once when the responses
+are loaded: named fields are rewritten to positional ones, so rendering only
+looks up the fields a template uses instead of copying the whole context.
+Templates that can't be compiled are reported in errors at load time.
+"""
+
 import random
+import string
+
+NOT_SPECIFIED = "(not specified)"
+
+_formatter = string.Formatter()
+
+
+class ResponseTemplate:
+    """A response template compiled for rendering."""
+
+    __slots__ = ("template", "fields", "error", "_format", "_constant")
+
+    def __init__(self, template):
+        self.template = template
+        self.fields = ()
+        self.error = None
+        self._format = None
+        self._constant = None
+
+        if not isinstance(template, str):
+            self._constant = str(template)
+            return
+
+        fields = []
+        try:
+            pattern = _compile(template, fields)
+        except (ValueError, IndexError) as e:
+            self.error = e
+            return
+
+        self.fields = tuple(fields)
+        self._format = pattern.format
+        if not fields:
+            self._constant = pattern.format()
+
+    def render(self, context):
+        """
+        Fill in the template.
+
+        Args:
+            context (dict): Values of the fields, None is rendered as
+                NOT_SPECIFIED
+
+        Returns:
+            str: Rendered response
+
+        Raises:
+            KeyError: If a field of the template is missing from context
+        """
+        if self._constant is not None:
+            return self._constant
+        if self.error is not None:
+            return f"Error rendering response: {self.error}"
+
+        values = []
+        for name in self.fields:
+            value = context[name]
+            values.append(NOT_SPECIFIED if value is None else value)
+
+        return self._format(*values)
+
+
+def _compile(template, fields):
+    """Rewrite the named fields of template to indexes into fields."""
+    parts = []
+    for literal, field_name, spec, conversion in _formatter.parse(template):
+        parts.append(literal.replace("{", "{{").replace("}", "}}"))
+        if field_name is None:
+            continue
+
+        name = field_name.split(".", 1)[0].split("[", 1)[0]
+        if not name or name.isdigit():
+            raise IndexError(
+                f"Replacement index {name or 0} out of range for positional args tuple"
+            )
+
+        if name not in fields:
+            fields.append(name)
+
+        field = f"{fields.index(name)}{field_name[len(name):]}"
+        if conversion:
+            field += f"!{conversion}"
+        if spec:
+            field += f":{_compile(spec, fields)}"
+
+        parts.append(f"{{{field}}}")
+
+    return "".join(parts)
+
+
+def compile_responses(responses):
+    """
+    Compile the templates of every intent's responses.
+
+    Args:
+        responses (dict): Intent name to its default and contexts templates
+
+    Returns:
+        tuple: Response key to its candidate templates, and response key to
+            the errors of its templates
+    """
+    templates = {}
+    errors = {}
+    for intent_name, intent_responses in responses.items():
+        if not intent_responses:
+            continue
+
+        keys = [f"{intent_name}.default"]
+        if "contexts" in intent_responses:
+            for context_name in intent_responses.get("contexts") or {}:
+                keys.append(f"{intent_name}.{context_name}")
+
+        for response_key in keys:
+            candidates = _resolve(responses, response_key)
+            if isinstance(candidates, str):
+                continue
+
+            templates[response_key] = candidates
+            for template in candidates:
+                if template.error is not None:
+                    errors[response_key] = f"{template.template!r}: {template.error}"
+
+    return templates, errors
+
+
+def _resolve(responses, response_key):
+    """Get the candidate templates of a key, or a message why there are none."""
+    parts = response_key.split(".", 1)
+    if len(parts) != 2:
+        return f"Invalid response key format: {response_key}"
+
+    intent_name, context_name = parts
+
+    intent_responses = responses.get(intent_name, {})
+    if not intent_responses:
+        return f"No responses found for intent: {intent_name}"
+
+    if context_name != "default" and "contexts" in intent_responses:
+        context_responses = intent_responses.get("contexts", {})
+        response_templates = context_responses.get(context_name)
+
+        if not response_templates:
+            response_templates = intent_responses.get(
+                "default", f"No template found for {intent_name}.{context_name}"
+            )
+    else:
+        response_templates = intent_responses.get(
+            "default", f"No default template found for {intent_name}"
+        )
+
+    # A default may be a single template or a list of candidates, like contexts
+    if not isinstance(response_templates, list) or not response_templates:
+        response_templates = [response_templates]
+
+    return [ResponseTemplate(template) for template in response_templates]
 
 
 class ResponseRenderer:
     def __init__(self, config=None):
         self.config = config
+        self.templates = None
+        self.errors = {}
 
-    def render(self, response_key, context, responses=None):
-        if responses is None:
-            if self.config and hasattr(self.config, "responses"):
-                responses = self.config.responses
-            else:
-                return "Response template not found: no responses available"
+        if self.config and hasattr(self.config, "responses"):
+            self.templates, self.errors = compile_responses(self.config.responses)
+            for response_key, error in self.errors.items():
+                print(f"Error compiling response {response_key}: {error}")
 
-        parts = response_key.split(".", 1)
-        if len(parts) != 2:
-            return f"Invalid response key format: {response_key}"
+    def render(self, response_key, context, responses=None):
+        if responses is not None:
+            templates = _resolve(responses, response_key)
+        elif self.templates is None:
+            return "Response template not found: no responses available"
+        else:
+            templates = self.templates.get(response_key)
+            if templates is None:
+                templates = self._resolve_missing(response_key)
 
-        intent_name, context_name = parts
+        if isinstance(templates, str):
+            return templates
 
-        intent_responses = responses.get(intent_name, {})
-        if not intent_responses:
-            return f"No responses found for intent: {intent_name}"
-
-        if context_name != "default" and "contexts" in intent_responses:
-            context_responses = intent_responses.get("contexts", {})
-            response_templates = context_responses.get(context_name)
-
-            if not response_templates:
-                response_templates = [
-                    intent_responses.get(
-                        "default", f"No template found for {intent_name}.{context_name}"
-                    )
-                ]
-        else:
-            response_templates = [
-                intent_responses.get(
-                    "default", f"No default template found for {intent_name}"
-                )
-            ]
-
-        if isinstance(response_templates, list) and response_templates:
-            template = random.choice(response_templates)
-        else:
-            template = response_templates
+        template = random.choice(templates)
 
         try:
-            return self._fill_template(template, context)
+            return template.render(context)
         except KeyError as e:
             return f"Error: Missing context variable {e} in template"
         except Exception as e:
             return f"Error rendering response: {e}"
 
-    def _fill_template(self, template, context):
-        if not isinstance(template, str):
-            return str(template)
-
-        safe_context = {}
-        for key, value in context.items():
-            if value is None:
-                safe_context[key] = "(not specified)"
-            else:
-                safe_context[key] = value
+    def _resolve_missing(self, response_key):
+        # Unknown contexts fall back to the compiled default, if there is one
+        intent_name, dot, _ = response_key.partition(".")
+        intent_responses = self.config.responses.get(intent_name) or {}
+        default = self.templates.get(f"{intent_name}.default")
+        if dot and default is not None:
+            if "default" in intent_responses or "contexts" not in intent_responses:
+                return default
 
-        return template.format(**safe_context)
+        return _resolve(self.config.responses, response_key)
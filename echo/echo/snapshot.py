@@ -0,0 +1,150 @@
+"""
+Compiled snapshots of an intents directory.
+
+Parsing the YAML files, compiling every intent and building the literal
+table and fuzzy index is slow for large catalogs. A snapshot pickles all
+of it once, keyed by a hash of the directory contents and the options the
+indexes depend on, so later startups on an unchanged directory load it
+instead. Entities are cheap to build and always built from their config.
+
+Snapshot files are named after the directory and options too, so writing
+a new snapshot of a directory removes the ones of its earlier contents.
+"""
+
+import hashlib
+import pickle
+import time
+from pathlib import Path
+
+from . import __version__
+from .utils.cache import default_cache_dir, write_pickle
+
+# Bump when the layout of a snapshot changes
+SNAPSHOT_FORMAT = 1
+
+# Options of Echo the snapshotted indexes depend on
+SNAPSHOT_OPTIONS = ("fuzzy_engine", "max_literal_expansions")
+
+_SOURCE_DIRS = ("entities", "sentences", "responses")
+
+
+def snapshot_path(config_path, options, cache_dir=None):
+    """
+    Get where the snapshot of a directory lives.
+
+    Args:
+        config_path (Path): Intents directory
+        options (dict): Echo options
+        cache_dir (Path, optional): Defaults to the Echo cache directory
+
+    Returns:
+        Path: Snapshot file named after the directory, the options and a
+            hash of the contents
+    """
+    config_path = Path(config_path)
+
+    key = hashlib.sha256(str(config_path.resolve()).encode())
+    digest = hashlib.sha256()
+    digest.update(f"{SNAPSHOT_FORMAT}\0{__version__}\0".encode())
+    for option in SNAPSHOT_OPTIONS:
+        key.update(f"\0{option}={options.get(option)!r}".encode())
+        digest.update(f"{option}={options.get(option)!r}\0".encode())
+
+    # Data files next to the YAML (gazetteer sources) count as well
+    for directory in _SOURCE_DIRS:
+        for file_path in sorted((config_path / directory).rglob("*")):
+            if file_path.is_file():
+                relative = file_path.relative_to(config_path).as_posix()
+                digest.update(f"{relative}\0".encode())
+                digest.update(file_path.read_bytes())
+                digest.update(b"\0")
+
+    cache_dir = Path(cache_dir or default_cache_dir())
+    return (
+        cache_dir / "snapshots" / f"{key.hexdigest()[:16]}-{digest.hexdigest()}.pickle"
+    )
+
+
+def load_snapshot(path):
+    """
+    Load a snapshot written by write_snapshot.
+
+    Returns:
+        dict: Snapshot state, or None if there's no usable snapshot
+    """
+    try:
+        with open(path, "rb") as file:
+            state = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Error loading snapshot {path}: {e}")
+        return None
+
+    if state.get("format") != SNAPSHOT_FORMAT:
+        return None
+
+    return state
+
+
+def write_snapshot(echo, path):
+    """
+    Snapshot the parsed config, compiled intents and indexes of an Echo.
+
+    Indexes that weren't built yet are built first. Once it's written,
+    the snapshots of earlier contents of the same directory are removed.
+
+    Args:
+        echo (Echo): Echo, or the Components of one of its versions
+        path (Path): Where to write, see snapshot_path
+
+    Returns:
+        bool: Whether the snapshot was written
+    """
+    state = {
+        "format": SNAPSHOT_FORMAT,
+        "config": echo.config.to_dict(),
+        "intents": echo.intent_registry.dump_state(),
+        "matcher": echo.intent_matcher.dump_state(),
+    }
+
+    try:
+        write_pickle(path, state)
+    except (OSError, pickle.PicklingError) as e:
+        print(f"Error writing snapshot {path}: {e}")
+        return False
+
+    path = Path(path)
+    key = path.name.split("-", 1)[0]
+    for stale_path in path.parent.glob(f"{key}-*.pickle"):
+        if stale_path != path:
+            try:
+                stale_path.unlink()
+            except OSError:
+                pass
+
+    return True
+
+
+def compile_snapshot(config_path, **options):
+    """
+    Build an intents directory from scratch and write its snapshot.
+
+    Args:
+        config_path (Path): Intents directory
+        **options: Echo options, the snapshot only serves Echos created
+            with the same indexing options
+
+    Returns:
+        tuple: (snapshot path, seconds taken)
+    """
+    from . import Echo
+
+    started = time.perf_counter()
+    echo = Echo(config_path, **{**options, "snapshot": False})
+    path = snapshot_path(echo.config.config_path, echo.options)
+
+    if not write_snapshot(echo, path):
+        return None, time.perf_counter() - started
+
+    return path, time.perf_counter() - started
@@ -0,0 +1,107 @@
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+def default_cache_dir():
+    """
+    Get the directory for Echo's on-disk caches.
+
+    Returns:
+        Path: $ECHO_CACHE_DIR, or echo/ in the user's cache directory
+    """
+    if os.environ.get("ECHO_CACHE_DIR"):
+        return Path(os.environ["ECHO_CACHE_DIR"])
+
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "echo"
+
+
+def write_pickle(path, obj):
+    """
+    Pickle an object to a file atomically.
+
+    The pickle is written to a temporary file next to the target and then
+    renamed, so readers never see half a file. If anything fails, the
+    temporary file is removed again.
+
+    Raises:
+        OSError: If the file can't be written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    file = tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False)
+    try:
+        with file:
+            pickle.dump(obj, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(file.name, path)
+    except BaseException:
+        os.unlink(file.name)
+        raise
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache with hit and miss counters.
+
+    Safe to share between threads, a lookup and its reordering happen
+    under one lock.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.epoch = None
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def renew(self, epoch):
+        """Clear the cache if it was filled in another epoch than this one."""
+        if epoch == self.epoch:
+            return
+
+        with self._lock:
+            if epoch != self.epoch:
+                self._data.clear()
+                self.epoch = epoch
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def __len__(self):
+        return len(self._data)
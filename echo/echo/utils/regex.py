@@ -1,5 +1,12 @@
 import re
 
+try:
+    # Internal to re, without them literal_prefixes and first_char_class
+    # give up as if nothing was known about the pattern
+    from re import _constants, _parser
+except ImportError:
+    _constants = _parser = None
+
 
 def make_optional(pattern):
     """
@@ -69,6 +76,356 @@ def convert_entity_placeholders(pattern):
     return re.sub(r"\{(\w+)\}", r"(?P<\1>.*?)", pattern)
 
 
+def fill_entity_placeholders(pattern, entities=None, group_prefix=None):
+    """
+    Replace entity placeholders with regex fragments.
+
+    Placeholders with known values are replaced by the escaped value, all
+    others by a lazy word matcher. When group_prefix is given, the first
+    occurrence of each unfilled placeholder becomes a named group called
+    group_prefix + entity name, so its span can be read from the match.
+
+    A placeholder that ends the pattern has to run to the end of the text
+    anyway, so it is made possessive instead of lazy. That way adjacent
+    placeholders like "( in {location})?( {date})?" don't backtrack through
+    every way of splitting the text.
+
+    Args:
+        pattern (str): Intent pattern with {entity} placeholders
+        entities (dict, optional): Already extracted entities
+        group_prefix (str, optional): Prefix for capture group names
+
+    Returns:
+        str: Pattern ready to be compiled
+    """
+    entities = entities or {}
+    grouped = set()
+
+    def replace(match):
+        entity_name = match.group(1)
+
+        if entity_name in entities:
+            values = [e["raw_value"] for e in entities[entity_name]]
+            return re.escape(values[0]) if values else match.group(0)
+
+        quantifier = "++" if _ends_pattern(pattern, match.end()) else "+?"
+        fragment = f"[\\w\\s]{quantifier}"
+
+        if group_prefix is not None and entity_name not in grouped:
+            grouped.add(entity_name)
+            return f"(?P<{group_prefix}{entity_name}>{fragment})"
+
+        return fragment
+
+    return re.sub(r"\{(\w+)\}", replace, pattern)
+
+
+def _ends_pattern(pattern, index):
+    # Only group closings (optionally made optional) may follow
+    return re.fullmatch(r"(?:\)\??)*", pattern[index:]) is not None
+
+
+def analyze_pattern(pattern):
+    """
+    Look for constructs in an intent pattern that can backtrack badly.
+
+    Args:
+        pattern (str): Intent pattern with {entity} placeholders
+
+    Returns:
+        list: Descriptions of the problems found, empty if none
+    """
+    issues = []
+
+    if re.search(r"\((?:[^()\\]|\\.)*[+*](?:[^()\\]|\\.)*\)[+*{]", pattern):
+        issues.append("nested quantifiers can backtrack exponentially")
+
+    if re.search(r"\.[*+]", pattern) and re.search(r"\{\w+\}", pattern):
+        issues.append("wildcards around entity placeholders make splits ambiguous")
+
+    # Placeholders that are only separated by whitespace or group syntax
+    # can split the text between them in many ways
+    for adjacent in re.finditer(r"(?=(\{\w+\})(?:[\s()?:]|\\s)*(\{\w+\}))", pattern):
+        first, second = adjacent.group(1), adjacent.group(2)
+        if not _ends_pattern(pattern, adjacent.end(2)):
+            issues.append(f"{first} and {second} are adjacent and can split any way")
+
+    return issues
+
+
+def compile_intent_pattern(pattern, entities=None):
+    """
+    Compile an intent pattern into an anchored, case-insensitive regex.
+
+    Unfilled placeholders are captured in groups named after the entity.
+
+    Args:
+        pattern (str): Intent pattern with {entity} placeholders
+        entities (dict, optional): Already extracted entities
+
+    Returns:
+        re.Pattern: Compiled pattern matching the whole text
+    """
+    processed = fill_entity_placeholders(pattern, entities, group_prefix="")
+    return re.compile(f"^{processed}$", re.IGNORECASE)
+
+
+def match_captures(match, entity_groups=None):
+    """
+    Collect the spans of the entity groups that took part in a match.
+
+    Args:
+        match (re.Match): Intent pattern match
+        entity_groups (dict, optional): Entity name to group name, defaults
+            to groups named after the entities
+
+    Returns:
+        dict: Entity name to (start, end) span
+    """
+    if entity_groups is None:
+        entity_groups = {name: name for name in match.groupdict()}
+
+    captures = {}
+    for entity_name, group_name in entity_groups.items():
+        if match.group(group_name) is not None:
+            captures[entity_name] = match.span(group_name)
+
+    return captures
+
+
+def extract_named_group(pattern, group_name):
+    """
+    Extract the body of a named group from a regex pattern.
+
+    Args:
+        pattern (str): Regex pattern
+        group_name (str): Name of the group
+
+    Returns:
+        str: The regex inside (?P<group_name>...), or None if not present
+    """
+    opening = f"(?P<{group_name}>"
+    start = pattern.find(opening)
+    if start == -1:
+        return None
+
+    start += len(opening)
+    depth = 1
+    in_class = False
+    index = start
+
+    while index < len(pattern):
+        char = pattern[index]
+
+        if char == "\\":
+            index += 2
+            continue
+
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return pattern[start:index]
+
+        index += 1
+
+    return None
+
+
+_CATEGORY_CLASSES = {}
+_REPEATS = ()
+
+if _constants is not None:
+    _CATEGORY_CLASSES = {
+        _constants.CATEGORY_DIGIT: r"\d",
+        _constants.CATEGORY_NOT_DIGIT: r"\D",
+        _constants.CATEGORY_SPACE: r"\s",
+        _constants.CATEGORY_NOT_SPACE: r"\S",
+        _constants.CATEGORY_WORD: r"\w",
+        _constants.CATEGORY_NOT_WORD: r"\W",
+    }
+
+    _REPEATS = (
+        _constants.MAX_REPEAT,
+        _constants.MIN_REPEAT,
+        _constants.POSSESSIVE_REPEAT,
+    )
+
+
+class _NoFirstChar(Exception):
+    pass
+
+
+def first_char_class(pattern):
+    """
+    Build a character class of the characters a pattern can start with.
+
+    Args:
+        pattern (str): Regex pattern
+
+    Returns:
+        str: Character class like "[a-z\\d]", or None when it can't be worked
+            out (the pattern can start with anything or match empty text)
+    """
+    if _parser is None:
+        return None
+
+    try:
+        atoms = _first_atoms(_parser.parse(pattern))
+    except (re.error, _NoFirstChar):
+        return None
+
+    return f"[{''.join(sorted(atoms))}]" if atoms else None
+
+
+def _first_atoms(subpattern):
+    for op, av in subpattern:
+        if op == _constants.AT:
+            continue
+
+        if op == _constants.LITERAL:
+            return {_class_literal(av)}
+
+        if op == _constants.IN:
+            return _class_atoms(av)
+
+        if op == _constants.BRANCH:
+            return set().union(*(_first_atoms(branch) for branch in av[1]))
+
+        if op == _constants.SUBPATTERN:
+            return _first_atoms(av[-1])
+
+        if op in _REPEATS and av[0] >= 1:
+            return _first_atoms(av[2])
+
+        raise _NoFirstChar()
+
+    raise _NoFirstChar()
+
+
+def _class_atoms(items):
+    atoms = set()
+    for op, av in items:
+        if op == _constants.LITERAL:
+            atoms.add(_class_literal(av))
+        elif op == _constants.RANGE:
+            atoms.add(f"{_class_literal(av[0])}-{_class_literal(av[1])}")
+        elif op == _constants.CATEGORY and av in _CATEGORY_CLASSES:
+            atoms.add(_CATEGORY_CLASSES[av])
+        else:
+            raise _NoFirstChar()
+
+    return atoms
+
+
+def _class_literal(code):
+    char = chr(code)
+    return f"\\{char}" if char in "\\]^-[" else char
+
+
+def literal_prefixes(pattern, length, max_prefixes=64):
+    """
+    Work out the literal text the matches of a pattern start with.
+
+    Literals, groups, alternation, optional parts and small classes of
+    literals are followed, anything else ends the prefix. Only ASCII is
+    taken as literal, in lowercase, as that's what case-insensitive matching
+    of normalized text comes down to.
+
+    Args:
+        pattern (str): Regex pattern
+        length (int): Longest prefix to work out
+        max_prefixes (int): Stop following the pattern once it branches into
+            more prefixes than this
+
+    Returns:
+        set: Prefixes of at most length characters, every match of the
+            pattern starts with one of them. Contains "" when nothing is known.
+    """
+    if _parser is None:
+        return {""}
+
+    try:
+        parsed = _parser.parse(pattern)
+    except re.error:
+        return {""}
+
+    return {prefix for prefix, _ in _sequence_prefixes(parsed, length, max_prefixes)}
+
+
+def _sequence_prefixes(items, length, limit):
+    # Pairs of (prefix, whether the items so far were all literal)
+    prefixes = {("", True)}
+
+    for op, av in items:
+        if not any(is_open for _, is_open in prefixes):
+            break
+
+        options = _item_prefixes(op, av, length, limit)
+        extended = set()
+        for prefix, is_open in prefixes:
+            if not is_open:
+                extended.add((prefix, False))
+                continue
+
+            for option, option_open in options:
+                combined = prefix + option
+                if len(combined) >= length:
+                    extended.add((combined[:length], False))
+                else:
+                    extended.add((combined, option_open))
+
+        if len(extended) > limit:
+            return {(prefix, False) for prefix, _ in prefixes}
+
+        prefixes = extended
+
+    return prefixes
+
+
+def _item_prefixes(op, av, length, limit):
+    if op == _constants.LITERAL:
+        char = chr(av)
+        return {(char.lower(), True)} if char.isascii() else {("", False)}
+
+    if op in (_constants.AT, _constants.ASSERT, _constants.ASSERT_NOT):
+        # Zero-width, they only rule out matches
+        return {("", True)}
+
+    if op == _constants.IN:
+        chars = [chr(code) for item, code in av if item == _constants.LITERAL]
+        if len(chars) == len(av) and len(chars) <= 8 and all(map(str.isascii, chars)):
+            return {(char.lower(), True) for char in chars}
+        return {("", False)}
+
+    if op == _constants.SUBPATTERN and not av[1] and not av[2]:
+        return _sequence_prefixes(av[-1], length, limit)
+
+    if op == _constants.BRANCH:
+        options = set()
+        for branch in av[1]:
+            options |= _sequence_prefixes(branch, length, limit)
+        return options if len(options) <= limit else {("", False)}
+
+    if op in _REPEATS:
+        minimum, maximum, item = av
+        options = _sequence_prefixes(item, length, limit)
+        if minimum == 0:
+            options = options | {("", True)}
+        if maximum != 1:
+            # Only the first repetition is followed
+            options = {(option, False) for option, _ in options}
+        return options
+
+    return {("", False)}
+
+
 def clean_pattern_for_fuzzy(pattern):
     # Remove entity placeholders
     cleaned = re.sub(r"\{\w+\}", "", pattern)
@@ -83,3 +440,129 @@ def clean_pattern_for_fuzzy(pattern):
     cleaned = re.sub(r"\s+", " ", cleaned).strip()
 
     return cleaned
+
+
+class _NotExpandable(Exception):
+    pass
+
+
+PLACEHOLDER_MARK = "\x00"
+
+
+def expand_pattern(pattern, max_expansions=256):
+    """
+    Expand a pattern into the finite set of sentences it matches.
+
+    Only literals, escaped punctuation, groups, alternation and the ? quantifier
+    are understood. Entity placeholders expand to PLACEHOLDER_MARK.
+
+    Args:
+        pattern (str): Intent pattern
+        max_expansions (int): Give up once more sentences than this are produced
+
+    Returns:
+        list: Expanded sentences, or None if the pattern uses other regex
+            features or expands beyond max_expansions
+    """
+    parser = _PatternExpander(pattern, max_expansions)
+
+    try:
+        sentences = parser.parse()
+    except _NotExpandable:
+        return None
+
+    return list(dict.fromkeys(sentences))
+
+
+class _PatternExpander:
+    def __init__(self, pattern, max_expansions):
+        self.pattern = pattern
+        self.max_expansions = max_expansions
+        self.index = 0
+
+    def parse(self):
+        sentences = self._alternation()
+        if self.index != len(self.pattern):
+            raise _NotExpandable()
+
+        return sentences
+
+    def _peek(self):
+        if self.index < len(self.pattern):
+            return self.pattern[self.index]
+        return None
+
+    def _is_repeat(self):
+        return re.match(r"\{\d", self.pattern[self.index :]) is not None
+
+    def _limit(self, sentences):
+        if len(sentences) > self.max_expansions:
+            raise _NotExpandable()
+        return sentences
+
+    def _alternation(self):
+        sentences = self._sequence()
+
+        while self._peek() == "|":
+            self.index += 1
+            sentences = self._limit(sentences + self._sequence())
+
+        return sentences
+
+    def _sequence(self):
+        sentences = [""]
+
+        while self._peek() not in (None, "|", ")"):
+            options = self._atom()
+
+            if self._peek() == "?":
+                self.index += 1
+                options = options + [""]
+
+            if self._peek() in ("?", "*", "+") or self._is_repeat():
+                raise _NotExpandable()
+
+            sentences = self._limit(
+                [prefix + option for prefix in sentences for option in options]
+            )
+
+        return sentences
+
+    def _atom(self):
+        char = self._peek()
+
+        if char == "(":
+            self.index += 1
+            if self.pattern.startswith("?:", self.index):
+                self.index += 2
+            elif self._peek() == "?":
+                raise _NotExpandable()
+
+            options = self._alternation()
+            if self._peek() != ")":
+                raise _NotExpandable()
+
+            self.index += 1
+            return options
+
+        if char == "\\":
+            escaped = self.pattern[self.index + 1 : self.index + 2]
+            if not escaped or escaped.isalnum():
+                raise _NotExpandable()
+
+            self.index += 2
+            return [escaped]
+
+        if char == "{":
+            placeholder = re.match(r"\{\w+\}", self.pattern[self.index :])
+            if not placeholder or self._is_repeat():
+                raise _NotExpandable()
+
+            self.index += placeholder.end()
+            return [PLACEHOLDER_MARK]
+
+        if char in "[].*+?^$":
+            raise _NotExpandable()
+
+        self.index += 1
+        return [char]
@@ -1,6 +1,9 @@
 import re
 import string
 
+# Whitespace after a sentence's final punctuation
+SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+
 
 def normalize_text(text):
     if not text:
@@ -18,6 +21,78 @@ def normalize_text(text):
     return text
 
 
+def normalize_text_with_offsets(text):
+    """
+    Normalize text and keep track of where each character came from.
+
+    Args:
+        text (str): Raw input text
+
+    Returns:
+        tuple: (normalized text, list mapping every normalized character to
+            its index in the raw text). The mapping is None when it can't be
+            built faithfully, e.g. for context-sensitive lowercasing.
+    """
+    normalized = normalize_text(text)
+    if not text:
+        return normalized, []
+
+    lowered = [(char, index) for index, c in enumerate(text) for char in c.lower()]
+    if "".join(char for char, _ in lowered) != text.lower():
+        return normalized, None
+
+    collapsed = []
+    for char, index in lowered:
+        if char.isspace():
+            if collapsed and collapsed[-1][0] == " ":
+                continue
+            char = " "
+        collapsed.append((char, index))
+
+    while collapsed and collapsed[0][0] == " ":
+        collapsed.pop(0)
+    while collapsed and collapsed[-1][0] == " ":
+        collapsed.pop()
+
+    punctuation_to_remove = (
+        string.punctuation.replace("'", "").replace("-", "").replace(".", "")
+    )
+    kept = [
+        (char, index) for char, index in collapsed if char not in punctuation_to_remove
+    ]
+
+    if "".join(char for char, _ in kept) != normalized:
+        return normalized, None
+
+    return normalized, [index for _, index in kept]
+
+
+def map_normalized_spans(text, spans):
+    """
+    Map spans of the normalized text back onto the raw text.
+
+    Args:
+        text (str): Raw input text
+        spans (dict): Name to (start, end) span in the normalized text
+
+    Returns:
+        dict: Name to (start, end) span in the raw text, or None if the
+            spans can't be mapped
+    """
+    _, offsets = normalize_text_with_offsets(text)
+    if offsets is None:
+        return None
+
+    raw_spans = {}
+    for name, (start, end) in spans.items():
+        if start >= end:
+            continue
+
+        raw_spans[name] = (offsets[start], offsets[end - 1] + 1)
+
+    return raw_spans
+
+
 def extract_entity_placeholder(pattern):
     """
     Extract entity placeholders from a pattern.
@@ -29,3 +104,16 @@ def extract_entity_placeholder(pattern):
         list: List of entity names
     """
     return re.findall(r"\{(\w+)\}", pattern)
+
+
+def split_sentences(text):
+    """
+    Split text into sentences, for speaking a response one at a time.
+
+    Args:
+        text (str): Text to split
+
+    Returns:
+        list: Sentences of text, without surrounding whitespace
+    """
+    return [sentence for sentence in SENTENCE_BREAK.split(text.strip()) if sentence]
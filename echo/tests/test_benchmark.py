@@ -0,0 +1,12 @@
+from echo.benchmark import run_benchmark
+
+
+def test_stages_report_latency_and_memory():
+    report = run_benchmark(sizes=(20,), utterance_count=20)
+
+    (result,) = report["results"]
+    assert result["intents"] == 20
+    for stage in ("process", "exact", "fuzzy", "extraction"):
+        assert {"mean_ms", "peak_call_bytes", "retained_bytes"} <= set(
+            result["stages"][stage]
+        )
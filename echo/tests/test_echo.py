@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import echo as echo_module
+from echo import Echo
+
+INTENTS_PATH = Path(__file__).resolve().parents[2] / "intents"
+
+
+def test_views_share_the_cache():
+    echo = Echo(INTENTS_PATH, snapshot=False)
+
+    for _ in range(3):
+        echo.view().process("what is the weather in seattle")
+
+    stats = echo.get_cache_stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_batch_processes_each_text_once():
+    echo = Echo(INTENTS_PATH, cache_size=0, snapshot=False)
+    texts = ["what time is it", "what's the date today", "what time is it"]
+
+    processed = []
+    process = echo.process
+    echo.process = lambda text: processed.append(text) or process(text)
+
+    results = echo.process_batch(texts)
+
+    assert processed == ["what time is it", "what's the date today"]
+    assert [result["intent"] for result in results] == [
+        "get_time",
+        "get_date",
+        "get_time",
+    ]
+    # Repeated texts get their own copy
+    assert results[0] == results[2] and results[0] is not results[2]
+
+
+def test_batch_matches_process_in_worker_processes():
+    echo = Echo(INTENTS_PATH, cache_size=0, snapshot=False)
+    texts = [
+        "what is the weather in seattle tomorrow",
+        "what time is it",
+        "will it rain in Paris",
+        "tell me a joke",
+    ] * 3
+
+    results = echo.process_batch(texts, workers=2, chunk_size=1)
+
+    assert results == [echo.process(text) for text in texts]
+
+
+def test_cached_results_are_copies():
+    echo = Echo(INTENTS_PATH, snapshot=False)
+
+    first = echo.process("what is the weather in seattle")
+    first["entities"]["location"].clear()
+
+    second = echo.process("what is the weather in seattle")
+    assert second["entities"]["location"][0]["raw_value"] == "seattle"
+    assert echo.get_cache_stats()["hits"] == 1
+
+
+def test_cache_hits_re_extract_from_the_raw_text():
+    echo = Echo(INTENTS_PATH, snapshot=False)
+
+    echo.process("what is the weather in seattle")
+    result = echo.process("What is the weather in Seattle")
+
+    assert echo.get_cache_stats()["hits"] == 1
+    assert result["text"] == "What is the weather in Seattle"
+    assert result["entities"]["location"][0]["raw_value"] == "Seattle"
+
+
+def test_cache_expires_at_midnight(monkeypatch):
+    echo = Echo(INTENTS_PATH, snapshot=False)
+    echo.process("what is the weather tomorrow")
+
+    tomorrow = datetime.now() + timedelta(days=1)
+    monkeypatch.setattr(echo_module, "datetime", SimpleNamespace(now=lambda: tomorrow))
+    echo.process("what is the weather tomorrow")
+
+    assert echo.get_cache_stats()["hits"] == 0
@@ -0,0 +1,107 @@
+from pathlib import Path
+
+import pytest
+
+from echo import Echo
+from echo.entity.extractor import LazyEntities
+from echo.utils.text import normalize_text
+
+INTENTS_PATH = Path(__file__).resolve().parents[2] / "intents"
+
+
+@pytest.fixture(scope="module")
+def echo():
+    return Echo(INTENTS_PATH, cache_size=0, snapshot=False)
+
+
+def values(entities):
+    return {
+        name: [
+            (entity["raw_value"], entity["start"], entity["end"]) for entity in found
+        ]
+        for name, found in entities.items()
+    }
+
+
+def test_entities_come_from_the_captured_spans(echo):
+    result = echo.process("What's the weather like in Seattle tomorrow?")
+
+    assert values(result["entities"]) == {
+        "location": [("Seattle", 27, 34)],
+        "date": [("tomorrow", 35, 43)],
+    }
+
+
+def test_multi_word_values_are_merged_back(echo):
+    result = echo.process("what's the weather in new york tomorrow")
+
+    assert values(result["entities"]) == {
+        "location": [("new york", 22, 30)],
+        "date": [("tomorrow", 31, 39)],
+    }
+
+
+@pytest.mark.parametrize(
+    "text", ["weather forecast tomorrow", "what's the forecast tomorrow"]
+)
+def test_captures_go_to_the_placeholder_that_recognizes_them(echo, text):
+    # "( for {location})?" doesn't take part, the location group is empty
+    # and "tomorrow" is captured by the date group or claimed for it
+    entities = echo.process(text)["entities"]
+
+    assert list(entities) == ["date"]
+    assert entities["date"][0]["value"]["relative"] == "tomorrow"
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("will it rain in Cape Town", {"location": [("Cape Town", 16, 25)]}),
+        (
+            "how is the weather in Paris today",
+            {"location": [("Paris", 22, 27)], "date": [("today", 28, 33)]},
+        ),
+        (
+            "what's the forecast for Tokyo tomorrow",
+            {"location": [("Tokyo", 24, 29)], "date": [("tomorrow", 30, 38)]},
+        ),
+    ],
+)
+def test_captures_bound_each_value(echo, text, expected):
+    # Searching the whole text runs "Paris today" together and misses Tokyo
+    _, pattern, _, captures = echo.intent_matcher.match_exact(normalize_text(text))
+    extractor = echo.entity_extractor
+
+    assert values(extractor.extract_from_pattern(text, pattern, captures)) == expected
+
+
+def test_lazy_entities_extract_on_first_access(echo):
+    entities = echo.process("will it rain in Cape Town tomorrow", lazy_entities=True)[
+        "entities"
+    ]
+    assert isinstance(entities, LazyEntities)
+
+    steps = []
+    original_steps = entities._steps
+    entities._steps = (steps.append(step) or step for step in original_steps)
+
+    assert entities["location"][0]["raw_value"] == "Cape Town"
+    settled = len(steps)
+    assert "date" in entities
+    assert len(steps) > settled
+
+    assert (
+        entities.resolve()
+        == echo.process("will it rain in Cape Town tomorrow")["entities"]
+    )
+
+
+def test_lazy_entities_behave_like_a_dict(echo):
+    entities = echo.process("will it rain in Cape Town", lazy_entities=True)["entities"]
+
+    assert "date" not in entities
+    assert entities.get("date") is None
+    with pytest.raises(KeyError):
+        entities["temperature"]
+    assert dict(entities) == entities.resolve()
+    assert list(entities) == ["location"]
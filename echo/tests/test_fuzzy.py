@@ -0,0 +1,85 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from echo import Echo
+from echo.utils.regex import PLACEHOLDER_MARK, expand_pattern
+from echo.utils.text import normalize_text
+
+INTENTS_PATH = Path(__file__).resolve().parents[2] / "intents"
+
+FILLS = ["seattle", "new york", "tomorrow", "paris next week"]
+
+
+def misspelled_queries(echo, seed=0):
+    """Sentences of the bundled intents with one to three typos each."""
+    rng = random.Random(seed)
+
+    sentences = set()
+    for intent in echo.intent_registry.compiled_intents.values():
+        for pattern in intent.patterns:
+            for sentence in expand_pattern(pattern, 10000) or []:
+                for fill in FILLS:
+                    sentences.add(sentence.replace(PLACEHOLDER_MARK, fill))
+
+    queries = []
+    for sentence in sorted(sentences):
+        chars = list(sentence)
+        for _ in range(rng.randint(1, 3)):
+            index = rng.randrange(len(chars))
+            roll = rng.random()
+            if roll < 0.33:
+                del chars[index]
+            elif roll < 0.66:
+                chars.insert(index, rng.choice("abcdefghijklmnopqrstuvwxyz "))
+            else:
+                chars[index] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        queries.append("".join(chars))
+
+    return queries
+
+
+def fuzzy_intent(echo, query):
+    """Intent the fuzzy stage settles on, or None if it falls back."""
+    matcher = echo.intent_matcher
+    normalized_text = normalize_text(query)
+    if not normalized_text or matcher.match_exact(normalized_text):
+        return None
+
+    fuzzy_match = matcher.match_fuzzy(normalized_text)
+    if fuzzy_match is None or fuzzy_match[2] < matcher.threshold:
+        return None
+
+    return fuzzy_match[0]
+
+
+def test_tfidf_recall_against_sequence():
+    pytest.importorskip("numpy")
+
+    sequence = Echo(INTENTS_PATH, cache_size=0, snapshot=False)
+    tfidf = Echo(INTENTS_PATH, fuzzy_engine="tfidf", cache_size=0, snapshot=False)
+
+    resolved = same = 0
+    for query in misspelled_queries(sequence):
+        expected = fuzzy_intent(sequence, query)
+        if expected is None:
+            continue
+
+        resolved += 1
+        same += fuzzy_intent(tfidf, query) == expected
+
+    assert resolved > 100
+    assert same / resolved >= 0.8
+
+
+def test_fuzzy_threshold_is_configurable():
+    query = "whats the wether in seattle"
+
+    assert Echo(INTENTS_PATH, snapshot=False).process(query)["intent"] != "fallback"
+
+    strict = Echo(INTENTS_PATH, fuzzy_threshold=0.99, snapshot=False)
+    assert strict.process(query)["intent"] == "fallback"
+
+    # Exact matches don't depend on the fuzzy threshold
+    assert strict.process("what is the weather in seattle")["intent"] == "get_weather"
@@ -0,0 +1,113 @@
+import pytest
+
+from echo import Echo
+from echo.entity.standard.gazetteer import GazetteerAutomaton, GazetteerEntity
+
+CITIES = [
+    ("New York", ["NYC", "the big apple"]),
+    ("York", []),
+    ("Cape Town", []),
+]
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return tmp_path / "cache"
+
+
+def gazetteer(cache_dir, **config):
+    return GazetteerEntity("city", {"cache_dir": cache_dir, **config})
+
+
+def found(entity, text):
+    return [
+        (result["raw_value"], result["value"]["name"])
+        for result in entity.extract(text)
+    ]
+
+
+def test_automaton_finds_whole_words_and_nested_names():
+    automaton = GazetteerAutomaton(CITIES)
+
+    hits = automaton.find("from New York to Yorkshire")
+    names = {(automaton.values[value], start, end) for value, start, end in hits}
+
+    assert names == {("New York", 5, 13), ("York", 9, 13)}
+
+
+def test_automaton_lookup_resolves_synonyms():
+    automaton = GazetteerAutomaton(CITIES + [("Big Apple Inc", ["nyc"])])
+
+    assert automaton.lookup("the  Big Apple") == "New York"
+    # The first entry keeps a name shared by several values
+    assert automaton.lookup("NYC") == "New York"
+    assert automaton.lookup("Boston") is None
+
+
+def test_entity_prefers_the_longest_name(cache_dir):
+    entity = gazetteer(
+        cache_dir,
+        values=[{"value": value, "synonyms": synonyms} for value, synonyms in CITIES],
+    )
+
+    assert found(entity, "flights to new york") == [("new york", "New York")]
+    assert found(entity, "weather in nyc") == [("nyc", "New York")]
+    assert found(entity, "weather in boston") == []
+
+
+def test_entity_reads_a_source_file(cache_dir, tmp_path):
+    (tmp_path / "cities.tsv").write_text(
+        "# value\tsynonyms\nBratislava\tPressburg\nTokyo\n", encoding="utf-8"
+    )
+    entity = gazetteer(cache_dir, base_path=tmp_path, source="cities.tsv")
+
+    assert found(entity, "trains to pressburg") == [("pressburg", "Bratislava")]
+    assert found(entity, "value") == []
+
+
+def test_built_automaton_is_cached(cache_dir, monkeypatch):
+    gazetteer(cache_dir, values=["Paris"])
+    assert len(list((cache_dir / "gazetteer").glob("*.pickle"))) == 1
+
+    def rebuild(self, entries):
+        raise AssertionError("rebuilt a cached automaton")
+
+    monkeypatch.setattr(GazetteerAutomaton, "__init__", rebuild)
+    entity = gazetteer(cache_dir, values=["Paris"])
+    assert found(entity, "paris in spring") == [("paris", "Paris")]
+
+
+def test_known_names_beat_patterns(cache_dir):
+    entity = gazetteer(
+        cache_dir,
+        values=["New York"],
+        patterns=["in (?P<city>[a-z]+)"],
+    )
+
+    assert found(entity, "in new york") == [("new york", "New York")]
+    # Without a known name the regexes still apply
+    assert found(entity, "in boston") == [("boston", "boston")]
+
+
+def test_captured_spans_only_accept_known_names(tmp_path, monkeypatch):
+    monkeypatch.setenv("ECHO_CACHE_DIR", str(tmp_path / "cache"))
+    for directory in ("entities", "sentences", "responses"):
+        (tmp_path / directory).mkdir()
+    (tmp_path / "entities" / "city.yaml").write_text(
+        "entities:\n"
+        "  city:\n"
+        "    type: gazetteer\n"
+        "    values:\n"
+        "      - value: New York\n"
+        "        synonyms: [NYC]\n"
+    )
+    (tmp_path / "sentences" / "travel.yaml").write_text(
+        'intents:\n  fly:\n    patterns:\n      - "fly to {city}"\n'
+    )
+
+    echo = Echo(tmp_path, snapshot=False)
+
+    result = echo.process("fly to nyc")
+    assert result["intent"] == "fly"
+    assert result["entities"]["city"][0]["value"]["name"] == "New York"
+    assert "city" not in echo.process("fly to boston")["entities"]
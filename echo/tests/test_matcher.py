@@ -0,0 +1,229 @@
+import shutil
+from pathlib import Path
+
+import pytest
+import yaml
+
+from echo import Echo
+from echo.benchmark.catalog import generate_catalog, generate_utterances
+from echo.utils import regex
+from echo.utils.text import normalize_text
+
+INTENTS_PATH = Path(__file__).resolve().parents[2] / "intents"
+
+# Patterns that are hard to bucket by prefix or to expand into literals
+TRICKY_INTENTS = {
+    "a": [
+        "[Tt]urn (on|off) the {device}",
+        "Turn it UP",
+        "h?ello( there)?",
+    ],
+    "b": [
+        "{location} weather",
+        "(?:play|start) (?=music)music( now)?",
+        "set (a )?timer for \\d+ minutes?",
+        "café (time|menu)",
+    ],
+    "c": [
+        "\\bstop\\b( it)?",
+        "ello( world)?",
+        "(a|b)(c|d)(e|f)(g|h)(i|j)(k|l)(m|n) code",
+        "x*yz",
+        "yo+ there",
+        "[^q]uit now",
+    ],
+}
+
+TRICKY_TEXTS = [
+    "turn on the lights",
+    "Turn off the fan",
+    "turn it up",
+    "hello",
+    "ello",
+    "hello there",
+    "ello world",
+    "seattle weather",
+    "play music now",
+    "start music",
+    "play musical",
+    "set timer for 5 minutes",
+    "set a timer for 1 minute",
+    "café time",
+    "CAFÉ MENU",
+    "cafe time",
+    "stop",
+    "stop it",
+    "adfhjln code",
+    "acegikm code",
+    "yz",
+    "xxxyz",
+    "yooo there",
+    "quit now",
+    "auit now",
+    "",
+    "ſtop",
+    "turn",
+]
+
+
+def write_catalog(path, intents):
+    shutil.copytree(INTENTS_PATH / "entities", path / "entities")
+    (path / "sentences").mkdir()
+    (path / "responses").mkdir()
+
+    data = {
+        "intents": {name: {"patterns": patterns} for name, patterns in intents.items()}
+    }
+    (path / "sentences" / "test.yaml").write_text(
+        yaml.safe_dump(data, allow_unicode=True, sort_keys=False), encoding="utf-8"
+    )
+    return path
+
+
+def exact_matches(path, texts, **options):
+    matcher = Echo(path, cache_size=0, snapshot=False, **options).intent_matcher
+
+    matches = []
+    for text in texts:
+        match = matcher.match_exact(normalize_text(text))
+        matches.append(match and (match[0], match[1], match[3]))
+
+    return matches
+
+
+def perturb(texts):
+    """The texts with variants that only partly match or not at all."""
+    variants = []
+    for text in texts:
+        variants += [text, text[: len(text) // 2], text.upper(), text + " please"]
+    return variants
+
+
+@pytest.mark.parametrize("literal_expansions", [0, 256])
+def test_combined_engine_matches_like_sequential(tmp_path, literal_expansions):
+    path = write_catalog(tmp_path, TRICKY_INTENTS)
+    texts = perturb(TRICKY_TEXTS)
+
+    sequential = exact_matches(path, texts, max_literal_expansions=0)
+    combined = exact_matches(
+        path,
+        texts,
+        matcher_engine="combined",
+        max_literal_expansions=literal_expansions,
+    )
+
+    assert combined == sequential
+    assert sum(match is not None for match in sequential) > 20
+
+
+@pytest.mark.parametrize("literal_expansions", [0, 256])
+def test_engines_agree_on_a_large_catalog(tmp_path, literal_expansions):
+    intents = generate_catalog(tmp_path, 300, seed=1)
+    utterances = generate_utterances(intents, 300, seed=1)
+    texts = perturb([utterance["text"] for utterance in utterances])
+
+    sequential = exact_matches(tmp_path, texts, max_literal_expansions=0)
+    combined = exact_matches(
+        tmp_path,
+        texts,
+        matcher_engine="combined",
+        max_literal_expansions=literal_expansions,
+    )
+
+    assert combined == sequential
+
+
+def test_matching_works_without_re_internals(tmp_path, monkeypatch):
+    path = write_catalog(tmp_path, TRICKY_INTENTS)
+    texts = perturb(TRICKY_TEXTS)
+    expected = exact_matches(path, texts, matcher_engine="combined")
+
+    # As on a Python where re._parser can't be imported
+    monkeypatch.setattr(regex, "_parser", None)
+
+    assert exact_matches(path, texts, matcher_engine="combined") == expected
+
+    text = "what is the weather in paris tomorrow"
+    entities = Echo(INTENTS_PATH, snapshot=False).process(text)["entities"]
+    assert entities["location"][0]["value"]["name"] == "paris"
+    assert entities["date"][0]["value"]["relative"] == "tomorrow"
+
+
+def test_engines_agree_on_the_bundled_intents():
+    texts = perturb(
+        [
+            "what's the weather like in Seattle tomorrow?",
+            "what is the temperature in new york",
+            "will it rain in Paris next monday",
+            "how windy is it",
+            "what time is it",
+            "what's the date today",
+            "tell me the date",
+        ]
+    )
+
+    assert exact_matches(
+        INTENTS_PATH, texts, matcher_engine="combined"
+    ) == exact_matches(INTENTS_PATH, texts, max_literal_expansions=0)
+
+
+def literal_index(path, **options):
+    return Echo(
+        path, cache_size=0, snapshot=False, **options
+    ).intent_matcher.literal_index
+
+
+def test_literal_table_answers_fully_expanded_patterns(tmp_path):
+    index = literal_index(
+        write_catalog(
+            tmp_path,
+            {
+                "greet": ["(hi|hello)( there)?"],
+                "weather": ["weather in {location}"],
+                "count": ["count to \\d+"],
+            },
+        )
+    )
+
+    assert index.lookup("hello there") == ("greet", "(hi|hello)( there)?", {})
+    assert index.lookup("weather in paris") is None
+
+    regex_patterns = [pattern for _, pattern, _ in index.get_regex_patterns()]
+    assert regex_patterns == ["weather in {location}", "count to \\d+"]
+
+
+def test_literal_sentences_go_to_the_first_matching_pattern(tmp_path):
+    # The earlier pattern can't be expanded, but its regex claims the sentence
+    index = literal_index(
+        write_catalog(
+            tmp_path, {"early": ["good morning\\w*"], "late": ["good morning"]}
+        )
+    )
+
+    assert index.lookup("good morning")[0] == "early"
+
+
+def test_literal_expansion_limit(tmp_path):
+    path = write_catalog(tmp_path, {"code": ["(a|b)(c|d)(e|f)(g|h) code"]})
+
+    assert literal_index(path, max_literal_expansions=16).lookup("aceg code")
+    limited = literal_index(path, max_literal_expansions=8)
+    assert limited.lookup("aceg code") is None
+    assert len(limited.get_regex_patterns()) == 1
+
+
+def test_literal_table_survives_a_snapshot(tmp_path):
+    path = write_catalog(tmp_path, TRICKY_INTENTS)
+    index = literal_index(path)
+    state = index.dump_state()
+
+    restored = literal_index(path)
+    restored.load_state(state)
+
+    for text in TRICKY_TEXTS:
+        assert restored.lookup(normalize_text(text)) == index.lookup(
+            normalize_text(text)
+        )
+    assert [pattern for _, pattern, _ in restored.get_regex_patterns()] == [
+        pattern for _, pattern, _ in index.get_regex_patterns()
+    ]
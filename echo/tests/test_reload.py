@@ -0,0 +1,79 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from echo import Echo
+
+INTENTS_PATH = Path(__file__).resolve().parents[2] / "intents"
+
+
+@pytest.fixture
+def intents(tmp_path):
+    return shutil.copytree(INTENTS_PATH, tmp_path / "intents")
+
+
+@pytest.fixture
+def echo(intents):
+    return Echo(intents, snapshot=False)
+
+
+def write_intent(intents, name, pattern):
+    (intents / "sentences" / f"{name}.yaml").write_text(
+        f'intents:\n  {name}:\n    patterns:\n      - "{pattern}"\n'
+    )
+
+
+def test_reload_swaps_in_new_intents(echo, intents):
+    write_intent(intents, "greet", "frobnicate the widget")
+
+    report = echo.reload()
+
+    assert report["reloaded"] and report["changed"] == ["sentences"]
+    assert echo.process("frobnicate the widget")["intent"] == "greet"
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "intents:\n  bad: [unclosed\n",
+        'intents:\n  bad:\n    patterns:\n      - "(unclosed"\n',
+    ],
+)
+def test_broken_reload_keeps_the_current_version(echo, intents, content):
+    (intents / "sentences" / "bad.yaml").write_text(content)
+
+    report = echo.reload()
+
+    assert not report["reloaded"] and report["errors"]
+    assert echo.process("what time is it")["intent"] == "get_time"
+    assert echo.last_reload is report
+
+
+def test_views_keep_the_version_they_were_taken_on(echo, intents):
+    view = echo.view()
+    write_intent(intents, "greet", "frobnicate the widget")
+    echo.reload()
+
+    assert view.process("frobnicate the widget")["intent"] == "fallback"
+    assert echo.view().process("frobnicate the widget")["intent"] == "greet"
+
+
+def test_poll_waits_for_a_quiet_interval(echo, intents):
+    assert not echo.poll()
+
+    write_intent(intents, "greet", "frobnicate the widget")
+    assert not echo.poll()
+    assert echo.poll()
+    assert echo.process("frobnicate the widget")["intent"] == "greet"
+
+
+def test_poll_does_not_retry_a_rejected_change(echo, intents, monkeypatch):
+    (intents / "sentences" / "bad.yaml").write_text("intents:\n  bad: [unclosed\n")
+    assert not echo.poll()
+    assert not echo.poll()
+
+    reloads = []
+    monkeypatch.setattr(echo, "reload", lambda: reloads.append(1))
+    assert not echo.poll()
+    assert reloads == []
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import pytest
+
+from echo.response.renderer import NOT_SPECIFIED, ResponseRenderer, ResponseTemplate
+
+CONTEXT = {
+    "location": "Paris",
+    "temperature": 21.456,
+    "date": None,
+    "items": ["rain", "wind"],
+    "place": SimpleNamespace(name="Seattle"),
+    "width": 8,
+}
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "Plain text",
+        "In {location} it's {temperature}",
+        "{location}, {location} again",
+        "{temperature:.1f} degrees",
+        "{location:>{width}}|",
+        "{location!r} and {items[0]}",
+        "{place.name} on {date}",
+        "{{literal}} braces around {location}",
+    ],
+)
+def test_templates_render_like_str_format(template):
+    expected = template.format(
+        **{
+            name: NOT_SPECIFIED if value is None else value
+            for name, value in CONTEXT.items()
+        }
+    )
+
+    assert ResponseTemplate(template).render(CONTEXT) == expected
+
+
+@pytest.mark.parametrize("template", ["{0} degrees", "{} degrees", "{unclosed"])
+def test_broken_templates_are_caught_when_compiled(template):
+    compiled = ResponseTemplate(template)
+
+    assert compiled.error is not None
+    assert compiled.render(CONTEXT).startswith("Error rendering response:")
+
+
+def renderer(responses):
+    return ResponseRenderer(SimpleNamespace(responses=responses))
+
+
+def test_load_time_errors_are_reported():
+    loaded = renderer(
+        {
+            "weather": {"default": "In {location}"},
+            "broken": {"default": ["fine", "{0} degrees"]},
+        }
+    )
+
+    assert list(loaded.errors) == ["broken.default"]
+    assert "{0} degrees" in loaded.errors["broken.default"]
+
+
+def test_contexts_fall_back_to_the_default():
+    loaded = renderer(
+        {
+            "weather": {
+                "default": "Weather in {location}",
+                "contexts": {"with_date": "Weather on {date}"},
+            }
+        }
+    )
+
+    assert loaded.render("weather.with_date", {"date": "Monday"}) == "Weather on Monday"
+    assert loaded.render("weather.unknown", CONTEXT) == "Weather in Paris"
+    assert loaded.render("weather.default", {}) == (
+        "Error: Missing context variable 'location' in template"
+    )
+    assert loaded.render("other.default", {}) == (
+        "No responses found for intent: other"
+    )
@@ -0,0 +1,87 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from echo import Echo
+from echo.snapshot import load_snapshot, snapshot_path
+from echo.utils.cache import write_pickle
+
+INTENTS_PATH = Path(__file__).resolve().parents[2] / "intents"
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ECHO_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def intents(tmp_path):
+    return shutil.copytree(INTENTS_PATH, tmp_path / "intents")
+
+
+def add_date_pattern(intents, pattern):
+    sentences = intents / "sentences" / "datetime.yaml"
+    text = sentences.read_text()
+    sentences.write_text(
+        text.replace(
+            '      - "tell me the date"\n',
+            f'      - "tell me the date"\n      - "{pattern}"\n',
+        )
+    )
+
+
+def test_snapshot_is_loaded_on_the_next_start(cache_dir, intents):
+    echo = Echo(intents)
+
+    path = snapshot_path(intents, echo.options)
+    assert path.parent == cache_dir / "snapshots"
+    assert load_snapshot(path) is not None
+
+    loaded = Echo(intents)
+    assert loaded.process("what is the weather in seattle")["intent"] == "get_weather"
+
+
+def test_reload_replaces_the_snapshot(cache_dir, intents):
+    echo = Echo(intents)
+    add_date_pattern(intents, "frobnicate the widget")
+
+    assert echo.reload()["reloaded"]
+    assert echo.process("frobnicate the widget")["intent"] == "get_date"
+
+    snapshots = list((cache_dir / "snapshots").glob("*.pickle"))
+    assert snapshots == [snapshot_path(intents, echo.options)]
+
+
+def test_snapshots_of_other_directories_are_kept(cache_dir, intents, tmp_path):
+    other = shutil.copytree(intents, tmp_path / "other")
+    Echo(other)
+
+    echo = Echo(intents)
+    add_date_pattern(intents, "frobnicate the widget")
+    echo.reload()
+
+    assert len(list((cache_dir / "snapshots").glob("*.pickle"))) == 2
+
+
+class Unpicklable:
+    def __reduce__(self):
+        raise RuntimeError("can't pickle")
+
+
+def test_failed_writes_leave_no_temporary_files(tmp_path):
+    with pytest.raises(RuntimeError):
+        write_pickle(tmp_path / "state.pickle", {"state": Unpicklable()})
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_corrupt_snapshots_are_rebuilt(cache_dir, intents):
+    echo = Echo(intents)
+    path = snapshot_path(intents, echo.options)
+    path.write_bytes(b"not a pickle")
+
+    assert load_snapshot(path) is None
+    assert Echo(intents).process("what time is it")["intent"] == "get_time"
+    assert load_snapshot(path) is not None
@@ -10,5 +10,8 @@ class AutomaticSpeechRecognitionService(ABC):
     def transcribe(self, audio: np.ndarray) -> str:
         pass
 
+    def warm_up(self) -> None:
+        """Run the model once so the first real utterance doesn't pay for it"""
+
     def run(self, microphone: MicrophoneInput) -> str:
         return self.transcribe(microphone.get_audio_vad())
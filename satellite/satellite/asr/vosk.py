@@ -19,6 +19,10 @@ class VoskService(AutomaticSpeechRecognitionService):
 
         super().__init__()
 
+    def warm_up(self) -> None:
+        self.recognizer.AcceptWaveform(bytes(np.zeros(self.sample_rate // 2, np.int16)))
+        self.recognizer.Reset()
+
     @time_me
     def transcribe(self, audio: np.ndarray) -> str:
         if self.recognizer.AcceptWaveform(bytes(audio)):
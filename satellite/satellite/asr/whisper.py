@@ -15,6 +15,14 @@ class WhisperService(AutomaticSpeechRecognitionService):
 
         super().__init__()
 
+    def warm_up(self) -> None:
+        # A second of silence, segments are generated lazily
+        segments, _ = self.model.transcribe(
+            np.zeros(16000, dtype=np.float32), beam_size=5, language="en"
+        )
+        for _ in segments:
+            pass
+
     @time_me
     def transcribe(self, audio: np.ndarray) -> str:
         segments, info = self.model.transcribe(
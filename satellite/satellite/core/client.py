@@ -1,5 +1,6 @@
+import json
 import logging
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional
 import aiohttp
 
 logger = logging.getLogger(__name__)
@@ -39,3 +40,34 @@ class CoreClient:
         except aiohttp.ClientError as e:
             logger.exception(f"Failed to communicate with Core API: {str(e)}")
             return {"error": f"Connection error: {str(e)}"}
+
+    async def ask_stream(
+        self, text: str, user_id: str = "default", device_id: str = "satellite"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Ask Core and yield the response a sentence at a time, as Core sends it.
+
+        Yields {"type": "sentence", "text": ...} events and then one
+        {"type": "done", ...} with the intent. Failures are yielded as
+        {"error": ...}, like ask returns them.
+        """
+        url = f"{self.base_url}/v0/ask/stream"
+
+        payload = {"text": text, "user_id": user_id, "device_id": device_id}
+
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.post(
+                    url, json=payload, headers=self.headers
+                ) as response:
+                    if response.status != 200:
+                        logger.error(f"Error from Core API: {response.status}")
+                        yield {"error": f"API returned status {response.status}"}
+                        return
+
+                    async for line in response.content:
+                        if line.strip():
+                            yield json.loads(line)
+        except aiohttp.ClientError as e:
+            logger.exception(f"Failed to communicate with Core API: {str(e)}")
+            yield {"error": f"Connection error: {str(e)}"}
@@ -1,10 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, auto
 from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Callable
 
 from .asr.asr import AutomaticSpeechRecognitionService
 from .config import Config
 from .core.client import CoreClient
-from .debug import sneaky_throws
+from .debug import format_time, sneaky_throws
 from .leds import initialize_lantern
 from .microphone import MicrophoneInput
 from .speaker import SpeakerOutput
@@ -12,6 +15,25 @@ from .tts.tts import TextToSpeechService
 from .wake import WakeService
 
 
+def _load(name: str, create: Callable[[], Any]) -> Any:
+    """Create a component and run it once, printing how long each step took"""
+    start = perf_counter_ns()
+    component = create()
+    loaded = perf_counter_ns()
+
+    warm_up = getattr(component, "warm_up", None)
+    if warm_up is not None:
+        warm_up()
+    warmed = perf_counter_ns()
+
+    print(
+        f"  {name:<6} loaded in \033[96m{format_time(loaded - start)}\033[0m, "
+        f"warmed up in \033[96m{format_time(warmed - loaded)}\033[0m"
+    )
+
+    return component
+
+
 class State(Enum):
     OFF = auto()
     IDLE = auto()
@@ -38,17 +60,39 @@ class Satellite:
 
         self.lantern = initialize_lantern(config.led)
 
-        self.microphone = MicrophoneInput()
-        self.speaker = SpeakerOutput()
+        # Model loading is mostly native code that releases the GIL, so the
+        # slowest model sets the startup time instead of the sum of them all
+        started = perf_counter_ns()
+        with ThreadPoolExecutor(thread_name_prefix="satellite-load") as pool:
+            # PortAudio isn't safe to initialize from two threads at once
+            audio = pool.submit(_load, "audio", self._open_audio)
+            wake = pool.submit(
+                _load,
+                "wake",
+                lambda: WakeService(
+                    [Path(p) for p in config.wake.model_paths],
+                    config.wake.threshold,
+                ),
+            )
+            asr = pool.submit(_load, "asr", config.asr.create_service)
+            tts = pool.submit(_load, "tts", config.tts.create_service)
+
+            self.microphone, self.speaker = audio.result()
+            self.wake_service = wake.result()
+            self.asr_service = asr.result()
+            self.tts_service = tts.result()
 
-        self.wake_service = WakeService(
-            [Path(p) for p in config.wake.model_paths],
-            config.wake.threshold,
-        )
-        self.asr_service = config.asr.create_service()
-        self.tts_service = config.tts.create_service()
         self.core_client = CoreClient(config.core.url, config.core.api_key)
 
+        print(
+            f"Satellite \033[93mloaded in\033[0m "
+            f"\033[96m{format_time(perf_counter_ns() - started)}\033[0m"
+        )
+
+    @staticmethod
+    def _open_audio() -> tuple[MicrophoneInput, SpeakerOutput]:
+        return MicrophoneInput(), SpeakerOutput()
+
     @sneaky_throws
     async def run(self) -> None:
         self.state = State.IDLE
@@ -71,24 +115,35 @@ class Satellite:
             self.state = State.THINKING
             self.lantern.think()
 
-            response = await self.core_client.ask(transcription)
+            # Each sentence is spoken as soon as it arrives, while Core is
+            # still working on the next one
+            spoken = False
+            async for event in self.core_client.ask_stream(transcription):
+                if "error" in event:
+                    print(f"Error from Core API: {event['error']}")
+                    if not spoken:
+                        self.speak(
+                            "Sorry, I'm having trouble connecting to my brain right now."
+                        )
+                        spoken = True
+                    break
+
+                if event.get("type") == "sentence":
+                    self.speak(event["text"])
+                    spoken = True
+                else:
+                    print(f"Core response: {event}")
+
+            if not spoken:
+                self.speak("I'm not sure how to respond to that.")
 
-            if "error" in response:
-                print(f"Error from Core API: {response['error']}")
-                response_text = (
-                    "Sorry, I'm having trouble connecting to my brain right now."
-                )
-            else:
-                print(f"Core response: {response}")
-                response_text = response.get(
-                    "response", "I'm not sure how to respond to that."
-                )
+            self.state = State.IDLE
+            self.lantern.always_on()
 
+    def speak(self, text: str) -> None:
+        if self.state != State.SPEAKING:
             self.state = State.SPEAKING
             self.lantern.speak()
 
-            for audio in self.tts_service.synthesize(response_text):
-                self.speaker.play_audio(audio)
-
-            self.state = State.IDLE
-            self.lantern.always_on()
+        for audio in self.tts_service.synthesize(text):
+            self.speaker.play_audio(audio)
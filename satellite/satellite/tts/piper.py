@@ -15,6 +15,10 @@ class PiperService(TextToSpeechService):
 
         super().__init__()
 
+    def warm_up(self) -> None:
+        for _ in self.model.synthesize_stream_raw("Ready."):
+            pass
+
     @time_me
     def synthesize(self, text: str) -> Iterable[bytes]:
         return self.model.synthesize_stream_raw(text)
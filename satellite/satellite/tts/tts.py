@@ -7,5 +7,8 @@ class TextToSpeechService(ABC):
     def synthesize(self, text: str) -> Iterable[bytes]:
         pass
 
+    def warm_up(self) -> None:
+        """Run the model once so the first real response doesn't pay for it"""
+
     def run(self, text: str) -> Iterable[bytes]:
         return self.synthesize(text)
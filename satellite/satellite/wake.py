@@ -1,5 +1,6 @@
 from pathlib import Path
 
+import numpy as np
 from openwakeword.model import Model
 
 from .microphone import MicrophoneInput
@@ -13,6 +14,11 @@ class WakeService:
         self.model = Model([str(model_path) for model_path in model_paths])
         self.threshold = threshold
 
+    def warm_up(self) -> None:
+        # One frame of silence, then forget it ever happened
+        self.model.predict(np.zeros(1280, dtype=np.int16))
+        self.model.reset()
+
     def run(self, microphone: MicrophoneInput) -> bool:
         self.model.reset()
 